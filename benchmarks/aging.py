@@ -0,0 +1,78 @@
+"""Measure how long a low priority request waits while higher priority requests keep the bucket saturated.
+
+Without aging, the low priority request is starved for as long as the flood lasts.
+With aging, it climbs one priority level every ``aging`` seconds,
+so its wait is bounded by the time needed to reach the highest priority,
+plus the time needed to drain the requests that reached it earlier.
+
+Run with ``python -m benchmarks.aging``.
+"""
+
+import sys
+from typing import Optional
+
+import anyio
+from anyio import create_task_group, current_time, move_on_after
+
+from rate_control import FixedWindowCounter, Priority, Scheduler
+from rate_control.queues import FifoQueue
+
+if sys.version_info >= (3, 9):
+    from builtins import list as List
+else:
+    from typing import List
+
+DURATION = 0.01
+"""Duration of the window of the bucket, which lets one request through per window."""
+
+FLOODERS = 4
+"""Number of tasks that keep on issuing high priority requests, enough to saturate the bucket."""
+
+GIVE_UP_AFTER = 2.0
+"""Maximum amount of seconds to wait for the low priority request."""
+
+AGING_DELAYS: List[Optional[float]] = [None, 0.05, 0.1, 0.2]
+
+
+async def _flood(scheduler: Scheduler) -> None:
+    while True:
+        async with scheduler.request(1, Priority.HIGH):
+            ...
+
+
+async def measure_wait(aging: Optional[float]) -> Optional[float]:
+    """
+    Returns:
+        The amount of seconds that the lowest priority request waited,
+        or `None` if it was still waiting after ``GIVE_UP_AFTER`` seconds.
+    """
+    async with FixedWindowCounter(1, DURATION) as bucket, Scheduler(
+        bucket, should_enter_context=False, aging=aging, queue_factory=FifoQueue
+    ) as scheduler, create_task_group() as task_group:
+        for _ in range(FLOODERS):
+            task_group.start_soon(_flood, scheduler)
+        await anyio.sleep(5 * DURATION)
+
+        wait: Optional[float] = None
+        start = current_time()
+        with move_on_after(GIVE_UP_AFTER):
+            async with scheduler.request(1, Priority.LOWEST):
+                wait = current_time() - start
+        task_group.cancel_scope.cancel()
+    return wait
+
+
+async def main() -> None:
+    levels = len(Priority) - 1
+    print(f'{"aging (s)":>10} {"wait (s)":>10} {"bound (s)":>10}')
+    for aging in AGING_DELAYS:
+        wait = await measure_wait(aging)
+        bound = None if aging is None else levels * aging + FLOODERS * DURATION
+        print(
+            f'{aging!s:>10} {"starved" if wait is None else f"{wait:.3f}":>10}'
+            f' {"-" if bound is None else f"{bound:.3f}":>10}'
+        )
+
+
+if __name__ == '__main__':
+    anyio.run(main)
@@ -0,0 +1,44 @@
+"""Measure the cost of rejecting an acquisition from a large bucket group,
+when the limiting bucket comes last.
+
+Run with ``python -m benchmarks.bucket_group_rejection``.
+"""
+
+from time import perf_counter
+
+import anyio
+
+from rate_control import BucketGroup, Duration, FixedWindowCounter
+
+BUCKETS = 16
+"""Number of buckets within the group."""
+
+CHECKS = 100_000
+"""Number of rejected acquisitions for each measurement."""
+
+ROUNDS = 5
+"""Number of measurements, the lowest one being reported."""
+
+
+def measure_rejection(bucket_group: BucketGroup, checks: int = CHECKS) -> float:
+    """
+    Returns:
+        The amount of seconds spent checking each rejected acquisition.
+    """
+    start = perf_counter()
+    for _ in range(checks):
+        bucket_group.can_acquire(1)
+    return (perf_counter() - start) / checks
+
+
+async def main() -> None:
+    buckets = [FixedWindowCounter(1_000_000, Duration.MINUTE) for _ in range(BUCKETS - 1)]
+    limiting_bucket = FixedWindowCounter(1, Duration.SECOND)
+    async with BucketGroup(*buckets, limiting_bucket) as bucket_group:
+        limiting_bucket.acquire(1)
+        cost = min(measure_rejection(bucket_group) for _ in range(ROUNDS))
+    print(f'{BUCKETS} buckets: {cost * 1e9:.0f} ns per rejection')
+
+
+if __name__ == '__main__':
+    anyio.run(main)
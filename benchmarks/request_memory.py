@@ -0,0 +1,85 @@
+"""Measure the memory allocated for each request waiting in the queues of a scheduler.
+
+Run with ``python -m benchmarks.request_memory``.
+"""
+
+import sys
+import tracemalloc
+
+import anyio
+from anyio import create_task_group
+from anyio.lowlevel import checkpoint
+
+from rate_control import FixedWindowCounter, Scheduler
+from rate_control.queues import FifoQueue
+
+if sys.version_info >= (3, 9):
+    from builtins import list as List
+else:
+    from typing import List
+
+REQUESTS = 10_000
+"""Number of requests to keep waiting while measuring."""
+
+ROUNDS = 3
+"""Number of measurements, the lowest one being reported."""
+
+
+async def _request(scheduler: Scheduler) -> None:
+    async with scheduler.request():
+        ...
+
+
+async def measure_bytes_per_request(requests: int = REQUESTS) -> float:
+    """
+    Returns:
+        The amount of bytes allocated for each queued request, including its waiting task.
+    """
+    async with FixedWindowCounter(1, 3600) as bucket, Scheduler(
+        bucket, should_enter_context=False, queue_factory=FifoQueue
+    ) as scheduler, create_task_group() as task_group:
+        bucket.acquire(1)
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(requests):
+            task_group.start_soon(_request, scheduler)
+        for _ in range(3):
+            await checkpoint()
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        task_group.cancel_scope.cancel()
+    return (after - before) / requests
+
+
+async def _measure_tasks_only(tasks: int = REQUESTS) -> float:
+    """
+    Returns:
+        The amount of bytes allocated for each idle task, to subtract from the measurements.
+    """
+    event = anyio.Event()
+    async with create_task_group() as task_group:
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(tasks):
+            task_group.start_soon(event.wait)
+        for _ in range(3):
+            await checkpoint()
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        event.set()
+    return (after - before) / tasks
+
+
+async def main() -> None:
+    per_request: List[float] = []
+    per_task: List[float] = []
+    for _ in range(ROUNDS):
+        per_request.append(await measure_bytes_per_request())
+        per_task.append(await _measure_tasks_only())
+    print(f'bytes per queued request, including its task: {min(per_request):.0f}')
+    print(f'bytes per idle task waiting on an event:      {min(per_task):.0f}')
+    print(f'bytes per queued request, excluding the task: {min(per_request) - min(per_task):.0f}')
+
+
+if __name__ == '__main__':
+    anyio.run(main)
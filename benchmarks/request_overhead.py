@@ -0,0 +1,47 @@
+"""Measure the fixed overhead of an uncontended request, for each rate controller.
+
+Run with ``python -m benchmarks.request_overhead``.
+"""
+
+import sys
+from time import perf_counter
+
+import anyio
+
+from rate_control import NoopController, RateController, RateLimiter, Scheduler
+
+if sys.version_info >= (3, 9):
+    from builtins import list as List
+    from collections.abc import Callable
+else:
+    from typing import Callable, List
+
+REQUESTS = 100_000
+"""Number of requests issued for each measurement."""
+
+ROUNDS = 5
+"""Number of measurements, the lowest one being reported."""
+
+
+async def measure_overhead(controller: RateController, requests: int = REQUESTS) -> float:
+    """
+    Returns:
+        The amount of seconds spent entering and exiting each request.
+    """
+    start = perf_counter()
+    for _ in range(requests):
+        async with controller.request():
+            ...
+    return (perf_counter() - start) / requests
+
+
+async def main() -> None:
+    factories: List[Callable[[], RateController]] = [NoopController, RateLimiter, Scheduler]
+    for factory in factories:
+        async with factory() as controller:
+            overhead = min([await measure_overhead(controller) for _ in range(ROUNDS)])
+        print(f'{factory.__name__:>16}: {overhead * 1e6:.2f} µs per request')
+
+
+if __name__ == '__main__':
+    anyio.run(main)
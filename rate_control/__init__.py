@@ -1,21 +1,35 @@
 __all__ = [
     'Bucket',
     'BucketGroup',
+    'CapacitySchedule',
+    'CoDel',
     'Duration',
+    'Evicted',
+    'FallbackBucket',
     'FixedWindowCounter',
+    'HierarchicalBucket',
     'LeakyBucket',
     'NoopController',
+    'Overflow',
+    'Overloaded',
     'Priority',
     'RateController',
     'RateLimit',
     'RateLimiter',
     'ReachedMaxPending',
+    'RequestHandle',
+    'Reservation',
     'Scheduler',
     'SlidingWindowLog',
+    'WarmingUpBucket',
 ]
 
 from rate_control._bucket_group import BucketGroup
-from rate_control._buckets import Bucket, FixedWindowCounter, LeakyBucket, SlidingWindowLog
-from rate_control._controllers import NoopController, RateController, RateLimiter, Scheduler
-from rate_control._enums import Duration, Priority
-from rate_control._errors import RateLimit, ReachedMaxPending
+from rate_control._buckets import Bucket, FixedWindowCounter, LeakyBucket, SlidingWindowLog, WarmingUpBucket
+from rate_control._capacity_schedule import CapacitySchedule
+from rate_control._controllers import CoDel, NoopController, RateController, RateLimiter, RequestHandle, Scheduler
+from rate_control._enums import Duration, Overflow, Priority
+from rate_control._errors import Evicted, Overloaded, RateLimit, ReachedMaxPending
+from rate_control._fallback_bucket import FallbackBucket
+from rate_control._hierarchical_bucket import HierarchicalBucket
+from rate_control._reservation import Reservation
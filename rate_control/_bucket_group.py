@@ -2,24 +2,22 @@ __all__ = [
     'BucketGroup',
 ]
 
+import math
 import sys
-from contextlib import AsyncExitStack, suppress
 from typing import Any, Iterator, Optional
 
-from anyio import WouldBlock, create_memory_object_stream, create_task_group
-
 from rate_control._buckets import Bucket
-from rate_control._helpers import ContextAware, mk_repr
+from rate_control._buckets._base import CompositeBucket
+from rate_control._errors import RateLimit
+from rate_control._helpers import mk_repr
+from rate_control._helpers._validation import validate_fixed_costs
 
 if sys.version_info >= (3, 9):
-    from collections.abc import Iterable
-else:
-    from typing import Iterable
-
-if sys.version_info >= (3, 11):
-    from typing import Self
+    from builtins import dict as Dict
+    from builtins import tuple as Tuple
+    from collections.abc import Iterable, Mapping
 else:
-    from typing_extensions import Self
+    from typing import Dict, Iterable, Mapping, Tuple
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -27,88 +25,214 @@ else:
     from typing_extensions import override
 
 
-class BucketGroup(ContextAware, Bucket, Iterable[Bucket]):
-    """Composite bucket that aggregates other buckets."""
+class BucketGroup(CompositeBucket, Iterable[Bucket]):
+    """Composite bucket that aggregates other buckets.
 
-    def __init__(self, *buckets: Bucket, should_enter_context: bool = True, **kwargs: Any) -> None:
+    By default, acquiring tokens from the group acquires the same amount from each underlying bucket.
+    Some buckets can instead be charged a fixed cost for each acquisition, whatever the amount of tokens,
+    so that a single group enforces limits expressed in different units,
+    such as an amount of requests and an amount of tokens per minute.
+    """
+
+    def __init__(
+        self,
+        *buckets: Bucket,
+        should_enter_context: bool = True,
+        fixed_costs: Optional[Mapping[Bucket, float]] = None,
+        **kwargs: Any,
+    ) -> None:
         """
         Args:
             buckets: The buckets to aggregate within this bucket group.
             should_enter_context: Whether entering the context of the bucket group
                 should also enter the context of the underlying buckets.
                 Defaults to `True`.
+            fixed_costs: The amount of tokens to acquire from some of the underlying buckets
+                for each acquisition, instead of the amount of tokens acquired from the group.
+                Defaults to `None` (no fixed cost).
+
+        Raises:
+            ValueError: A fixed cost was provided for a bucket outside of the group, or is negative.
         """
-        super().__init__(**kwargs)
-        self._buckets = buckets
-        self._should_enter_context = should_enter_context
-        self._send_stream, self._recv_stream = create_memory_object_stream[Bucket]()
+        super().__init__(*buckets, should_enter_context=should_enter_context, **kwargs)
+        fixed_costs = {} if fixed_costs is None else dict(fixed_costs)
+        validate_fixed_costs(fixed_costs, buckets)
+        self._fixed_costs: Dict[Bucket, float] = fixed_costs
+        self._bottleneck: Optional[Bucket] = None
 
     @override
     def __repr__(self) -> str:
+        if self._fixed_costs:
+            return mk_repr(
+                self, *self._buckets, should_enter_context=self._should_enter_context, fixed_costs=self._fixed_costs
+            )
         return mk_repr(self, *self._buckets, should_enter_context=self._should_enter_context)
 
-    @override
-    async def __aenter__(self) -> Self:
-        await super().__aenter__()
-        self._stack = await AsyncExitStack().__aenter__()
-        self._task_group = await self._stack.enter_async_context(create_task_group())
-        await self._init_buckets()
-        return self
-
-    @override
-    async def __aexit__(self, *exc_info: Any) -> Optional[bool]:
-        self._task_group.cancel_scope.cancel()
-        await self._stack.__aexit__(*exc_info)
-        return await super().__aexit__(*exc_info)
-
     @override
     def __iter__(self) -> Iterator[Bucket]:
         return iter(self._buckets)
 
-    async def _init_buckets(self) -> None:
-        for bucket in self._buckets:
-            if self._should_enter_context:
-                await self._stack.enter_async_context(bucket)
-            self._listen_for_refill(bucket)
-
-    def _listen_for_refill(self, bucket: Bucket) -> None:
-        self._task_group.start_soon(self._listen_for, bucket)
-
-    async def _listen_for(self, bucket: Bucket) -> None:
-        await bucket.wait_for_refill()
-        await self._send_stream.send(bucket)
+    @property
+    @override
+    def capacity(self) -> float:
+        """The lowest capacity among the underlying buckets that are not charged a fixed cost."""
+        return min(
+            (bucket.capacity for bucket in self._buckets if bucket not in self._fixed_costs),
+            default=math.inf,
+        )
+
+    def _cost(self, bucket: Bucket, tokens: float) -> float:
+        """
+        Returns:
+            The amount of tokens to acquire from the given underlying bucket,
+            for acquiring the given amount of tokens from the group.
+        """
+        return self._fixed_costs.get(bucket, tokens)
 
     @override
     async def wait_for_refill(self) -> None:
         """Wait until any of the underlying buckets refills."""
-        with suppress(WouldBlock):
-            while True:
-                refilled_bucket = self._recv_stream.receive_nowait()
-                self._listen_for_refill(refilled_bucket)
-        await self._recv_stream.receive()
+        await super().wait_for_refill()
 
     @override
     def can_acquire(self, tokens: float) -> bool:
         """Whether the given amount of tokens can be acquired.
 
+        The underlying bucket that limited the latest rejected acquisition is checked first,
+        so that rejections usually take a single check.
+
         Args:
             tokens: The amount of tokens that we want to acquire.
 
         Returns:
-            Whether all the underlying buckets can acquire the given amount of tokens.
+            Whether all the underlying buckets can acquire the given amount of tokens, or their fixed cost.
         """
-        return all(bucket.can_acquire(tokens) for bucket in self._buckets)
+        bottleneck = self._bottleneck
+        if bottleneck is not None and not bottleneck.can_acquire(self._cost(bottleneck, tokens)):
+            return False
+        for bucket in self._buckets:
+            if bucket is not bottleneck and not bucket.can_acquire(self._cost(bucket, tokens)):
+                self._bottleneck = bucket
+                return False
+        return True
 
     @override
-    def acquire(self, tokens: float) -> None:
-        """For each underlying bucket, acquire the given amount of tokens.
+    def try_acquire(self, tokens: float) -> bool:
+        """For each underlying bucket, acquire the given amount of tokens, or its fixed cost,
+        if all of them can acquire it.
+
+        The availability of the tokens is checked only once for each underlying bucket.
 
         Args:
             tokens: The amount of tokens to acquire.
 
-        Raises:
-            RateLimit: Any of the underlying buckets cannot acquire the given amount of tokens.
+        Returns:
+            Whether the tokens were acquired.
+        """
+        return super().try_acquire(tokens)
+
+    @override
+    def time_until_available(self, tokens: float) -> Optional[float]:
+        """Estimate when the given amount of tokens can be acquired,
+        assuming that no other tokens get acquired in the meantime.
+
+        Args:
+            tokens: The amount of tokens that we want to acquire.
+
+        Returns:
+            The longest estimate among the underlying buckets,
+            or `None` if any of them cannot tell.
+        """
+        longest: float = 0
+        for bucket in self._buckets:
+            delay = bucket.time_until_available(self._cost(bucket, tokens))
+            if delay is None:
+                return None
+            longest = max(longest, delay)
+        return longest
+
+    @override
+    def refund(self, tokens: float) -> None:
+        """For each underlying bucket that is not charged a fixed cost, give back the given amount of tokens.
+
+        The fixed costs are kept, since the acquisitions that were charged for them did happen.
+
+        Args:
+            tokens: The amount of tokens to give back.
         """
-        self._assert_can_acquire(tokens)
         for bucket in self._buckets:
-            bucket.acquire(tokens)
+            if bucket not in self._fixed_costs:
+                bucket.refund(tokens)
+
+    @override
+    def _consume(self, tokens: float) -> None:
+        for bucket in self._buckets:
+            bucket._consume(self._cost(bucket, tokens))
+
+    @override
+    def _charge(self, tokens: float) -> None:
+        """The underlying buckets that are charged a fixed cost are left untouched,
+        since the acquisition was already charged for it.
+        """
+        for bucket in self._buckets:
+            if bucket not in self._fixed_costs:
+                bucket._charge(tokens)
+
+    @override
+    def _receipt(self) -> Tuple[Any, ...]:
+        return tuple(bucket._receipt() for bucket in self._buckets)
+
+    @override
+    def _refund(self, tokens: float, receipt: Tuple[Any, ...]) -> None:
+        for bucket, bucket_receipt in zip(self._buckets, receipt):
+            if bucket not in self._fixed_costs:
+                bucket._refund(tokens, bucket_receipt)
+
+    @override
+    def _reservation_time(self, tokens: float, not_before: float, now: float) -> float:
+        """
+        Returns:
+            The earliest time from ``not_before`` on at which all the underlying buckets
+            can let the given amount of tokens be used.
+        """
+        at = max(not_before, now)
+        while True:
+            latest = max(
+                (bucket._reservation_time(self._cost(bucket, tokens), at, now) for bucket in self._buckets),
+                default=at,
+            )
+            if latest <= at:
+                return at
+            if latest == math.inf:
+                return latest
+            at = latest
+
+    @override
+    def _commit_reservation(self, tokens: float, at: float) -> None:
+        for bucket in self._buckets:
+            bucket._commit_reservation(self._cost(bucket, tokens), at)
+
+    @override
+    def _cancel_reservation(self, tokens: float, at: float) -> None:
+        for bucket in self._buckets:
+            bucket._cancel_reservation(self._cost(bucket, tokens), at)
+
+    @override
+    def _rate_limit_error(self, tokens: float) -> RateLimit:
+        """
+        Args:
+            tokens: The amount of tokens that cannot be acquired.
+
+        Returns:
+            The error to raise for the given amount of tokens, which refers to the underlying bucket
+            that will take the longest to be able to acquire them.
+        """
+        errors = [
+            bucket._rate_limit_error(cost)
+            for bucket, cost in ((bucket, self._cost(bucket, tokens)) for bucket in self._buckets)
+            if not bucket.can_acquire(cost)
+        ]
+        if not errors:
+            return super()._rate_limit_error(tokens)
+        error = max(errors, key=lambda error: math.inf if error.retry_after is None else error.retry_after)
+        return RateLimit(f'Cannot acquire {tokens} tokens.', retry_after=error.retry_after, bucket=error.bucket)
@@ -3,9 +3,11 @@ __all__ = [
     'FixedWindowCounter',
     'LeakyBucket',
     'SlidingWindowLog',
+    'WarmingUpBucket',
 ]
 
 from ._base import Bucket
 from ._fixed_window_counter import FixedWindowCounter
 from ._leaky_bucket import LeakyBucket
 from ._sliding_window_log import SlidingWindowLog
+from ._warming_up_bucket import WarmingUpBucket
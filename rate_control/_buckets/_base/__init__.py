@@ -3,10 +3,14 @@ __all__ = [
     'BaseWindowedTokenBucket',
     'Bucket',
     'CapacityUpdatingBucket',
+    'CompositeBucket',
+    'RefillNotifyingBucket',
     'TokenBasedBucket',
 ]
 from ._abc import Bucket
 from ._base_rate import BaseRateBucket
 from ._capacity_updating import CapacityUpdatingBucket
+from ._composite import CompositeBucket
+from ._refill_notifying import RefillNotifyingBucket
 from ._token_based import TokenBasedBucket
 from ._windowed import BaseWindowedTokenBucket
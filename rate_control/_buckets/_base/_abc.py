@@ -2,11 +2,20 @@ __all__ = [
     'Bucket',
 ]
 
+import math
 import sys
 from abc import ABC, abstractmethod
 from typing import Any, Optional
 
+from anyio import current_time
+
 from rate_control._errors import RateLimit
+from rate_control._reservation import Reservation
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Callable
+else:
+    from typing import Callable
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -30,6 +39,11 @@ class Bucket(ABC):
         It may for example cancel internal background tasks.
         """
 
+    @property
+    def capacity(self) -> float:
+        """The maximum amount of tokens that can be acquired at once, `math.inf` if unbounded."""
+        return math.inf
+
     @abstractmethod
     async def wait_for_refill(self) -> None:
         """Wait until some tokens are replenished."""
@@ -45,7 +59,6 @@ class Bucket(ABC):
             Whether the given amount of tokens is available to consume.
         """
 
-    @abstractmethod
     def acquire(self, tokens: float) -> None:
         """Acquire the given amount of tokens.
 
@@ -55,15 +68,178 @@ class Bucket(ABC):
         Raises:
             RateLimit: Cannot acquire the given amount of tokens.
         """
+        if not self.try_acquire(tokens):
+            raise self._rate_limit_error(tokens)
 
-    def _assert_can_acquire(self, tokens: float) -> None:
-        """Make sure that the given amount of tokens can be acquired.
+    def try_acquire(self, tokens: float) -> bool:
+        """Acquire the given amount of tokens, if they are available.
 
         Args:
             tokens: The amount of tokens to acquire.
 
-        Raises:
-            RateLimit: Cannot acquire the given amount of tokens.
+        Returns:
+            Whether the tokens were acquired.
         """
         if not self.can_acquire(tokens):
-            raise RateLimit(f'Cannot acquire {tokens} tokens.')
+            return False
+        self._consume(tokens)
+        return True
+
+    def reserve(self, tokens: float) -> Reservation:
+        """Book the given amount of tokens against the future capacity of the bucket.
+
+        The tokens are committed right away, so that the caller only has to sleep for
+        the :attr:`~.Reservation.delay` of the reservation before using them.
+
+        Buckets that cannot commit tokens against their future capacity, which is the default,
+        only book the tokens that are available right away.
+
+        Args:
+            tokens: The amount of tokens to book.
+
+        Returns:
+            The reservation, which can be cancelled for giving the tokens back.
+
+        Raises:
+            RateLimit: The tokens cannot be booked, for instance if they exceed the capacity of the bucket.
+        """
+        now = current_time()
+        at = self._reservation_time(tokens, now, now)
+        if at == math.inf:
+            raise self._rate_limit_error(tokens)
+        self._commit_reservation(tokens, at)
+        return Reservation(self, tokens, at, at - now)
+
+    def time_until_available(self, tokens: float) -> Optional[float]:
+        """Estimate when the given amount of tokens can be acquired,
+        assuming that no other tokens get acquired in the meantime.
+
+        Buckets that cannot tell return `None` when the tokens are not available right away,
+        which is the default.
+
+        Args:
+            tokens: The amount of tokens that we want to acquire.
+
+        Returns:
+            The amount of seconds until the given amount of tokens can be acquired,
+            `0` if they are available, `math.inf` if they never will be, or `None` if unknown.
+        """
+        return 0 if self.can_acquire(tokens) else None
+
+    def refund(self, tokens: float) -> None:
+        """Give back tokens that were acquired but ended up unused.
+
+        Buckets that cannot give tokens back keep them consumed, which is the default.
+
+        Args:
+            tokens: The amount of tokens to give back, acquired since the last refill.
+        """
+
+    def _consume(self, tokens: float) -> None:
+        """Consume the given amount of tokens, which are known to be available.
+
+        This is the hook that buckets implement for consuming tokens:
+        :meth:`try_acquire`, :meth:`acquire`, the reservations and the :class:`.Scheduler` all go through it,
+        so that the availability of the tokens is checked only once.
+
+        Args:
+            tokens: The amount of tokens to consume.
+
+        Raises:
+            NotImplementedError: The bucket does not implement this method.
+        """
+        raise NotImplementedError(f'{type(self).__name__} must implement _consume')
+
+    def _charge(self, tokens: float) -> None:
+        """Consume additional tokens for an acquisition that already happened, regardless of their availability.
+
+        This is the counterpart of :meth:`refund`, and simply consumes the tokens by default.
+
+        Args:
+            tokens: The amount of additional tokens to consume.
+        """
+        self._consume(tokens)
+
+    def _receipt(self) -> Any:
+        """
+        Returns:
+            A record of the tokens that were just consumed, for :meth:`_refund` to give them back later on.
+            Buckets that do not need to tell acquisitions apart return `None`, which is the default.
+        """
+        return None
+
+    def _refund(self, tokens: float, receipt: Any) -> None:
+        """Give back tokens of a given acquisition, that ended up unused.
+
+        Unlike :meth:`refund`, the tokens can have been acquired before the last refill,
+        and buckets should not credit the acquisitions that happened since for them.
+        The default is to call :meth:`refund`.
+
+        Args:
+            tokens: The amount of tokens to give back.
+            receipt: The record returned by :meth:`_receipt` right after the acquisition.
+        """
+        self.refund(tokens)
+
+    def _watch_refills(self, callback: Callable[[], Any]) -> bool:
+        """Have the given callback called whenever the bucket refills, rather than waiting for it.
+
+        Args:
+            callback: The callback to call on each replenishment.
+
+        Returns:
+            Whether the bucket supports it, which is not the case by default,
+            in which case :meth:`wait_for_refill` has to be awaited instead.
+        """
+        return False
+
+    def _unwatch_refills(self, callback: Callable[[], Any]) -> None:
+        """Stop calling the given callback, that was registered with :meth:`_watch_refills`.
+
+        Args:
+            callback: The callback to unregister.
+        """
+
+    def _reservation_time(self, tokens: float, not_before: float, now: float) -> float:
+        """
+        Args:
+            tokens: The amount of tokens to book.
+            not_before: The time before which the tokens will not be used,
+                as returned by :func:`anyio.current_time`.
+            now: The current time, read once for the whole reservation,
+                so that composite buckets get consistent answers from their underlying buckets.
+
+        Returns:
+            The earliest time from ``not_before`` on at which the given amount of tokens can be used,
+            were they booked right away, or `math.inf` if they cannot be booked.
+        """
+        return now if not_before <= now and self.can_acquire(tokens) else math.inf
+
+    def _commit_reservation(self, tokens: float, at: float) -> None:
+        """Book the given amount of tokens, to be used from the given time on.
+
+        Args:
+            tokens: The amount of tokens to book.
+            at: The time returned by :meth:`_reservation_time`.
+        """
+        self._consume(tokens)
+
+    def _cancel_reservation(self, tokens: float, at: float) -> None:
+        """Give back the tokens of a cancelled reservation.
+
+        Args:
+            tokens: The amount of tokens that were booked.
+            at: The time from which the tokens could be used.
+        """
+        self.refund(tokens)
+
+    def _rate_limit_error(self, tokens: float) -> RateLimit:
+        """
+        Args:
+            tokens: The amount of tokens that cannot be acquired.
+
+        Returns:
+            The error to raise for the given amount of tokens,
+            which tells when they could be acquired.
+        """
+        return RateLimit(f'Cannot acquire {tokens} tokens.', retry_after=self.time_until_available(tokens), bucket=self)
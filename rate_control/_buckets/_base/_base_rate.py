@@ -4,15 +4,23 @@ __all__ = [
 
 import sys
 from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
 from typing import Any, Optional
 
-from anyio import Event, create_task_group, sleep
+from anyio import create_task_group, current_time, sleep_until
 
 from rate_control._buckets._base._abc import Bucket
+from rate_control._buckets._base._refill_notifying import RefillNotifyingBucket
 from rate_control._buckets._base._token_based import TokenBasedBucket
 from rate_control._helpers import ContextAware
 from rate_control._helpers._validation import validate_delay
 
+if sys.version_info >= (3, 9):
+    from builtins import list as List
+    from builtins import tuple as Tuple
+else:
+    from typing import List, Tuple
+
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
@@ -24,7 +32,7 @@ else:
     from typing_extensions import override
 
 
-class BaseRateBucket(TokenBasedBucket, ContextAware, Bucket, ABC):
+class BaseRateBucket(TokenBasedBucket, RefillNotifyingBucket, ContextAware, Bucket, ABC):
     """Base class for token buckets that refill at a certain rate."""
 
     def __init__(self, capacity: float, delay: float, **kwargs: Any) -> None:
@@ -36,7 +44,7 @@ class BaseRateBucket(TokenBasedBucket, ContextAware, Bucket, ABC):
         super().__init__(capacity, **kwargs)
         validate_delay(delay)
         self._delay = delay
-        self._refill_event = Event()
+        self._scheduled_refills: List[Tuple[float, float]] = []
 
     @override
     async def __aenter__(self) -> Self:
@@ -51,20 +59,30 @@ class BaseRateBucket(TokenBasedBucket, ContextAware, Bucket, ABC):
         return await super().__aexit__(*exc_info)
 
     @override
-    async def wait_for_refill(self) -> None:
-        await self._refill_event.wait()
+    def time_until_available(self, tokens: float) -> float:
+        now = current_time()
+        return self._reservation_time(tokens, now, now) - now
 
     @override
-    def acquire(self, tokens: float) -> None:
-        super().acquire(tokens)
+    def _consume(self, tokens: float) -> None:
+        super()._consume(tokens)
         self._ensure_refill(tokens)
 
     def _ensure_refill(self, tokens: float = 1) -> None:
         if self._should_schedule_refill():
-            try:
-                self._task_group.start_soon(self._wait_and_refill, tokens)
-            except AttributeError as e:
-                raise RuntimeError(f"Make sure to enter the bucket's context using 'async with {self}'") from e
+            self._schedule_refill(tokens, current_time() + self._delay)
+
+    def _schedule_refill(self, tokens: float, refill_time: float) -> None:
+        """Replenish the given amount of tokens at the given time.
+
+        The scheduled replenishments are kept sorted by time.
+        """
+        refill = (refill_time, tokens)
+        try:
+            self._task_group.start_soon(self._wait_and_refill, refill)
+        except AttributeError as e:
+            raise RuntimeError(f"Make sure to enter the bucket's context using 'async with {self}'") from e
+        insort(self._scheduled_refills, refill)
 
     @abstractmethod
     def _should_schedule_refill(self) -> bool:
@@ -73,12 +91,18 @@ class BaseRateBucket(TokenBasedBucket, ContextAware, Bucket, ABC):
             Whether a replenishment of the bucket should be scheduled.
         """
 
-    async def _wait_and_refill(self, tokens: float) -> None:
-        await sleep(self._delay)
-        self._refill(tokens)
-        self._refill_event.set()
-        self._refill_event = Event()
+    async def _wait_and_refill(self, refill: Tuple[float, float]) -> None:
+        refill_time, tokens = refill
+        await sleep_until(refill_time)
+        del self._scheduled_refills[bisect_left(self._scheduled_refills, refill)]
+        self._refill(tokens, refill_time)
+        self._notify_refill()
 
     @abstractmethod
-    def _refill(self, tokens: float) -> None:
-        """Add some tokens back to the bucket."""
+    def _refill(self, tokens: float, refill_time: float) -> None:
+        """Add some tokens back to the bucket.
+
+        Args:
+            tokens: The amount of tokens that the replenishment was scheduled for.
+            refill_time: The time at which the replenishment was due.
+        """
@@ -2,21 +2,102 @@ __all__ = [
     'CapacityUpdatingBucket',
 ]
 
-from rate_control._buckets._base._token_based import TokenBasedBucket
+import math
+import sys
+from abc import ABC
+from typing import Any, Optional
+
+from anyio import current_time, sleep_until
+
+from rate_control._buckets._base._base_rate import BaseRateBucket
+from rate_control._capacity_schedule import CapacitySchedule
 from rate_control._helpers._validation import validate_capacity
 
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class CapacityUpdatingBucket(BaseRateBucket, ABC):
+    """Base class for token buckets which capacity can be updated, possibly following a :class:`.CapacitySchedule`."""
+
+    def __init__(
+        self, capacity: float, delay: float, capacity_schedule: Optional[CapacitySchedule] = None, **kwargs: Any
+    ) -> None:
+        """
+        Args:
+            capacity: The token capacity of the bucket.
+            delay: The refill delay in seconds.
+            capacity_schedule: The schedule that the token capacity of the bucket follows, overriding ``capacity``.
+                Defaults to `None` (constant capacity).
+        """
+        super().__init__(capacity, delay, **kwargs)
+        self._capacity_schedule = capacity_schedule
+        self._next_capacity_change = -math.inf
 
-class CapacityUpdatingBucket(TokenBasedBucket):
-    """Mixin for buckets which token capacity can be updated."""
+    @override
+    async def __aenter__(self) -> Self:
+        await super().__aenter__()
+        if self._capacity_schedule is not None:
+            self._task_group.start_soon(self._follow_capacity_schedule)
+        return self
+
+    @property
+    @override
+    def capacity(self) -> float:
+        self._sync_capacity()
+        return super().capacity
+
+    @override
+    def can_acquire(self, tokens: float) -> bool:
+        self._sync_capacity()
+        return super().can_acquire(tokens)
+
+    @override
+    def refund(self, tokens: float) -> None:
+        self._sync_capacity()
+        super().refund(tokens)
 
     def update_capacity(self, new_capacity: float) -> None:
         """Update the bucket's token capacity.
 
         Changes take effect instantly, and the amount of remaining tokens is updated accordingly.
+        The tasks waiting for a replenishment are woken up if the capacity increases.
+
+        With a capacity schedule, the updated capacity applies until the next scheduled change.
 
         Args:
             new_capacity: The new token capacity of the bucket.
         """
         validate_capacity(new_capacity)
-        self._tokens += new_capacity - self._capacity
+        increase = new_capacity - self._capacity
+        self._tokens += increase
         self._capacity = new_capacity
+        if increase > 0:
+            self._notify_refill()
+
+    def _sync_capacity(self) -> None:
+        """Apply the capacity of the schedule, if any, once the previous one no longer applies."""
+        if self._capacity_schedule is not None and current_time() >= self._next_capacity_change:
+            self._apply_capacity_schedule()
+
+    def _apply_capacity_schedule(self) -> None:
+        assert self._capacity_schedule is not None
+        capacity, delay = self._capacity_schedule._current()
+        self._next_capacity_change = current_time() + delay
+        if capacity != self._capacity:
+            self.update_capacity(capacity)
+
+    async def _follow_capacity_schedule(self) -> None:
+        """Apply each capacity of the schedule as soon as it applies,
+        so that the tasks waiting for a replenishment are woken up when the capacity increases.
+        """
+        while True:
+            self._apply_capacity_schedule()
+            await sleep_until(self._next_capacity_change)
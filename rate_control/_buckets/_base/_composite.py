@@ -0,0 +1,92 @@
+__all__ = [
+    'CompositeBucket',
+]
+
+import sys
+from abc import ABC
+from contextlib import AsyncExitStack
+from functools import partial
+from typing import Any, Optional
+
+from anyio import create_task_group
+from anyio.lowlevel import checkpoint
+
+from rate_control._buckets._base._abc import Bucket
+from rate_control._buckets._base._refill_notifying import RefillNotifyingBucket
+from rate_control._helpers import ContextAware
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterable
+else:
+    from typing import Iterable
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class CompositeBucket(ContextAware, RefillNotifyingBucket, ABC):
+    """Base class for buckets made of other buckets, that refill whenever any of them does."""
+
+    def __init__(self, *buckets: Bucket, should_enter_context: bool = True, **kwargs: Any) -> None:
+        """
+        Args:
+            buckets: The underlying buckets.
+            should_enter_context: Whether entering the context of the composite bucket
+                should also enter the context of the underlying buckets that it owns.
+                Defaults to `True`.
+        """
+        super().__init__(**kwargs)
+        self._buckets = buckets
+        self._should_enter_context = should_enter_context
+
+    @override
+    async def __aenter__(self) -> Self:
+        await super().__aenter__()
+        self._stack = await AsyncExitStack().__aenter__()
+        self._task_group = await self._stack.enter_async_context(create_task_group())
+        await self._init_buckets()
+        return self
+
+    @override
+    async def __aexit__(self, *exc_info: Any) -> Optional[bool]:
+        self._task_group.cancel_scope.cancel()
+        await self._stack.__aexit__(*exc_info)
+        return await super().__aexit__(*exc_info)
+
+    @property
+    def _owned_buckets(self) -> Iterable[Bucket]:
+        """The underlying buckets which context is managed by the composite bucket."""
+        return self._buckets
+
+    async def _init_buckets(self) -> None:
+        if self._should_enter_context:
+            for bucket in self._owned_buckets:
+                await self._stack.enter_async_context(bucket)
+        for bucket in self._buckets:
+            callback = partial(self._on_refill, bucket)
+            if bucket._watch_refills(callback):
+                self._stack.callback(bucket._unwatch_refills, callback)
+            else:
+                self._task_group.start_soon(self._listen_for, bucket)
+
+    async def _listen_for(self, bucket: Bucket) -> None:
+        """Wait for the replenishments of an underlying bucket that does not notify them by itself."""
+        while True:
+            await bucket.wait_for_refill()
+            self._on_refill(bucket)
+            await checkpoint()
+
+    def _on_refill(self, bucket: Bucket) -> None:
+        """Called whenever an underlying bucket refills.
+
+        Args:
+            bucket: The underlying bucket that refilled.
+        """
+        self._notify_refill()
@@ -0,0 +1,53 @@
+__all__ = [
+    'RefillNotifyingBucket',
+]
+
+import sys
+from abc import ABC
+from typing import Any
+
+from anyio import Event
+
+from rate_control._buckets._base._abc import Bucket
+
+if sys.version_info >= (3, 9):
+    from builtins import list as List
+    from collections.abc import Callable
+else:
+    from typing import Callable, List
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class RefillNotifyingBucket(Bucket, ABC):
+    """Mixin for buckets that notify their replenishments by themselves,
+    so that no task needs to wait for them on behalf of the composite buckets.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._refill_event = Event()
+        self._refill_watchers: List[Callable[[], Any]] = []
+
+    @override
+    async def wait_for_refill(self) -> None:
+        await self._refill_event.wait()
+
+    @override
+    def _watch_refills(self, callback: Callable[[], Any]) -> bool:
+        self._refill_watchers.append(callback)
+        return True
+
+    @override
+    def _unwatch_refills(self, callback: Callable[[], Any]) -> None:
+        self._refill_watchers.remove(callback)
+
+    def _notify_refill(self) -> None:
+        """Wake up the tasks waiting for a replenishment, and call the registered callbacks."""
+        self._refill_event.set()
+        self._refill_event = Event()
+        for callback in self._refill_watchers:
+            callback()
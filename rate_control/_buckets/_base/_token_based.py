@@ -7,7 +7,7 @@ from abc import ABC
 from typing import Any
 
 from rate_control._buckets._base._abc import Bucket
-from rate_control._helpers._validation import validate_capacity, validate_tokens
+from rate_control._helpers._validation import validate_capacity, validate_max_debt, validate_tokens
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -16,19 +16,41 @@ else:
 
 
 class TokenBasedBucket(Bucket, ABC):
-    """Base class for buckets that monitor the requests using tokens."""
-
-    def __init__(self, capacity: float, **kwargs: Any) -> None:
+    """Base class for buckets that monitor the requests using tokens.
+
+    The amount of remaining tokens can go negative, down to ``-max_debt``,
+    in which case the upcoming replenishments pay the debt down first.
+    """
+
+    def __init__(self, capacity: float, max_debt: float = 0, **kwargs: Any) -> None:
+        """
+        Args:
+            capacity: The maximum amount of tokens that the bucket holds.
+            max_debt: The amount of tokens that can be acquired beyond the remaining ones,
+                to be paid back by the upcoming replenishments.
+                Defaults to `0` (no debt allowed).
+        """
         super().__init__(**kwargs)
         validate_capacity(capacity)
+        validate_max_debt(max_debt)
         self._tokens = self._capacity = capacity
+        self._max_debt = max_debt
+
+    @property
+    @override
+    def capacity(self) -> float:
+        return self._capacity + self._max_debt
 
     @override
     def can_acquire(self, tokens: float) -> bool:
         validate_tokens(tokens)
-        return tokens <= self._tokens
+        return tokens <= self._tokens + self._max_debt
+
+    @override
+    def refund(self, tokens: float) -> None:
+        validate_tokens(tokens)
+        self._tokens = min(self._tokens + tokens, self._capacity)
 
     @override
-    def acquire(self, tokens: float) -> None:
-        self._assert_can_acquire(tokens)
+    def _consume(self, tokens: float) -> None:
         self._tokens -= tokens
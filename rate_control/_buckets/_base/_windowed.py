@@ -18,13 +18,16 @@ else:
 class BaseWindowedTokenBucket(BaseRateBucket, ABC):
     """Base class for token buckets that follow strategies based on time windows."""
 
-    def __init__(self, capacity: float, duration: float, **kwargs: Any) -> None:
+    def __init__(self, capacity: float, duration: float, max_debt: float = 0, **kwargs: Any) -> None:
         """
         Args:
             capacity: The number of tokens that can be acquired within ``duration``.
             duration: The window duration in seconds.
+            max_debt: The amount of tokens that can be acquired beyond the remaining ones,
+                to be paid back by the upcoming replenishments.
+                Defaults to `0` (no debt allowed).
         """
-        super().__init__(capacity, duration, **kwargs)
+        super().__init__(capacity, duration, max_debt=max_debt, **kwargs)
 
     @property
     def _duration(self) -> float:
@@ -32,4 +35,6 @@ class BaseWindowedTokenBucket(BaseRateBucket, ABC):
 
     @override
     def __repr__(self) -> str:
+        if self._max_debt:
+            return mk_repr(self, capacity=self._capacity, duration=self._duration, max_debt=self._max_debt)
         return mk_repr(self, capacity=self._capacity, duration=self._duration)
@@ -2,10 +2,20 @@ __all__ = [
     'FixedWindowCounter',
 ]
 
+import math
 import sys
+from collections import deque
 from typing import Any
 
+from anyio import current_time
+
 from rate_control._buckets._base import BaseWindowedTokenBucket, CapacityUpdatingBucket
+from rate_control._helpers._validation import validate_tokens
+
+if sys.version_info >= (3, 9):
+    from collections import deque as Deque
+else:
+    from typing import Deque
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -16,12 +26,110 @@ else:
 class FixedWindowCounter(BaseWindowedTokenBucket, CapacityUpdatingBucket):
     """Bucket whose refill strategy follows the fixed window counter algorithm.
 
-    The bucket refills once every ``duration`` seconds, to cap its tokens back to ``capacity``.
+    The bucket refills once every ``duration`` seconds, to cap its tokens back to ``capacity``,
+    minus the debt that remains to be paid.
+    The tokens charged beyond ``max_debt`` are carried over as debt too, until they are paid down.
+    Refunds only credit the window in which the tokens were acquired.
+    The capacity can follow a :class:`.CapacitySchedule`, passed as ``capacity_schedule``.
     """
 
     def __init__(self, capacity: float, duration: float, **kwargs: Any) -> None:
         super().__init__(capacity, duration, **kwargs)
         self._scheduled_refill = False
+        self._reserved_windows: Deque[float] = deque()
+        self._window = 0
+        self._charged = 0.0
+
+    @override
+    def _reservation_time(self, tokens: float, not_before: float, now: float) -> float:
+        validate_tokens(tokens)
+        if tokens > self.capacity:
+            return math.inf
+        not_before = max(not_before, now)
+        window_end = self._window_end(now)
+        balance = self._tokens
+        if not_before < window_end and tokens <= balance + self._max_debt:
+            return not_before
+        first_index = self._window_index(not_before, window_end)
+        index = 0
+        while True:
+            reserved = self._reserved_windows[index] if index < len(self._reserved_windows) else 0
+            balance = self._capacity - reserved - self._debt(balance)
+            if index >= len(self._reserved_windows) and balance == self._capacity:
+                index = max(index, first_index)
+            if index >= first_index and tokens <= balance + self._max_debt:
+                return max(not_before, window_end + index * self._duration)
+            index += 1
+
+    @override
+    def _commit_reservation(self, tokens: float, at: float) -> None:
+        """Tokens booked within the current window are consumed right away,
+        while the ones booked within a future window are deducted from its replenishment.
+        """
+        self._ensure_refill()
+        window_end = self._window_end(current_time())
+        if at < window_end:
+            self._tokens -= tokens
+            return
+        index = self._window_index(at, window_end)
+        self._reserved_windows.extend([0] * (index + 1 - len(self._reserved_windows)))
+        self._reserved_windows[index] += tokens
+
+    @override
+    def _cancel_reservation(self, tokens: float, at: float) -> None:
+        """The tokens booked within a past window are kept consumed."""
+        window_end = self._window_end(current_time())
+        if at < window_end:
+            if at >= window_end - self._duration:
+                self.refund(tokens)
+        else:
+            self._reserved_windows[self._window_index(at, window_end)] -= tokens
+
+    @override
+    def _charge(self, tokens: float) -> None:
+        self._charged += tokens
+        super()._charge(tokens)
+
+    @override
+    def _receipt(self) -> int:
+        return self._window
+
+    @override
+    def _refund(self, tokens: float, receipt: int) -> None:
+        """The tokens acquired within a past window are kept consumed,
+        since giving them back would let more tokens through the current window than its capacity.
+        """
+        if receipt == self._window:
+            self.refund(tokens)
+
+    def _window_end(self, now: float) -> float:
+        """
+        Returns:
+            The time at which the current window ends,
+            were it started right away if no window is in progress.
+        """
+        if self._scheduled_refills:
+            refill_time, _ = self._scheduled_refills[0]
+            return refill_time
+        return now + self._duration
+
+    def _window_index(self, at: float, window_end: float) -> int:
+        """
+        Returns:
+            The index of the future window that the given time falls into, relatively to the next window.
+        """
+        index = math.floor((at - window_end) / self._duration)
+        if window_end + (index + 1) * self._duration <= at:
+            index += 1
+        return index
+
+    def _debt(self, balance: float) -> float:
+        """
+        Returns:
+            The debt to carry over to the next window, for the given amount of remaining tokens,
+            including the tokens charged beyond ``max_debt``.
+        """
+        return min(max(-balance, 0), self._max_debt + self._charged)
 
     @override
     def _should_schedule_refill(self) -> bool:
@@ -31,6 +139,11 @@ class FixedWindowCounter(BaseWindowedTokenBucket, CapacityUpdatingBucket):
         return True
 
     @override
-    def _refill(self, tokens: float) -> None:
-        self._tokens = self._capacity
-        self._scheduled_refill = False
+    def _refill(self, tokens: float, refill_time: float) -> None:
+        reserved = self._reserved_windows.popleft() if self._reserved_windows else 0
+        self._tokens = self._capacity - reserved - self._debt(self._tokens)
+        self._charged = min(self._charged, max(-self._tokens, 0))
+        self._window += 1
+        self._scheduled_refill = bool(self._reserved_windows) or self._tokens < self._capacity
+        if self._scheduled_refill:
+            self._schedule_refill(tokens, refill_time + self._duration)
@@ -7,7 +7,6 @@ import sys
 from typing import Any
 
 from rate_control._buckets._base import BaseRateBucket
-from rate_control._errors import RateLimit
 from rate_control._helpers import mk_repr
 
 if sys.version_info >= (3, 12):
@@ -29,6 +28,8 @@ class LeakyBucket(BaseRateBucket):
         """
         super().__init__(capacity=math.inf, delay=delay, **kwargs)
         self._can_pass_through = True
+        self._withheld_refills = 0
+        self._passes = 0
 
     @override
     def __repr__(self) -> str:
@@ -40,15 +41,80 @@ class LeakyBucket(BaseRateBucket):
 
     @override
     def acquire(self, tokens: float = 1) -> None:
+        super().acquire(tokens)
+
+    @override
+    def try_acquire(self, tokens: float = 1) -> bool:
+        return super().try_acquire(tokens)
+
+    @override
+    def refund(self, tokens: float = 1) -> None:
+        """Let the next request pass through right away,
+        if the previous one ended up not being processed.
+
+        The replenishment that the previous request scheduled is then skipped.
+
+        Args:
+            tokens: Ignored, the bucket only lets one request through at a time.
+        """
         if not self._can_pass_through:
-            raise RateLimit
+            self._can_pass_through = True
+            self._withheld_refills += 1
+
+    @override
+    def _consume(self, tokens: float) -> None:
         self._can_pass_through = False
+        self._passes += 1
         self._ensure_refill()
 
+    @override
+    def _receipt(self) -> int:
+        return self._passes
+
+    @override
+    def _refund(self, tokens: float, receipt: int) -> None:
+        """The bucket is only reopened if no other request passed through since,
+        so that it does not let two requests through within the same ``delay``.
+        """
+        if receipt == self._passes:
+            self.refund(tokens)
+
+    @override
+    def time_until_available(self, tokens: float = 1) -> float:
+        return super().time_until_available(tokens)
+
+    @override
+    def _reservation_time(self, tokens: float, not_before: float, now: float) -> float:
+        if self._can_pass_through:
+            return max(not_before, now)
+        if self._withheld_refills >= len(self._scheduled_refills):
+            return math.inf
+        refill_time, _ = self._scheduled_refills[self._withheld_refills]
+        return max(not_before, refill_time)
+
+    @override
+    def _commit_reservation(self, tokens: float, at: float) -> None:
+        """The bucket stays closed until ``delay`` seconds after the reserved pass,
+        the replenishments that were already scheduled being skipped.
+        """
+        self._can_pass_through = False
+        self._passes += 1
+        self._withheld_refills = len(self._scheduled_refills)
+        self._schedule_refill(tokens, at + self._delay)
+
+    @override
+    def _cancel_reservation(self, tokens: float, at: float) -> None:
+        """The reserved pass is kept consumed,
+        since the passes reserved afterwards are already scheduled relatively to it.
+        """
+
     @override
     def _should_schedule_refill(self) -> bool:
         return True
 
     @override
-    def _refill(self, tokens: float) -> None:
-        self._can_pass_through = True
+    def _refill(self, tokens: float, refill_time: float) -> None:
+        if self._withheld_refills:
+            self._withheld_refills -= 1
+        else:
+            self._can_pass_through = True
@@ -2,9 +2,22 @@ __all__ = [
     'SlidingWindowLog',
 ]
 
+import math
 import sys
+from bisect import bisect_left
+from typing import Any
+
+from anyio import current_time, sleep_until
 
 from rate_control._buckets._base import BaseWindowedTokenBucket, CapacityUpdatingBucket
+from rate_control._helpers._validation import validate_tokens
+
+if sys.version_info >= (3, 9):
+    from builtins import dict as Dict
+    from builtins import tuple as Tuple
+    from collections.abc import Iterator
+else:
+    from typing import Dict, Iterator, Tuple
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -16,12 +29,192 @@ class SlidingWindowLog(BaseWindowedTokenBucket, CapacityUpdatingBucket):
     """Bucket whose refill strategy follows the sliding window log algorithm.
 
     Every consumed tokens get replenished after ``duration`` seconds.
+    The tokens acquired beyond the remaining ones, up to ``max_debt``, are replenished one window later,
+    so that the debt is paid down by the window that follows them.
+    The capacity can follow a :class:`.CapacitySchedule`, passed as ``capacity_schedule``.
     """
 
+    def __init__(self, capacity: float, duration: float, **kwargs: Any) -> None:
+        super().__init__(capacity, duration, **kwargs)
+        self._withheld = 0.0
+        self._cancelled_refills: Dict[float, float] = {}
+        self._freed_slots: Dict[float, float] = {}
+        self._last_booking = -math.inf
+
+    @override
+    def refund(self, tokens: float) -> None:
+        """Give back tokens that were acquired but ended up unused.
+
+        Since the replenishment of these tokens is already scheduled,
+        the same amount is withheld from the upcoming replenishments.
+
+        Args:
+            tokens: The amount of tokens to give back.
+        """
+        tokens_before = self._tokens
+        super().refund(tokens)
+        self._withheld += self._tokens - tokens_before
+
+    @override
+    def _receipt(self) -> float:
+        """
+        Returns:
+            The time from which the tokens that were just consumed are used.
+        """
+        return self._last_booking
+
+    @override
+    def _refund(self, tokens: float, receipt: float) -> None:
+        """The tokens are given back unless they were already replenished, in which case they are kept consumed,
+        and their replenishment is skipped.
+        """
+        self._give_back(tokens, receipt)
+
+    @override
+    def _reservation_time(self, tokens: float, not_before: float, now: float) -> float:
+        validate_tokens(tokens)
+        self._sync_capacity()
+        start = max(not_before, now)
+        at = self._refill_reservation_time(tokens, start)
+        for freed_at, freed in sorted(self._freed_slots.items()):
+            if freed_at >= at:
+                break
+            if freed_at >= start and tokens <= freed + max(self._available_at(freed_at), 0):
+                return freed_at
+        return at
+
+    def _refill_reservation_time(self, tokens: float, start: float) -> float:
+        """
+        Returns:
+            The earliest time from the given start on when the given amount of tokens is available,
+            without taking over the slots of the cancelled reservations.
+        """
+        available = self._tokens + self._max_debt
+        if tokens <= available:
+            return start
+        for refill_time, refilled in self._upcoming_refills():
+            available += refilled
+            if tokens <= available:
+                return max(start, refill_time)
+        return math.inf
+
+    def _available_at(self, moment: float) -> float:
+        """
+        Returns:
+            The amount of tokens available at the given time, debt included,
+            without taking over the slots of the cancelled reservations.
+        """
+        available = self._tokens + self._max_debt
+        for refill_time, refilled in self._upcoming_refills():
+            if refill_time > moment:
+                break
+            available += refilled
+        return available
+
+    @override
+    def _commit_reservation(self, tokens: float, at: float) -> None:
+        """The tokens are consumed right away, and replenished ``duration`` seconds after they can be used.
+
+        The tokens freed by the reservations cancelled for the same time are taken first,
+        along with the replenishment that these reservations scheduled.
+        """
+        freed = min(tokens, self._freed_slots.get(at, 0))
+        if freed:
+            self._freed_slots[at] -= freed
+            if not self._freed_slots[at]:
+                del self._freed_slots[at]
+            tokens -= freed
+        if tokens:
+            self._book(tokens, at, self._available_at(at) - self._max_debt)
+
+    @override
+    def _consume(self, tokens: float) -> None:
+        self._book(tokens, current_time(), self._tokens)
+
+    def _book(self, tokens: float, at: float, available: float) -> None:
+        """Consume the given amount of tokens, to be used at the given time,
+        and schedule their replenishment.
+
+        Args:
+            tokens: The amount of tokens to consume.
+            at: The time from which the tokens are used.
+            available: The amount of tokens available at that time, debt excluded.
+        """
+        borrowed = min(tokens, max(tokens - available, 0))
+        self._tokens -= tokens
+        self._last_booking = at
+        if tokens > borrowed:
+            self._schedule_refill(tokens - borrowed, at + self._duration)
+        if borrowed:
+            self._schedule_refill(borrowed, at + 2 * self._duration)
+
+    @override
+    def _cancel_reservation(self, tokens: float, at: float) -> None:
+        """Until the reservation is due, its tokens are kept for the reservations due at the same time,
+        since their window is the only one that the cancelled reservation frees for sure.
+        The tokens that are left are then given back, and the replenishment of the reservation is skipped.
+        """
+        if at <= current_time():
+            self._give_back(tokens, at)
+            return
+        if at not in self._freed_slots:
+            self._freed_slots[at] = 0
+            self._task_group.start_soon(self._wait_and_give_back, at)
+        self._freed_slots[at] += tokens
+
+    async def _wait_and_give_back(self, at: float) -> None:
+        await sleep_until(at)
+        tokens = self._freed_slots.pop(at, 0)
+        if tokens:
+            self._give_back(tokens, at)
+            self._notify_refill()
+
+    def _give_back(self, tokens: float, at: float) -> None:
+        """Give back the tokens of a reservation due at the given time right away,
+        unless they were already replenished, and skip their replenishment.
+        """
+        refill_time = at + self._duration
+        start = bisect_left(self._scheduled_refills, (refill_time, -math.inf))
+        end = bisect_left(self._scheduled_refills, (refill_time, math.inf))
+        pending = sum(refilled for _, refilled in self._scheduled_refills[start:end])
+        tokens = min(tokens, pending - self._cancelled_refills.get(refill_time, 0))
+        if tokens > 0:
+            self._tokens += tokens
+            self._cancelled_refills[refill_time] = self._cancelled_refills.get(refill_time, 0) + tokens
+
+    def _upcoming_refills(self) -> Iterator[Tuple[float, float]]:
+        """
+        Yields:
+            The time of each scheduled replenishment, along with the amount of tokens it will actually add back.
+        """
+        withheld = self._withheld
+        cancelled_refills = self._cancelled_refills.copy()
+        for refill_time, refilled in self._scheduled_refills:
+            refilled -= self._skip(cancelled_refills, refill_time, refilled)
+            skipped = min(refilled, withheld)
+            withheld -= skipped
+            yield refill_time, refilled - skipped
+
+    @staticmethod
+    def _skip(cancelled_refills: Dict[float, float], refill_time: float, tokens: float) -> float:
+        """
+        Returns:
+            The amount of tokens to skip from the given replenishment,
+            which is deducted from the cancelled tokens.
+        """
+        cancelled = cancelled_refills.pop(refill_time, 0)
+        skipped = min(tokens, cancelled)
+        if cancelled > skipped:
+            cancelled_refills[refill_time] = cancelled - skipped
+        return skipped
+
     @override
     def _should_schedule_refill(self) -> bool:
         return True
 
     @override
-    def _refill(self, tokens: float) -> None:
-        self._tokens += tokens
+    def _refill(self, tokens: float, refill_time: float) -> None:
+        tokens -= self._skip(self._cancelled_refills, refill_time, tokens)
+        withheld = min(tokens, self._withheld)
+        self._withheld -= withheld
+        self._tokens += tokens - withheld
@@ -0,0 +1,198 @@
+__all__ = [
+    'WarmingUpBucket',
+]
+
+import math
+import sys
+from typing import Any, Optional
+
+from anyio import create_task_group, current_time, sleep_until
+
+from rate_control._buckets._base import Bucket, RefillNotifyingBucket
+from rate_control._helpers import ContextAware, mk_repr
+from rate_control._helpers._validation import (
+    validate_capacity,
+    validate_cold_factor,
+    validate_delay,
+    validate_tokens,
+    validate_warmup,
+)
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class WarmingUpBucket(RefillNotifyingBucket, ContextAware, Bucket):
+    """Bucket whose rate ramps up from a cold rate to ``capacity`` tokens every ``duration`` seconds,
+    over a ``warmup`` period, following the smooth warming up algorithm.
+
+    The tokens are spread evenly over time: a request passes through once the cost of the previous ones is paid,
+    that is when the time that they take at the current rate has elapsed.
+    The bucket starts cold, and cools down again while it is not used.
+    Its state is computed lazily from the clock.
+    """
+
+    def __init__(self, capacity: float, duration: float, warmup: float, cold_factor: float = 3, **kwargs: Any) -> None:
+        """
+        Args:
+            capacity: The number of tokens that can be acquired within ``duration``, once the bucket is warm.
+            duration: The duration in seconds over which ``capacity`` applies.
+            warmup: The amount of seconds that it takes, when used at full rate, to go from cold to warm.
+                When unused, the bucket gets back to cold within ``warmup`` seconds.
+            cold_factor: How many times slower the cold rate is than the warm rate.
+                Defaults to `3`.
+        """
+        super().__init__(**kwargs)
+        validate_capacity(capacity)
+        validate_delay(duration)
+        validate_warmup(warmup)
+        validate_cold_factor(cold_factor)
+        self._capacity = capacity
+        self._duration = duration
+        self._warmup = warmup
+        self._cold_factor = cold_factor
+
+        self._stable_interval = duration / capacity
+        cold_interval = self._stable_interval * cold_factor
+        self._threshold = warmup / self._stable_interval / 2
+        self._max_stored = self._threshold + 2 * warmup / (self._stable_interval + cold_interval)
+        self._slope = (cold_interval - self._stable_interval) / (self._max_stored - self._threshold)
+        self._cool_down_interval = warmup / self._max_stored
+
+        self._stored = self._max_stored
+        self._next_free = -math.inf
+        self._waking_up = False
+
+    @override
+    def __repr__(self) -> str:
+        return mk_repr(
+            self, capacity=self._capacity, duration=self._duration, warmup=self._warmup, cold_factor=self._cold_factor
+        )
+
+    @override
+    async def __aenter__(self) -> Self:
+        await super().__aenter__()
+        self._task_group = await create_task_group().__aenter__()
+        return self
+
+    @override
+    async def __aexit__(self, *exc_info: Any) -> Optional[bool]:
+        self._task_group.cancel_scope.cancel()
+        await self._task_group.__aexit__(*exc_info)
+        return await super().__aexit__(*exc_info)
+
+    @override
+    def can_acquire(self, tokens: float) -> bool:
+        """Whether the given amount of tokens can be acquired.
+
+        Any amount of tokens can be acquired once the previous acquisitions are paid,
+        in which case the next ones wait for the cost of this one.
+
+        Args:
+            tokens: The amount of tokens that we want to acquire.
+
+        Returns:
+            Whether the cost of the previous acquisitions is paid.
+        """
+        validate_tokens(tokens)
+        return self._next_free <= current_time()
+
+    @override
+    def time_until_available(self, tokens: float) -> float:
+        validate_tokens(tokens)
+        return max(self._next_free - current_time(), 0)
+
+    @override
+    def refund(self, tokens: float) -> None:
+        """Give back tokens that were acquired but ended up unused.
+
+        The next acquisitions wait for the cost of these tokens at the warm rate less,
+        but no earlier than right away.
+
+        Args:
+            tokens: The amount of tokens to give back.
+        """
+        validate_tokens(tokens)
+        now = current_time()
+        if self._next_free > now:
+            self._next_free = max(self._next_free - tokens * self._stable_interval, now)
+
+    @override
+    def _reservation_time(self, tokens: float, not_before: float, now: float) -> float:
+        validate_tokens(tokens)
+        return max(not_before, self._next_free, now)
+
+    @override
+    def _consume(self, tokens: float) -> None:
+        self._book(tokens, current_time())
+
+    @override
+    def _commit_reservation(self, tokens: float, at: float) -> None:
+        """The cost of the tokens is paid from the time at which they can be used on,
+        the bucket cooling down until then if it is idle.
+        """
+        self._book(tokens, at)
+
+    def _book(self, tokens: float, at: float) -> None:
+        """Spend the given amount of tokens, to be used from the given time on,
+        so that the next acquisitions wait for their cost.
+        """
+        self._cool_down(at)
+        spent = min(tokens, self._stored)
+        self._next_free += self._cost_of_stored(spent) + (tokens - spent) * self._stable_interval
+        self._stored -= spent
+        self._ensure_wake_up()
+
+    def _cool_down(self, now: float) -> None:
+        """Store the tokens that were not used since the previous acquisitions were paid,
+        which makes the upcoming acquisitions slower.
+        """
+        if now > self._next_free:
+            self._stored = min(self._max_stored, self._stored + (now - self._next_free) / self._cool_down_interval)
+            self._next_free = now
+
+    def _cost_of_stored(self, tokens: float) -> float:
+        """
+        Returns:
+            The amount of seconds that spending the given amount of stored tokens costs.
+            The tokens stored beyond the threshold cost more, the more of them are stored.
+        """
+        cost = 0.0
+        above_threshold = self._stored - self._threshold
+        if above_threshold > 0:
+            spent = min(above_threshold, tokens)
+            cost = spent * (self._interval_at(above_threshold) + self._interval_at(above_threshold - spent)) / 2
+            tokens -= spent
+        return cost + tokens * self._stable_interval
+
+    def _interval_at(self, above_threshold: float) -> float:
+        """
+        Returns:
+            The cost of a token, for the given amount of tokens stored beyond the threshold.
+        """
+        return self._stable_interval + above_threshold * self._slope
+
+    def _ensure_wake_up(self) -> None:
+        if self._waking_up:
+            return
+        try:
+            self._task_group.start_soon(self._wake_up)
+        except AttributeError as e:
+            raise RuntimeError(f"Make sure to enter the bucket's context using 'async with {self}'") from e
+        self._waking_up = True
+
+    async def _wake_up(self) -> None:
+        """Notify the replenishment of the bucket once the cost of the previous acquisitions is paid."""
+        deadline = None
+        while deadline != self._next_free:
+            deadline = self._next_free
+            await sleep_until(deadline)
+        self._waking_up = False
+        self._notify_refill()
@@ -0,0 +1,124 @@
+__all__ = [
+    'CapacitySchedule',
+]
+
+import sys
+from bisect import bisect_right
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import Optional
+
+from rate_control._helpers import mk_repr
+from rate_control._helpers._validation import validate_capacity_schedule
+
+if sys.version_info >= (3, 9):
+    from builtins import tuple as Tuple
+    from collections.abc import Mapping
+else:
+    from typing import Mapping, Tuple
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+_RESOLUTION = timedelta(microseconds=1)
+
+
+class CapacitySchedule:
+    """Bucket capacity that varies with the time of the day.
+
+    Each capacity applies from its time of the day until the time of the next one,
+    the last capacity of the day applying until the first time of the next day.
+    """
+
+    __slots__ = ('_capacities', '_times', '_tz')
+
+    def __init__(self, capacities: Mapping[time, float], tz: Optional[tzinfo] = None) -> None:
+        """
+        Args:
+            capacities: The capacity of the bucket from each time of the day.
+            tz: The time zone of the times of the day.
+                Defaults to `None` (the local time zone of the system).
+
+        Raises:
+            ValueError: No capacity was provided, or some of them are negative or zero.
+        """
+        validate_capacity_schedule(capacities)
+        self._times = sorted(capacities)
+        self._capacities = [capacities[time_of_day] for time_of_day in self._times]
+        self._tz = tz
+
+    @override
+    def __repr__(self) -> str:
+        return mk_repr(self, dict(zip(self._times, self._capacities)), tz=self._tz)
+
+    def capacity_at(self, moment: datetime) -> float:
+        """
+        Args:
+            moment: The moment to get the capacity at.
+
+        Returns:
+            The capacity that applies at the given moment.
+        """
+        local_time = moment.astimezone(self._tz).time()
+        return self._capacities[bisect_right(self._times, local_time) - 1]
+
+    def next_change(self, moment: datetime) -> datetime:
+        """
+        Args:
+            moment: The moment to start looking from.
+
+        Returns:
+            The next moment, strictly after the given one, at which another capacity applies.
+            The times of the day that occur twice when the clocks go back apply on both occurrences,
+            and the ones skipped when the clocks go forward apply from the transition on.
+        """
+        moment = moment.astimezone(timezone.utc)
+        today = moment.astimezone(self._tz).date()
+        changes = (
+            change
+            for day in (today, today + timedelta(days=1))
+            for time_of_day in self._times
+            for change in self._occurrences(datetime.combine(day, time_of_day))
+        )
+        return min(change for change in changes if change > moment)
+
+    def _occurrences(self, local: datetime) -> Tuple[datetime, ...]:
+        """
+        Args:
+            local: A naive date and time, in the time zone of the schedule.
+
+        Returns:
+            The moments at which the given local time occurs, in UTC, twice if the clocks go back over it.
+            If the clocks go forward over it instead, the moment at which they do is returned.
+        """
+        first, second = (local.replace(tzinfo=self._tz, fold=fold).astimezone(timezone.utc) for fold in (0, 1))
+        if self._local(first) == local:
+            return first, second
+        # Within a gap, the first fold is resolved after the transition and the second one before it
+        while first - second > _RESOLUTION:
+            middle = second + (first - second) / 2
+            if self._local(middle) >= local:
+                first = middle
+            else:
+                second = middle
+        return (first,)
+
+    def _local(self, moment: datetime) -> datetime:
+        """
+        Returns:
+            The naive date and time of the given moment, in the time zone of the schedule.
+        """
+        return moment.astimezone(self._tz).replace(tzinfo=None)
+
+    def _current(self) -> Tuple[float, float]:
+        """
+        Returns:
+            The capacity that applies now, along with the amount of seconds until the next one applies.
+        """
+        now = self._now()
+        return self.capacity_at(now), (self.next_change(now) - now).total_seconds()
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
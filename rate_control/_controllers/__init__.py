@@ -1,11 +1,14 @@
 __all__ = [
+    'CoDel',
     'NoopController',
     'RateController',
     'RateLimiter',
+    'RequestHandle',
     'Scheduler',
 ]
 
-from ._abc import RateController
+from ._abc import RateController, RequestHandle
+from ._codel import CoDel
 from ._noop_controller import NoopController
 from ._rate_limiter import RateLimiter
 from ._scheduler import Scheduler
@@ -1,16 +1,16 @@
 __all__ = [
     'RateController',
+    'RequestHandle',
 ]
 
 import sys
 from abc import ABC, abstractmethod
-from contextlib import asynccontextmanager
 from typing import Any, Optional
 
 if sys.version_info >= (3, 9):
-    from collections.abc import AsyncIterator
+    from contextlib import AbstractAsyncContextManager as AsyncContextManager
 else:
-    from typing import AsyncIterator
+    from typing import AsyncContextManager
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -40,13 +40,46 @@ class RateController(ABC):
             Whether a request for the given amount of tokens can be processed instantly.
         """
 
-    @asynccontextmanager
     @abstractmethod
-    async def request(self, tokens: float = 1, **kwargs: Any) -> AsyncIterator[None]:
+    def request(self, tokens: float = 1, **kwargs: Any) -> AsyncContextManager['RequestHandle']:
         """Asynchronous context manager that requests the given amount of tokens before execution.
 
+        The context yields a :class:`RequestHandle`, for reconciling the tokens
+        of the request with its actual cost, once known.
+
         Args:
             tokens: The number of tokens required for the request.
                 Defaults to `1`.
         """
-        yield  # pragma: no cover
+
+
+class RequestHandle(ABC):
+    """Handle yielded by the :meth:`RateController.request` context,
+    for adjusting the amount of tokens charged for the request after the fact.
+
+    This is useful when the actual cost of a request is only known once its response arrives:
+    the expected maximum can be requested up front, and the unused tokens given back afterwards.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def refund(self, tokens: float) -> None:
+        """Give back tokens that were charged for the request but ended up unused.
+
+        Args:
+            tokens: The amount of tokens to give back.
+
+        Raises:
+            ValueError: More tokens than what is charged for the request would be given back.
+        """
+
+    @abstractmethod
+    def charge(self, tokens: float) -> None:
+        """Charge additional tokens for the request, even if they are not available anymore.
+
+        Future requests then have to wait for the buckets to catch up.
+
+        Args:
+            tokens: The amount of tokens to charge.
+        """
@@ -4,20 +4,20 @@ __all__ = [
 
 import sys
 from abc import ABC
-from contextlib import contextmanager
 from typing import Any, Optional
 
 from rate_control._bucket_group import BucketGroup
 from rate_control._buckets import Bucket
-from rate_control._controllers._abc import RateController
+from rate_control._controllers._abc import RateController, RequestHandle
 from rate_control._errors import RateLimit
 from rate_control._helpers import mk_repr
-from rate_control._helpers._validation import validate_max_concurrency
+from rate_control._helpers._validation import validate_max_concurrency, validate_tokens
 
 if sys.version_info >= (3, 9):
-    from collections.abc import Iterator
+    from builtins import list as List
+    from builtins import tuple as Tuple
 else:
-    from typing import Iterator
+    from typing import List, Tuple
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -106,27 +106,126 @@ class BucketBasedRateController(RateController, ABC):
     def _is_concurrency_limited(self) -> bool:
         return self._max_concurrency is not None and self._concurrent_requests >= self._max_concurrency
 
-    def _assert_can_acquire(self, tokens: float) -> None:
-        """Make sure that the request for the given amount of tokens can be processed.
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Acquire the given amount of tokens from the underlying buckets, if the request can be processed instantly.
+
+        No spot is held for the concurrency, which is only checked.
 
         Args:
             tokens: The amount of tokens to acquire.
+                Defaults to `1`.
+
+        Returns:
+            Whether the tokens were acquired.
+        """
+        return not self._is_concurrency_limited and (self._bucket is None or self._bucket.try_acquire(tokens))
+
+    def time_until_available(self, tokens: float = 1) -> Optional[float]:
+        """Estimate when a request for the given amount of tokens can be processed,
+        assuming that no other request gets processed in the meantime.
+
+        Args:
+            tokens: The amount of tokens to acquire for the request.
+                Defaults to `1`.
+
+        Returns:
+            The amount of seconds until the request can be processed, `0` if it can be right away,
+            `math.inf` if it never can, or `None` if unknown,
+            for instance when it depends on when the concurrent requests complete.
+        """
+        if self._is_concurrency_limited:
+            return None
+        return 0 if self._bucket is None else self._bucket.time_until_available(tokens)
 
-        Raises:
-            RateLimit: Cannot process the request for the given amount of tokens.
+    def _rate_limit_error(self, tokens: float, reserved_tokens: float = 0) -> RateLimit:
         """
-        if not self.can_acquire(tokens):
-            raise RateLimit(f'Cannot process the request for {tokens} tokens.')
-
-    @contextmanager
-    def _hold_concurrency(self) -> Iterator[None]:
-        """Context manager that handles concurrency management during the execution of a request."""
-        self._concurrent_requests += 1
-        try:
-            yield
-        finally:
-            self._concurrent_requests -= 1
-            self._on_concurrency_release()
+        Args:
+            tokens: The amount of tokens of the request that cannot be processed.
+            reserved_tokens: The amount of tokens that the request must leave untouched.
+                Defaults to `0`.
+
+        Returns:
+            The error to raise for the given amount of tokens,
+            which tells when they could be acquired if the buckets are limiting the request.
+        """
+        message = f'Cannot process the request for {tokens} tokens.'
+        if self._bucket is None or self._bucket.can_acquire(tokens + reserved_tokens):
+            return RateLimit(message)
+        error = self._bucket._rate_limit_error(tokens + reserved_tokens)
+        return RateLimit(message, retry_after=error.retry_after, bucket=error.bucket)
+
+    def _receipt(self) -> Any:
+        """
+        Returns:
+            The record of the tokens that were just acquired from the underlying buckets,
+            for giving them back with :meth:`_give_back`.
+        """
+        return None if self._bucket is None else self._bucket._receipt()
+
+    def _give_back(self, tokens: float, receipt: Any) -> None:
+        """Give back tokens that a processed request ended up not using.
+
+        Args:
+            tokens: The amount of tokens to give back.
+            receipt: The record of the acquisition that the tokens come from, as returned by :meth:`_receipt`.
+        """
+        if self._bucket is not None:
+            self._bucket._refund(tokens, receipt)
+
+    def _charge(self, tokens: float) -> Any:
+        """Charge additional tokens for a processed request, regardless of their availability.
+
+        Returns:
+            The record of the charged tokens, as returned by :meth:`_receipt`.
+        """
+        if self._bucket is None:
+            return None
+        self._bucket._charge(tokens)
+        return self._bucket._receipt()
+
+    def _release_concurrency(self) -> None:
+        """Free the spot held by a request for the concurrency."""
+        self._concurrent_requests -= 1
+        self._on_concurrency_release()
 
     def _on_concurrency_release(self) -> None:
         """Perform additional operations when the amount of concurrent requests lowers."""
+
+
+class _BucketBasedRequest(RequestHandle):
+    """Base class for the asynchronous context managers returned by the bucket based rate controllers,
+    that keep track of the amount of tokens charged for the request.
+
+    The receipt of each acquisition made for the request is kept along with its amount of tokens,
+    so that refunds are given back to the acquisitions they come from, starting from the latest one.
+    """
+
+    __slots__ = ('_controller', '_receipts', '_tokens')
+
+    def __init__(self, controller: BucketBasedRateController, tokens: float) -> None:
+        self._controller = controller
+        self._tokens = tokens
+        self._receipts: List[Tuple[float, Any]] = []
+
+    @override
+    def refund(self, tokens: float) -> None:
+        validate_tokens(tokens)
+        if tokens > self._tokens:
+            raise ValueError(f'Cannot refund more than the {self._tokens} tokens charged. Received {tokens}')
+        self._tokens -= tokens
+        receipts = self._receipts
+        while tokens > 0 and receipts:
+            acquired, receipt = receipts[-1]
+            given_back = min(tokens, acquired)
+            if given_back < acquired:
+                receipts[-1] = (acquired - given_back, receipt)
+            else:
+                receipts.pop()
+            self._controller._give_back(given_back, receipt)
+            tokens -= given_back
+
+    @override
+    def charge(self, tokens: float) -> None:
+        validate_tokens(tokens)
+        self._tokens += tokens
+        self._receipts.append((tokens, self._controller._charge(tokens)))
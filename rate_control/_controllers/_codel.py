@@ -0,0 +1,103 @@
+__all__ = [
+    'CoDel',
+]
+
+import math
+import sys
+from typing import Optional
+
+from rate_control._helpers import mk_repr
+from rate_control._helpers._validation import validate_interval, validate_target_delay
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class CoDel:
+    """Load shedding policy following the CoDel (Controlled Delay) algorithm.
+
+    The policy watches the time that the requests spent waiting in the queue,
+    by the time they are dispatched. When this queuing delay has remained above ``target``
+    for at least ``interval`` seconds, the scheduler starts dropping the requests
+    at the head of its queues, at a rate that increases as long as the delay remains too high.
+
+    Note:
+        A policy instance holds state, it should therefore not be shared between schedulers.
+    """
+
+    __slots__ = ('_count', '_drop_next', '_dropping', '_first_above_time', '_interval', '_last_count', '_target')
+
+    def __init__(self, target: float, interval: float) -> None:
+        """
+        Args:
+            target: The acceptable standing queuing delay, in seconds.
+            interval: The time in seconds during which the queuing delay may exceed ``target``
+                before requests start being dropped. It should be in the order of
+                the worst-case time that a request waits for a refill of the buckets.
+        """
+        validate_target_delay(target)
+        validate_interval(interval)
+        self._target = target
+        self._interval = interval
+        self._first_above_time: Optional[float] = None
+        self._dropping = False
+        self._drop_next = 0.0
+        self._count = 0
+        self._last_count = 0
+
+    @override
+    def __repr__(self) -> str:
+        return mk_repr(self, target=self._target, interval=self._interval)
+
+    def should_drop(self, sojourn_time: float, now: float) -> bool:
+        """Record the dispatch of a request, and decide whether it should be dropped.
+
+        Args:
+            sojourn_time: The time in seconds that the request spent in the queue.
+            now: The current time, as returned by :func:`anyio.current_time`.
+
+        Returns:
+            Whether the request should be dropped rather than processed.
+        """
+        is_above_target = self._is_above_target(sojourn_time, now)
+        if self._dropping:
+            if not is_above_target:
+                self._dropping = False
+                return False
+            if now < self._drop_next:
+                return False
+            self._count += 1
+            self._drop_next = self._control_law(self._drop_next)
+            return True
+        if not is_above_target:
+            return False
+        self._dropping = True
+        delta = self._count - self._last_count
+        recently_dropping = now - self._drop_next < 16 * self._interval
+        self._count = delta if delta > 1 and recently_dropping else 1
+        self._last_count = self._count
+        self._drop_next = self._control_law(now)
+        return True
+
+    def _is_above_target(self, sojourn_time: float, now: float) -> bool:
+        """
+        Returns:
+            Whether the queuing delay has remained above the target for at least an interval.
+        """
+        if sojourn_time < self._target:
+            self._first_above_time = None
+            return False
+        if self._first_above_time is None:
+            self._first_above_time = now + self._interval
+            return False
+        return now >= self._first_above_time
+
+    def _control_law(self, time: float) -> float:
+        """
+        Returns:
+            The time at which the next request should be dropped,
+            which gets closer as the number of drops increases.
+        """
+        return time + self._interval / math.sqrt(self._count)
@@ -3,16 +3,21 @@ __all__ = [
 ]
 
 import sys
-from contextlib import asynccontextmanager
 from typing import Any, ClassVar, Literal
 
-from rate_control._controllers._abc import RateController
+from rate_control._controllers._abc import RateController, RequestHandle
 from rate_control._helpers import mk_repr
+from rate_control._helpers._validation import validate_tokens
 
 if sys.version_info >= (3, 9):
-    from collections.abc import AsyncIterator
+    from contextlib import AbstractAsyncContextManager as AsyncContextManager
 else:
-    from typing import AsyncIterator
+    from typing import AsyncContextManager
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -49,8 +54,41 @@ class NoopController(RateController):
         """Always returns `True`."""
         return True
 
+    def try_acquire(self, tokens: float = 1) -> Literal[True]:
+        """Always returns `True`."""
+        return True
+
+    def time_until_available(self, tokens: float = 1) -> Literal[0]:
+        """Always returns `0`."""
+        return 0
+
+    @override
+    def request(self, tokens: float = 1, **_: Any) -> AsyncContextManager[RequestHandle]:
+        """Asynchronous context manager that does nothing, and yields a handle that does nothing either."""
+        return _NOOP_REQUEST
+
+
+class _NoopRequest(RequestHandle):
+    """Asynchronous context manager returned by :meth:`NoopController.request`, and handle of the request.
+
+    Being stateless, a single instance is shared by all the requests.
+    """
+
+    __slots__ = ()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        return None
+
     @override
-    @asynccontextmanager
-    async def request(self, tokens: float = 1, **_: Any) -> AsyncIterator[None]:
-        """Asynchronous context manager that does nothing else than yield."""
-        yield
+    def refund(self, tokens: float) -> None:
+        validate_tokens(tokens)
+
+    @override
+    def charge(self, tokens: float) -> None:
+        validate_tokens(tokens)
+
+
+_NOOP_REQUEST = _NoopRequest()
@@ -2,26 +2,41 @@ __all__ = [
     'Scheduler',
 ]
 
+import math
 import sys
-from contextlib import asynccontextmanager, suppress
-from typing import Any, NoReturn, Optional
+from bisect import bisect_right
+from contextlib import suppress
+from heapq import heappop, heappush
+from itertools import count, islice
+from typing import Any, Hashable, NoReturn, Optional
 
-from anyio import create_task_group, get_cancelled_exc_class
+from anyio import create_task_group, current_time, fail_at, get_cancelled_exc_class
 from anyio.lowlevel import checkpoint
 
 from rate_control._buckets import Bucket
-from rate_control._controllers._abc import RateController
-from rate_control._controllers._bucket_based import BucketBasedRateController
-from rate_control._enums import Priority, State
-from rate_control._errors import RateLimit, ReachedMaxPending
-from rate_control._helpers import ContextAware, Request, mk_repr
-from rate_control._helpers._validation import validate_max_pending
+from rate_control._controllers._abc import RateController, RequestHandle
+from rate_control._controllers._bucket_based import BucketBasedRateController, _BucketBasedRequest
+from rate_control._controllers._codel import CoDel
+from rate_control._enums import Overflow, Priority, State
+from rate_control._errors import Evicted, Overloaded, ReachedMaxPending
+from rate_control._helpers import ContextAware, PendingRequests, Request, mk_repr
+from rate_control._helpers._validation import (
+    validate_aging,
+    validate_backfill,
+    validate_max_pending,
+    validate_priority,
+    validate_reserved_capacity,
+)
 from rate_control.queues import PriorityQueue, Queue
 
 if sys.version_info >= (3, 9):
-    from collections.abc import AsyncIterator, Callable
+    from builtins import dict as Dict
+    from builtins import list as List
+    from builtins import tuple as Tuple
+    from collections.abc import Callable, Mapping
+    from contextlib import AbstractAsyncContextManager as AsyncContextManager
 else:
-    from typing import AsyncIterator, Callable
+    from typing import AsyncContextManager, Callable, Dict, List, Mapping, Tuple
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -33,6 +48,12 @@ if sys.version_info >= (3, 12):
 else:
     from typing_extensions import override
 
+_MAX_POOLED_REQUESTS = 1024
+"""Maximum number of settled requests that a scheduler keeps around for reuse."""
+
+_BACKFILL_LOOKAHEAD = 32
+"""Maximum number of requests queued behind a blocked head that a scheduler inspects for backfilling."""
+
 
 class Scheduler(BucketBasedRateController, ContextAware, RateController):
     """Rate controller that schedules requests for later processing."""
@@ -43,7 +64,15 @@ class Scheduler(BucketBasedRateController, ContextAware, RateController):
         should_enter_context: bool = True,
         max_concurrency: Optional[int] = None,
         max_pending: Optional[int] = None,
+        max_pending_per_priority: Optional[Mapping[float, int]] = None,
+        reserved_capacity: float = 0,
+        reserved_priority: float = Priority.HIGHEST,
+        overflow: Overflow = Overflow.REJECT_NEW,
+        aging: Optional[float] = None,
+        backfill: int = 0,
+        split_oversized: bool = False,
         queue_factory: Callable[[], Queue[Request]] = PriorityQueue,
+        load_shedding: Optional[CoDel] = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -56,14 +85,54 @@ class Scheduler(BucketBasedRateController, ContextAware, RateController):
                 Defaults to `None` (no limit).
             max_pending: The maximum amount of requests waiting to be processed.
                 Defaults to `None` (no limit).
-            queue_factory: The factory for initializing the request queues.
+            max_pending_per_priority: The maximum amount of requests waiting to be processed,
+                for each of the given priorities. Defaults to `None` (no limit).
+            reserved_capacity: The fraction of the bucket capacity that only requests with
+                ``reserved_priority`` or higher can consume. Defaults to `0` (no reservation).
+            reserved_priority: The lowest priority that may consume the reserved capacity.
+                Defaults to :py:enum:mem:`Priority.HIGHEST`.
+            overflow: What to do when a request comes in while ``max_pending`` is reached.
+                Defaults to :py:enum:mem:`Overflow.REJECT_NEW`.
+            aging: The amount of seconds after which the priority of a pending request is raised by one level,
+                up to :py:enum:mem:`Priority.HIGHEST`, so that requests with low priority cannot be starved.
+                A request is not promoted to a level that reached its ``max_pending_per_priority``,
+                and tries again after another ``aging`` seconds. Defaults to `None` (no aging).
+            backfill: The maximum amount of times that the request at the head of a queue,
+                when it cannot be processed yet, may be overtaken by a cheaper request queued behind it.
+                Only the first requests behind the head are considered.
+                Defaults to `0` (no backfilling).
+            split_oversized: Whether requests for more tokens than the capacity of the buckets
+                should be served as a sequence of partial acquisitions, rather than failing.
+                Defaults to `False`.
+            queue_factory: The factory for initializing the request queue of each priority level.
                 Defaults to :class:`.PriorityQueue`: requests are processed by ascending weight.
+            load_shedding: The policy for dropping queued requests when the queuing delay gets too high.
+                Defaults to `None` (requests are never dropped).
         """
         super().__init__(*buckets, should_enter_context=should_enter_context, max_concurrency=max_concurrency, **kwargs)
         validate_max_pending(max_pending)
+        max_pending_per_priority = max_pending_per_priority or {}
+        for priority, priority_max_pending in max_pending_per_priority.items():
+            validate_priority(priority)
+            validate_max_pending(priority_max_pending)
+        validate_reserved_capacity(reserved_capacity)
+        validate_priority(reserved_priority)
+        validate_aging(aging)
+        validate_backfill(backfill)
         self._max_pending = max_pending
-        self._pending_requests = 0
-        self._queues = [queue_factory() for _ in Priority]
+        self._max_pending_per_priority = dict(max_pending_per_priority)
+        self._reserved_capacity = reserved_capacity
+        self._reserved_priority = reserved_priority
+        self._aging = aging
+        self._aging_heap: List[Tuple[float, int, int, Request]] = []
+        self._aging_counter = count()
+        self._backfill = backfill
+        self._split_oversized = split_oversized
+        self._pending = PendingRequests(overflow)
+        self._queue_factory = queue_factory
+        self._queues: Dict[float, Queue[Request]] = {}
+        self._load_shedding = load_shedding
+        self._request_pool: List[Request] = []
 
     @override
     async def __aenter__(self) -> Self:
@@ -78,7 +147,7 @@ class Scheduler(BucketBasedRateController, ContextAware, RateController):
         assert self._bucket is not None
         while True:
             await self._bucket.wait_for_refill()
-            await self._process_queued_requests()
+            self._process_queued_requests()
             await checkpoint()
 
     @override
@@ -101,121 +170,519 @@ class Scheduler(BucketBasedRateController, ContextAware, RateController):
             else mk_repr(self, max_concurrency=self._max_concurrency, max_pending=self._max_pending)
         )
 
-    @asynccontextmanager
     @override
-    async def request(
+    def request(
         self,
         tokens: float = 1,
-        priority: Priority = Priority.NORMAL,
+        priority: float = Priority.NORMAL,
         fill_or_kill: bool = False,
+        timeout: Optional[float] = None,
+        tenant: Hashable = None,
         **_: Any,
-    ) -> AsyncIterator[None]:
+    ) -> AsyncContextManager[RequestHandle]:
         """Asynchronous context manager that schedules the execution of the contained statements.
 
         Waits until all the conditions of token availability and allowed concurrency are met,
         before actually consuming tokens and holding a spot for the concurrency.
 
+        The context yields a :class:`.RequestHandle`, for reconciling the tokens of the request with its actual cost.
+        The pending requests are processed again when tokens are refunded.
+
         Args:
             tokens: The number of tokens required for the request.
                 Defaults to `1`.
-            priority: The priority of the request.
-                Requests with higher priority will be processed before the others.
+            priority: The priority of the request, which can be any number.
+                Requests with lower values will be processed before the others.
                 Defaults to :py:enum:mem:`Priority.NORMAL`.
             fill_or_kill: Whether :exc:`RateLimit` should be raised
                 if the request cannot be process instantly.
                 Defaults to `False`.
+            timeout: The maximum amount of seconds to wait for the request to be processed.
+                Defaults to `None` (wait indefinitely).
+            tenant: The tenant on behalf of which the request is made,
+                for queues that share the tokens between tenants such as :class:`.FairQueue`.
+                Defaults to `None`.
 
         Raises:
             RateLimit: The request cannot be processed instantly
                 but the ``fill_or_kill`` flag was set to `True`.
-            ReachedMaxPending: The limit of pending requests was reached.
+            ReachedMaxPending: The limit of pending requests, overall or for the given priority, was reached.
+            TimeoutError: The request could not be processed within ``timeout`` seconds.
+            Overloaded: The request was dropped by the ``load_shedding`` policy.
+            Evicted: The request was evicted from the queue by the ``overflow`` policy.
+            ValueError: More tokens than the capacity of the buckets were requested,
+                minus the capacity reserved to higher priorities,
+                and the ``split_oversized`` flag was set to `False`.
+        """
+        return _ScheduledRequest(self, tokens, priority, fill_or_kill, timeout, tenant)
+
+    async def _enter_request(
+        self, tokens: float, priority: float, fill_or_kill: bool, timeout: Optional[float], tenant: Hashable
+    ) -> List[Tuple[float, Any]]:
+        """Wait until the given amount of tokens and a spot for the concurrency are held for a request.
+
+        The arguments and the raised errors are the same as for :meth:`request`.
+
+        Returns:
+            The receipt of each acquisition made for the request, along with its amount of tokens.
         """
         if self._state is not State.ENTERED:
             raise RuntimeError(
                 f"Make sure to enter the scheduler's context using 'async with {type(self).__name__}(...)'"
             )
-        if not self.can_acquire(tokens):
-            if fill_or_kill:
-                raise RateLimit(f'Cannot process the request for {tokens} tokens.')
-            else:
-                await self._schedule_request(tokens, priority)
-        if self._bucket is not None:
-            self._bucket.acquire(tokens)
-        with self._hold_concurrency():
-            yield
+        validate_priority(priority)
+        if self._try_commit(tokens, priority):
+            return [(tokens, self._receipt())]
+        if fill_or_kill:
+            raise self._rate_limit_error(tokens, self._reserved_tokens(priority))
+        deadline = math.inf if timeout is None else current_time() + timeout
+        max_tokens = self._max_tokens_at_once(tokens, priority)
+        receipts: List[Tuple[float, Any]] = []
+        while tokens > max_tokens:
+            receipts.append((max_tokens, await self._acquire(max_tokens, priority, deadline, tenant)))
+            self._release_concurrency()
+            tokens -= max_tokens
+        receipts.append((tokens, await self._acquire(tokens, priority, deadline, tenant)))
+        return receipts
 
     @override
     def _on_concurrency_release(self) -> None:
         if self._max_concurrency is not None and self._concurrent_requests == self._max_concurrency - 1:
-            self._task_group.start_soon(self._process_queued_requests)
+            self._process_queued_requests()
+
+    @override
+    def try_acquire(self, tokens: float = 1, priority: float = Priority.NORMAL) -> bool:
+        """Acquire the given amount of tokens from the underlying buckets, if a request with the given priority
+        could be processed instantly, leaving the capacity reserved to higher priorities untouched.
+
+        No spot is held for the concurrency, which is only checked.
 
-    async def _process_queued_requests(self) -> None:
+        Args:
+            tokens: The amount of tokens to acquire.
+                Defaults to `1`.
+            priority: The priority of the request.
+                Defaults to :py:enum:mem:`Priority.NORMAL`.
+
+        Returns:
+            Whether the tokens were acquired.
+        """
+        validate_priority(priority)
+        return self._try_acquire(tokens, priority)
+
+    @override
+    def time_until_available(self, tokens: float = 1, priority: float = Priority.NORMAL) -> Optional[float]:
+        """Estimate when a request for the given amount of tokens and with the given priority can be processed,
+        assuming that no other request gets scheduled in the meantime.
+
+        The pending requests that would be processed first are taken into account,
+        both for the tokens they will consume and for the spots they will hold for the concurrency.
+        If they request more tokens than the capacity of the buckets,
+        the estimate is a lower bound: the time until the buckets are full again.
+
+        Args:
+            tokens: The amount of tokens to acquire for the request.
+                Defaults to `1`.
+            priority: The priority of the request.
+                Defaults to :py:enum:mem:`Priority.NORMAL`.
+
+        Returns:
+            The amount of seconds until the request can be processed, `0` if it can be right away,
+            `math.inf` if it never can, or `None` if unknown,
+            for instance when it depends on when the concurrent requests complete.
+        """
+        validate_priority(priority)
+        levels = self._pending.levels[: bisect_right(self._pending.levels, priority)]
+        queued_requests = sum(self._pending.count(level) for level in levels)
+        if self._max_concurrency is not None and self._concurrent_requests + queued_requests >= self._max_concurrency:
+            return None
+        if self._bucket is None:
+            return 0
+        needed_tokens = tokens + self._reserved_tokens(priority)
+        queued_tokens = sum(self._pending.cost(level) for level in levels)
+        return self._bucket.time_until_available(
+            max(needed_tokens, min(needed_tokens + queued_tokens, self._bucket.capacity))
+        )
+
+    def _try_acquire(self, tokens: float, priority: float) -> bool:
+        """Same as :meth:`try_acquire`, for an already validated priority."""
+        reserved_tokens = self._reserved_tokens(priority)
+        if reserved_tokens and not self.can_acquire(tokens + reserved_tokens):
+            return False
+        return super().try_acquire(tokens)
+
+    def _try_commit(self, tokens: float, priority: float) -> bool:
+        """Acquire the given amount of tokens and hold a spot for the concurrency,
+        if a request with the given priority can be processed instantly.
+
+        Returns:
+            Whether the resources were committed.
+        """
+        if not self._try_acquire(tokens, priority):
+            return False
+        self._concurrent_requests += 1
+        return True
+
+    def _commit(self, tokens: float) -> Any:
+        """Acquire the given amount of tokens, and hold a spot for the concurrency.
+
+        Returns:
+            The receipt of the acquired tokens.
+        """
+        if self._bucket is not None:
+            self._bucket._consume(tokens)
+        self._concurrent_requests += 1
+        return self._receipt()
+
+    @override
+    def _give_back(self, tokens: float, receipt: Any) -> None:
+        super()._give_back(tokens, receipt)
+        self._process_queued_requests()
+
+    def _refund(self, tokens: float, receipt: Any) -> None:
+        """Give back the resources committed for a request that ended up not being processed."""
+        if self._bucket is not None:
+            self._bucket._refund(tokens, receipt)
+        self._release_concurrency()
+        self._process_queued_requests()
+
+    def _process_queued_requests(self) -> None:
+        if self._aging is not None:
+            self._promote_aged_requests()
         while True:
-            try:
-                queue = next(queue for queue in filter(None, self._queues) if self.can_acquire(queue.head().cost))
-            except StopIteration:
+            request = self._take_next_request()
+            if request is None:
                 break
-            await self._process_next_request(queue)
+            self._process_request(request)
+
+    def _take_next_request(self) -> Optional[Request]:
+        """Take the next request that can be processed out of the queues.
+
+        Returns:
+            The request to process, or `None` if none of the queued requests can be processed yet.
+        """
+        for priority in self._pending.levels:
+            queue = self._queues[priority]
+            if not queue:
+                continue
+            head = queue.head()
+            if self._can_process(head.cost, priority):
+                queue.pop()
+                self._forget(head)
+                return head
+            if head.bypasses < self._backfill:
+                backfilled = self._find_backfill(queue, head)
+                if backfilled is not None:
+                    head.bypasses += 1
+                    queue.remove(backfilled)
+                    self._forget(backfilled)
+                    return backfilled
+        return None
 
-    async def _process_next_request(self, queue: Queue[Request]) -> None:
-        """Fire the next request from the queue and wait until the underlying tokens are acquired.
+    def _find_backfill(self, queue: Queue[Request], head: Request) -> Optional[Request]:
+        """Find a request that can be processed ahead of the blocked head of the given queue.
 
-        Tokens are not acquired directly in this method,
-        in order to support request cancellation.
+        Only the requests within a bounded lookahead are inspected,
+        and the ones that cost at least as much as the head are skipped, since they cannot be processed either.
+        Queues that order their requests by cost are not inspected at all, for the same reason.
+
+        Args:
+            queue: A queue whose head request cannot be processed yet.
+            head: The request at the head of the queue.
+
+        Returns:
+            The first request queued behind the head that can be processed, if any.
+        """
+        if isinstance(queue, PriorityQueue):
+            return None
+        return next(
+            (
+                request
+                for request in islice(queue, 1, 1 + _BACKFILL_LOOKAHEAD)
+                if request.cost < head.cost and self._can_process(request.cost, request.priority)
+            ),
+            None,
+        )
+
+    def _can_process(self, tokens: float, priority: float) -> bool:
+        """
+        Args:
+            tokens: The amount of tokens to acquire for the request.
+            priority: The priority of the request.
+
+        Returns:
+            Whether a request for the given amount of tokens and with the given priority
+            can be processed instantly, leaving the reserved capacity untouched if needed.
+        """
+        return self.can_acquire(tokens + self._reserved_tokens(priority))
+
+    def _max_tokens_at_once(self, tokens: float, priority: float) -> float:
         """
-        request = queue.pop()
-        self._pending_requests -= 1
+        Args:
+            tokens: The amount of tokens requested.
+            priority: The priority of the request.
+
+        Returns:
+            The largest amount of tokens that a request with the given priority can acquire at once.
+
+        Raises:
+            ValueError: The given amount of tokens exceeds this limit, and cannot be split.
+        """
+        if self._bucket is None:
+            return math.inf
+        max_tokens = self._bucket.capacity - self._reserved_tokens(priority)
+        if tokens > max_tokens and (not self._split_oversized or max_tokens <= 0):
+            raise ValueError(
+                f'Cannot acquire {tokens} tokens, as at most {max_tokens} tokens can be acquired at once '
+                f'with priority {priority}.'
+            )
+        return max_tokens
+
+    def _reserved_tokens(self, priority: float) -> float:
+        """
+        Args:
+            priority: The priority of the request.
+
+        Returns:
+            The amount of tokens that a request with the given priority must leave in the bucket.
+        """
+        if self._bucket is None or not self._reserved_capacity or priority <= self._reserved_priority:
+            return 0
+        capacity = self._bucket.capacity
+        return 0 if math.isinf(capacity) else self._reserved_capacity * capacity
+
+    def _process_request(self, request: Request) -> None:
+        """Commit the resources needed by the given request, taken out of its queue,
+        and hand them off to the requester by firing the request.
+
+        The request is dropped instead if the load shedding policy decides so.
+
+        Args:
+            request: The request to process.
+        """
+        if self._should_drop(request):
+            request.reject(Overloaded('The request was dropped as the queuing delay is too high.'))
+            return
+        request.receipt = self._commit(request.cost)
         request.fire()
-        await request.wait_for_ack()
 
-    async def _schedule_request(self, tokens: float, priority: Priority) -> None:
-        """Schedule an internal request to acquire the given amount of tokens, with the given priority.
+    def _should_drop(self, request: Request) -> bool:
+        """
+        Returns:
+            Whether the given request, that was just taken out of its queue,
+            should be dropped according to the load shedding policy.
+        """
+        if self._load_shedding is None:
+            return False
+        now = current_time()
+        return self._load_shedding.should_drop(now - request.scheduled_at, now)
+
+    async def _acquire(self, tokens: float, priority: float, deadline: float, tenant: Hashable) -> Any:
+        """Acquire the given amount of tokens and hold a spot for the concurrency,
+        scheduling a request if they cannot be acquired right away.
+
+        Args:
+            tokens: The amount of tokens to acquire.
+            priority: The request priority.
+            deadline: The time after which the request should no longer be processed.
+            tenant: The tenant on behalf of which the request is made.
+
+        Returns:
+            The receipt of the acquired tokens.
+        """
+        if self._try_commit(tokens, priority):
+            return self._receipt()
+        return await self._schedule_request(tokens, priority, deadline, tenant)
+
+    async def _schedule_request(self, tokens: float, priority: float, deadline: float, tenant: Hashable) -> Any:
+        """Schedule an internal request to acquire the given amount of tokens, with the given priority,
+        and wait until the tokens and a spot for the concurrency are committed on its behalf.
+
+        If the requester is cancelled right after this handoff, the committed resources are given back.
 
         Args:
             tokens: The amount of tokens to acquire.
             priority: The request priority.
+            deadline: The time after which the request should no longer be processed,
+                as returned by :func:`anyio.current_time`.
+            tenant: The tenant on behalf of which the request is made.
+
+        Returns:
+            The receipt of the tokens committed on behalf of the request.
 
         Raises:
             ReachedMaxPending: The limit of pending requests was reached.
+            TimeoutError: The deadline was reached before the request could be processed.
+            Overloaded: The request was dropped by the load shedding policy.
+            Evicted: The request was evicted from the queue by the overflow policy.
         """
-        request = Request(tokens)
-        self._enqueue(request, priority)
+        request = self._new_request(tokens, priority, deadline, tenant)
         try:
-            await request.wait_for_validation()
-        except get_cancelled_exc_class():
-            self._discard(request, priority)
+            self._enqueue(request)
+            if deadline == math.inf:
+                await request.wait_for_validation()
+            else:
+                with fail_at(deadline):
+                    await request.wait_for_validation()
+            return request.receipt
+        except (get_cancelled_exc_class(), TimeoutError):
+            if request.fired:
+                self._refund(tokens, request.receipt)
+            else:
+                self._discard(request)
             raise
         finally:
-            request.ack()
+            if len(self._request_pool) < _MAX_POOLED_REQUESTS:
+                self._request_pool.append(request)
 
-    def _enqueue(self, request: Request, priority: Priority) -> None:
+    def _new_request(self, tokens: float, priority: float, deadline: float, tenant: Hashable) -> Request:
+        """Take a settled request from the pool and reinitialize it, or create one if the pool is empty."""
+        if not self._request_pool:
+            return Request(tokens, priority, deadline, current_time(), tenant)
+        request = self._request_pool.pop()
+        request.reuse(tokens, priority, deadline, current_time(), tenant)
+        return request
+
+    def _enqueue(self, request: Request) -> None:
         """Add the given request to the queue.
 
+        If the limit of pending requests is reached,
+        a pending request may be evicted according to the overflow policy.
+
         Args:
             request: The request to schedule.
-            priority: The priority of the request.
 
         Raises:
-            ReachedMaxPending: The limit of pending requests was reached.
+            ReachedMaxPending: The limit of pending requests was reached for the priority of the request,
+                or it was reached overall and no pending request could be evicted in favor of the new one.
         """
+        if self._is_priority_full(request.priority):
+            raise ReachedMaxPending
         if self._is_pending_limited:
+            self._evict_for(request)
+        self._add(request)
+        if self._aging is not None and request.priority > Priority.HIGHEST:
+            promotion_time = request.scheduled_at + self._aging
+            heappush(self._aging_heap, (promotion_time, next(self._aging_counter), request.generation, request))
+
+    def _add(self, request: Request) -> None:
+        """Add the given request to the queue matching its priority, regardless of the limits."""
+        self._queue_of(request.priority).add(request)
+        self._pending.add(request)
+
+    def _queue_of(self, priority: float) -> Queue[Request]:
+        """Get the queue of the given priority level, creating it if needed."""
+        queue = self._queues.get(priority)
+        if queue is None:
+            queue = self._queues[priority] = self._queue_factory()
+        return queue
+
+    def _evict_for(self, request: Request) -> None:
+        """Evict a pending request to make room for the given one.
+
+        Args:
+            request: The incoming request.
+
+        Raises:
+            ReachedMaxPending: No pending request should be evicted in favor of the incoming one.
+        """
+        evicted = self._pending.victim(request)
+        if evicted is None:
             raise ReachedMaxPending
-        queue = self._queues[priority]
-        queue.add(request)
-        self._pending_requests += 1
+        self._discard(evicted)
+        evicted.reject(Evicted('The request was evicted to make room for another one.'))
+
+    def _promote_aged_requests(self) -> None:
+        """Raise by one level the priority of the requests
+        that have been waiting for ``aging`` seconds since their last promotion.
+
+        Promotions count against ``max_pending_per_priority``:
+        a request is not promoted to a level that is full, and tries again ``aging`` seconds later.
+        Only the requests that are due are visited, thanks to a heap ordered by promotion time.
+        """
+        assert self._aging is not None
+        now = current_time()
+        while self._aging_heap and self._aging_heap[0][0] <= now:
+            promotion_time, _, generation, request = heappop(self._aging_heap)
+            if request.generation != generation or request not in self._pending:
+                continue
+            priority = max(request.priority - 1, Priority.HIGHEST)
+            if not self._is_priority_full(priority):
+                self._promote(request, priority)
+            if request.priority > Priority.HIGHEST:
+                next_promotion = (promotion_time + self._aging, next(self._aging_counter), generation, request)
+                heappush(self._aging_heap, next_promotion)
+
+    def _promote(self, request: Request, priority: float) -> None:
+        """Move the given pending request to the queue of the given priority level."""
+        with suppress(ValueError):
+            self._queues[request.priority].remove(request)
+        previous_priority = request.priority
+        self._pending.promote(request, priority)
+        self._drop_idle_queue(previous_priority)
+        self._queue_of(priority).add(request)
 
     @property
     def _is_pending_limited(self) -> bool:
-        return self._max_pending is not None and self._pending_requests >= self._max_pending
+        return self._max_pending is not None and len(self._pending) >= self._max_pending
 
-    def _discard(self, request: Request, priority: Priority) -> None:
+    def _is_priority_full(self, priority: float) -> bool:
+        """Whether the limit of pending requests is reached for the given priority level."""
+        priority_max_pending = self._max_pending_per_priority.get(priority)
+        return priority_max_pending is not None and self._pending.count(priority) >= priority_max_pending
+
+    def _discard(self, request: Request) -> None:
         """Remove the given request from the queue, if it exists.
 
         Args:
             request: The request to unschedule.
-            priority: The priority with which the request was originally scheduled.
         """
-        queue = self._queues[priority]
-        with suppress(ValueError):
-            queue.remove(request)
-            self._pending_requests -= 1
+        if self._pending.remove(request):
+            with suppress(ValueError):
+                self._queues[request.priority].remove(request)
+            self._drop_idle_queue(request.priority)
+
+    def _forget(self, request: Request) -> None:
+        """Record that the given request, taken out of its queue, is no longer pending."""
+        self._pending.remove(request)
+        self._drop_idle_queue(request.priority)
+
+    def _drop_idle_queue(self, priority: float) -> None:
+        """Get rid of the queue of the given priority level, if it has no pending request left."""
+        if not self._pending.count(priority):
+            del self._queues[priority]
+
+
+class _ScheduledRequest(_BucketBasedRequest):
+    """Asynchronous context manager returned by :meth:`Scheduler.request`, and handle of the request.
+
+    It is written by hand rather than with :func:`contextlib.asynccontextmanager`,
+    for lowering the fixed overhead of each request.
+    """
+
+    __slots__ = ('_fill_or_kill', '_priority', '_tenant', '_timeout')
+
+    _controller: Scheduler
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        tokens: float,
+        priority: float,
+        fill_or_kill: bool,
+        timeout: Optional[float],
+        tenant: Hashable,
+    ) -> None:
+        super().__init__(scheduler, tokens)
+        self._priority = priority
+        self._fill_or_kill = fill_or_kill
+        self._timeout = timeout
+        self._tenant = tenant
+
+    async def __aenter__(self) -> Self:
+        self._receipts = await self._controller._enter_request(
+            self._tokens, self._priority, self._fill_or_kill, self._timeout, self._tenant
+        )
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        self._controller._release_concurrency()
@@ -1,9 +1,11 @@
 __all__ = [
     'Duration',
+    'Overflow',
     'Priority',
     'State',
 ]
 
 from ._duration import Duration
+from ._overflow import Overflow
 from ._priority import Priority
 from ._state import State
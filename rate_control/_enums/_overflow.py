@@ -0,0 +1,25 @@
+__all__ = [
+    'Overflow',
+]
+
+from enum import Enum, auto
+
+
+class Overflow(Enum):
+    """What a scheduler does when a request comes in while the limit of pending requests is reached."""
+
+    REJECT_NEW = auto()
+    """The incoming request is rejected."""
+
+    DROP_OLDEST = auto()
+    """The request that has been waiting the longest is evicted."""
+
+    DROP_LOWEST_PRIORITY = auto()
+    """The latest request among the ones with the lowest priority is evicted,
+    unless the incoming request does not have a higher priority, in which case it is rejected.
+    """
+
+    DROP_LARGEST_COST = auto()
+    """The request with the largest cost is evicted,
+    unless the incoming request does not cost less, in which case it is rejected.
+    """
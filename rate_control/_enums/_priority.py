@@ -9,6 +9,9 @@ class Priority(IntEnum):
     """The priority of a request.
 
     Requests with higher priority will be processed before the others by schedulers.
+
+    Schedulers accept any number as a priority, the lower the more urgent.
+    The members of this enumeration are convenient presets.
     """
 
     HIGHEST = 0
@@ -1,17 +1,47 @@
 __all__ = [
     'Empty',
+    'Evicted',
+    'Overloaded',
     'RateLimit',
     'ReachedMaxPending',
 ]
 
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from rate_control._buckets import Bucket
+
 
 class Empty(Exception):
     """Collection is empty."""
 
 
+class Evicted(Exception):
+    """The request was evicted from the queue to make room for another one."""
+
+
+class Overloaded(Exception):
+    """The request was dropped to keep the queuing delay under control."""
+
+
 class RateLimit(Exception):
     """Cannot process the incoming request."""
 
+    def __init__(self, *args: Any, retry_after: Optional[float] = None, bucket: Optional['Bucket'] = None) -> None:
+        """
+        Args:
+            args: The arguments of the exception, such as the error message.
+            retry_after: The amount of seconds after which the request could succeed,
+                `math.inf` if it never could, or `None` if unknown.
+                Defaults to `None`.
+            bucket: The bucket that could not fulfill the request,
+                or `None` if the request was limited by something else, such as the concurrency.
+                Defaults to `None`.
+        """
+        super().__init__(*args)
+        self.retry_after = retry_after
+        self.bucket = bucket
+
 
 class ReachedMaxPending(Exception):
     """Reached the maximum allowed pending requests."""
@@ -0,0 +1,131 @@
+__all__ = [
+    'FallbackBucket',
+]
+
+import sys
+from typing import Any, Optional
+
+from rate_control._buckets import Bucket
+from rate_control._buckets._base import CompositeBucket
+from rate_control._helpers import mk_repr
+from rate_control._helpers._validation import validate_tokens
+
+if sys.version_info >= (3, 9):
+    from builtins import tuple as Tuple
+else:
+    from typing import Tuple
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class FallbackBucket(CompositeBucket):
+    """Composite bucket that spends the tokens of its underlying buckets in order,
+    falling back to the next bucket whenever the previous ones cannot provide the tokens.
+
+    It can be used for instance for a steady rate that comes with a burst allowance,
+    which is only drawn from when the steady rate is exhausted.
+    """
+
+    def __init__(self, primary: Bucket, *fallbacks: Bucket, should_enter_context: bool = True, **kwargs: Any) -> None:
+        """
+        Args:
+            primary: The bucket to spend the tokens from first.
+            fallbacks: The buckets to spend the tokens from when the previous ones cannot provide them, in order.
+            should_enter_context: Whether entering the context of the fallback bucket
+                should also enter the context of the underlying buckets.
+                Defaults to `True`.
+        """
+        super().__init__(primary, *fallbacks, should_enter_context=should_enter_context, **kwargs)
+        self._latest = primary
+
+    @override
+    def __repr__(self) -> str:
+        return mk_repr(self, *self._buckets, should_enter_context=self._should_enter_context)
+
+    @property
+    @override
+    def capacity(self) -> float:
+        """The largest capacity among the underlying buckets."""
+        return max(bucket.capacity for bucket in self._buckets)
+
+    @override
+    def can_acquire(self, tokens: float) -> bool:
+        """Whether any of the underlying buckets can acquire the given amount of tokens.
+
+        Args:
+            tokens: The amount of tokens that we want to acquire.
+
+        Returns:
+            Whether any of the underlying buckets can acquire the given amount of tokens.
+        """
+        return any(bucket.can_acquire(tokens) for bucket in self._buckets)
+
+    @override
+    def try_acquire(self, tokens: float) -> bool:
+        """Acquire the given amount of tokens from the first underlying bucket that can provide them, if any.
+
+        Args:
+            tokens: The amount of tokens to acquire.
+
+        Returns:
+            Whether the tokens were acquired.
+        """
+        for bucket in self._buckets:
+            if bucket.can_acquire(tokens):
+                self._spend(bucket, tokens)
+                return True
+        return False
+
+    @override
+    def time_until_available(self, tokens: float) -> Optional[float]:
+        """Estimate when the given amount of tokens can be acquired,
+        assuming that no other tokens get acquired in the meantime.
+
+        Args:
+            tokens: The amount of tokens that we want to acquire.
+
+        Returns:
+            The earliest estimate among the underlying buckets,
+            or `None` if none of them can tell.
+        """
+        delays = [
+            delay for delay in (bucket.time_until_available(tokens) for bucket in self._buckets) if delay is not None
+        ]
+        return min(delays, default=None)
+
+    @override
+    def refund(self, tokens: float) -> None:
+        """Give back tokens of the latest acquisition to the underlying bucket that provided them,
+        so that no bucket is credited for tokens that it did not provide.
+
+        Args:
+            tokens: The amount of tokens to give back.
+        """
+        validate_tokens(tokens)
+        self._refund(tokens, self._receipt())
+
+    @override
+    def _consume(self, tokens: float) -> None:
+        if not self.try_acquire(tokens):
+            self._spend(self._buckets[0], tokens)
+
+    def _spend(self, bucket: Bucket, tokens: float) -> None:
+        """Consume the given amount of tokens from the given underlying bucket, and keep track of it."""
+        bucket._consume(tokens)
+        self._latest = bucket
+
+    @override
+    def _receipt(self) -> Tuple[Bucket, Any]:
+        """
+        Returns:
+            The underlying bucket that provided the tokens that were just consumed, along with its receipt.
+        """
+        return self._latest, self._latest._receipt()
+
+    @override
+    def _refund(self, tokens: float, receipt: Tuple[Bucket, Any]) -> None:
+        bucket, bucket_receipt = receipt
+        bucket._refund(tokens, bucket_receipt)
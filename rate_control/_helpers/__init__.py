@@ -1,9 +1,11 @@
 __all__ = [
     'ContextAware',
+    'PendingRequests',
     'Request',
     'mk_repr',
 ]
 
 from ._context_aware import ContextAware
 from ._mk_repr import mk_repr
+from ._pending import PendingRequests
 from ._request import Request
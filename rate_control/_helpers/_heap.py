@@ -0,0 +1,40 @@
+__all__ = [
+    'iter_heap',
+]
+
+import sys
+from heapq import heappop, heappush
+from typing import TypeVar
+
+if sys.version_info >= (3, 9):
+    from builtins import list as List
+    from builtins import tuple as Tuple
+    from collections.abc import Iterator, Sequence
+else:
+    from typing import Iterator, List, Sequence, Tuple
+
+
+_T = TypeVar('_T')
+
+
+def iter_heap(heap: Sequence[_T]) -> Iterator[_T]:
+    """Iterate over the elements of the given heap in ascending order, without copying it.
+
+    The heap is walked down lazily, so that the first ``k`` elements are yielded in ``O(k log k)``,
+    whatever the size of the heap. The heap must not be modified while iterating over it.
+
+    Args:
+        heap: A list that satisfies the heap invariant, as maintained by :mod:`heapq`.
+
+    Yields:
+        The elements of the heap, in the order they would be popped.
+    """
+    if not heap:
+        return
+    frontier: List[Tuple[_T, int]] = [(heap[0], 0)]
+    while frontier:
+        element, index = heappop(frontier)
+        yield element
+        for child in (2 * index + 1, 2 * index + 2):
+            if child < len(heap):
+                heappush(frontier, (heap[child], child))
@@ -0,0 +1,186 @@
+__all__ = [
+    'PendingRequests',
+]
+
+import sys
+from bisect import bisect_left, insort
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Optional
+
+from rate_control._enums import Overflow
+from rate_control._helpers._request import Request
+
+if sys.version_info >= (3, 9):
+    from builtins import dict as Dict
+    from builtins import list as List
+    from builtins import tuple as Tuple
+    from collections.abc import Sequence
+else:
+    from typing import Dict, List, Sequence, Tuple
+
+
+class PendingRequests:
+    """Keeps track of the requests waiting in the queues of a scheduler,
+    in order to pick the one to evict when the scheduler overflows.
+
+    The priority levels that have pending requests are also kept sorted,
+    so that they can be walked without visiting the empty ones.
+    When evicting the oldest or the costliest request, the candidates are kept in a heap,
+    which entries are tagged with the generation of their request so that the stale ones can be skipped.
+    """
+
+    __slots__ = ('_by_priority', '_costs', '_counter', '_eviction_heap', '_length', '_levels', '_overflow')
+
+    def __init__(self, overflow: Overflow) -> None:
+        """
+        Args:
+            overflow: The policy for selecting the request to evict.
+        """
+        self._overflow = overflow
+        self._by_priority: Dict[float, Dict[Request, None]] = {}
+        self._costs: Dict[float, float] = {}
+        self._levels: List[float] = []
+        self._eviction_heap: List[Tuple[float, int, int, Request]] = []
+        self._counter = count()
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def levels(self) -> Sequence[float]:
+        """The priorities of the pending requests, from the most to the least urgent."""
+        return self._levels
+
+    def count(self, priority: float) -> int:
+        """
+        Args:
+            priority: The priority in question.
+
+        Returns:
+            The number of pending requests with the given priority.
+        """
+        requests = self._by_priority.get(priority)
+        return 0 if requests is None else len(requests)
+
+    def cost(self, priority: float) -> float:
+        """
+        Args:
+            priority: The priority in question.
+
+        Returns:
+            The total amount of tokens requested by the pending requests with the given priority.
+        """
+        return self._costs.get(priority, 0)
+
+    def __contains__(self, request: Request) -> bool:
+        requests = self._by_priority.get(request.priority)
+        return requests is not None and request in requests
+
+    def add(self, request: Request) -> None:
+        """Record that the given request is waiting to be processed.
+
+        Args:
+            request: The request in question.
+        """
+        self._link(request)
+        self._length += 1
+        if self._overflow is Overflow.DROP_OLDEST:
+            self._push_eviction_candidate(request.scheduled_at, request)
+        elif self._overflow is Overflow.DROP_LARGEST_COST:
+            self._push_eviction_candidate(-request.cost, request)
+
+    def remove(self, request: Request) -> bool:
+        """Record that the given request is no longer waiting to be processed.
+
+        Args:
+            request: The request in question.
+
+        Returns:
+            Whether the request was pending.
+        """
+        if request not in self:
+            return False
+        self._unlink(request)
+        self._length -= 1
+        return True
+
+    def promote(self, request: Request, priority: float) -> None:
+        """Move the given pending request to another priority level.
+
+        It keeps its rank for being evicted, since neither its age nor its cost change.
+
+        Args:
+            request: The request in question.
+            priority: The new priority of the request.
+        """
+        self._unlink(request)
+        request.priority = priority
+        self._link(request)
+
+    def _link(self, request: Request) -> None:
+        """Record the given request within its priority level."""
+        requests = self._by_priority.get(request.priority)
+        if requests is None:
+            requests = self._by_priority[request.priority] = {}
+            self._costs[request.priority] = 0
+            insort(self._levels, request.priority)
+        requests[request] = None
+        self._costs[request.priority] += request.cost
+
+    def _unlink(self, request: Request) -> None:
+        """Remove the given request from its priority level."""
+        requests = self._by_priority[request.priority]
+        del requests[request]
+        self._costs[request.priority] -= request.cost
+        if not requests:
+            del self._by_priority[request.priority]
+            del self._costs[request.priority]
+            del self._levels[bisect_left(self._levels, request.priority)]
+
+    def _push_eviction_candidate(self, key: float, request: Request) -> None:
+        heappush(self._eviction_heap, (key, next(self._counter), request.generation, request))
+        if len(self._eviction_heap) > 2 * self._length:
+            self._compact()
+
+    def victim(self, request: Request) -> Optional[Request]:
+        """Select the pending request to evict in favor of the given incoming one.
+
+        Args:
+            request: The incoming request.
+
+        Returns:
+            The request to evict, or `None` if the incoming request should be rejected instead.
+        """
+        if not self._length or self._overflow is Overflow.REJECT_NEW:
+            return None
+        if self._overflow is Overflow.DROP_OLDEST:
+            return self._first_eviction_candidate()
+        if self._overflow is Overflow.DROP_LOWEST_PRIORITY:
+            lowest = self._lowest_priority()
+            return lowest if lowest.priority > request.priority else None
+        costliest = self._first_eviction_candidate()
+        return costliest if costliest.cost > request.cost else None
+
+    def _lowest_priority(self) -> Request:
+        return next(reversed(self._by_priority[self._levels[-1]]))
+
+    def _first_eviction_candidate(self) -> Request:
+        while True:
+            entry = self._eviction_heap[0]
+            if self._is_live(entry):
+                return entry[-1]
+            heappop(self._eviction_heap)
+
+    def _compact(self) -> None:
+        """Get rid of the entries of the eviction heap that are no longer pending."""
+        self._eviction_heap = [entry for entry in self._eviction_heap if self._is_live(entry)]
+        heapify(self._eviction_heap)
+
+    def _is_live(self, entry: Tuple[float, int, int, Request]) -> bool:
+        """Whether the given entry of the eviction heap still refers to a pending request,
+        rather than to a previous use of a pooled request.
+        """
+        *_, generation, request = entry
+        return request.generation == generation and request in self
@@ -1,10 +1,12 @@
 __all__ = [
+    'Billable',
     'Comparable',
+    'Expiring',
 ]
 
 import sys
 from abc import abstractmethod
-from typing import Protocol
+from typing import Hashable, Protocol
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -12,6 +14,16 @@ else:
     from typing_extensions import Self
 
 
+class Billable(Protocol):
+    __slots__ = ()
+
+    cost: float
+    """The amount of tokens that the object consumes."""
+
+    tenant: Hashable
+    """The tenant to which the cost of the object is billed."""
+
+
 class Comparable(Protocol):
     __slots__ = ()
 
@@ -25,3 +37,10 @@ class Comparable(Protocol):
         Returns:
             Whether ``self < other``.
         """
+
+
+class Expiring(Protocol):
+    __slots__ = ()
+
+    deadline: float
+    """The time after which the object expires, as returned by :func:`anyio.current_time`."""
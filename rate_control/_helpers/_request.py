@@ -2,12 +2,15 @@ __all__ = [
     'Request',
 ]
 
+import asyncio
+import math
 import sys
-from typing import Any
+from typing import Any, Hashable, Optional, Union
 
 from anyio import Event
 
-from rate_control._helpers._protocols import Comparable
+from rate_control._enums import Priority
+from rate_control._helpers._protocols import Billable, Comparable, Expiring
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -20,20 +23,81 @@ else:
     from typing_extensions import override
 
 
-class Request(Comparable):
-    """Represents a user's request for tokens"""
+class Request(Billable, Comparable, Expiring):
+    """Represents a user's request for tokens.
 
-    __slots__ = ('_ack_event', 'cost', '_validation_event')
+    A request can be reinitialized with :meth:`reuse` once it has been settled,
+    so that request objects can be pooled. Its :attr:`generation` then increases,
+    which allows to tell apart the references that were kept to a previous use of the request.
+    """
 
-    def __init__(self, cost: float, **kwargs: Any) -> None:
+    __slots__ = (
+        'bypasses',
+        'cost',
+        'deadline',
+        '_error',
+        '_fired',
+        'generation',
+        'priority',
+        'receipt',
+        'scheduled_at',
+        'tenant',
+        '_waiter',
+    )
+
+    def __init__(
+        self,
+        cost: float,
+        priority: float = Priority.NORMAL,
+        deadline: float = math.inf,
+        scheduled_at: float = 0,
+        tenant: Hashable = None,
+        **kwargs: Any,
+    ) -> None:
         """
         Args:
             cost: The number of tokens requested.
+            priority: The current priority of the request, the lower the more urgent.
+                Defaults to :py:enum:mem:`Priority.NORMAL`.
+            deadline: The time after which the request should no longer be processed,
+                as returned by :func:`anyio.current_time`.
+                Defaults to `math.inf` (no deadline).
+            scheduled_at: The time at which the request was scheduled,
+                as returned by :func:`anyio.current_time`.
+                Defaults to `0`.
+            tenant: The tenant on behalf of which the request was made.
+                Defaults to `None`.
         """
         super().__init__(**kwargs)
+        self.generation = 0
+        self._setup(cost, priority, deadline, scheduled_at, tenant)
+
+    def reuse(
+        self,
+        cost: float,
+        priority: float = Priority.NORMAL,
+        deadline: float = math.inf,
+        scheduled_at: float = 0,
+        tenant: Hashable = None,
+    ) -> None:
+        """Reinitialize the settled request, so that it represents a new request.
+
+        The arguments are the same as for the constructor.
+        """
+        self.generation += 1
+        self._setup(cost, priority, deadline, scheduled_at, tenant)
+
+    def _setup(self, cost: float, priority: float, deadline: float, scheduled_at: float, tenant: Hashable) -> None:
         self.cost = cost
-        self._validation_event = Event()
-        self._ack_event = Event()
+        self.priority = priority
+        self.deadline = deadline
+        self.scheduled_at = scheduled_at
+        self.tenant = tenant
+        self.bypasses = 0
+        self.receipt: Any = None
+        self._fired = False
+        self._error: Optional[Exception] = None
+        self._waiter: Union['asyncio.Future[None]', Event, None] = None
 
     @override
     def __lt__(self, other: Self) -> bool:
@@ -42,18 +106,60 @@ class Request(Comparable):
         """
         return self.cost < other.cost
 
+    @property
+    def fired(self) -> bool:
+        """Whether the request has been fired, rather than rejected."""
+        return self._fired
+
     async def wait_for_validation(self) -> None:
-        """Wait until the request has been fired."""
-        await self._validation_event.wait()
+        """Wait until the request has been fired.
+
+        Raises:
+            Exception: The error with which the request was rejected, if any.
+        """
+        if not self._fired and self._error is None:
+            waiter = self._waiter = _create_waiter()
+            if isinstance(waiter, Event):
+                await waiter.wait()
+            else:
+                await waiter
+        if self._error is not None:
+            raise self._error
 
     def fire(self) -> None:
-        """Fire the request."""
-        self._validation_event.set()
+        """Fire the request, once the resources it needs have been committed on its behalf.
+
+        The :attr:`receipt` of the committed tokens should be set beforehand.
+        """
+        self._fired = True
+        self._wake_up()
+
+    def reject(self, error: Exception) -> None:
+        """Wake up the request so that it fails with the given error.
+
+        Args:
+            error: The error to raise to the requester.
+        """
+        self._error = error
+        self._wake_up()
+
+    def _wake_up(self) -> None:
+        waiter = self._waiter
+        if isinstance(waiter, Event):
+            waiter.set()
+        elif waiter is not None and not waiter.done():
+            waiter.set_result(None)
 
-    async def wait_for_ack(self) -> None:
-        """Wait until the request has been acknowledged."""
-        await self._ack_event.wait()
 
-    def ack(self) -> None:
-        """Acknowledge the request."""
-        self._ack_event.set()
+def _create_waiter() -> Union['asyncio.Future[None]', Event]:
+    """
+    Returns:
+        A bare future when running within an asyncio task, which is lighter than an event,
+        or an event otherwise.
+    """
+    try:
+        if asyncio.current_task() is not None:
+            return asyncio.get_running_loop().create_future()
+    except RuntimeError:
+        pass
+    return Event()
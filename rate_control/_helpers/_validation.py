@@ -1,12 +1,51 @@
 __all__ = [
+    'validate_aging',
+    'validate_backfill',
     'validate_capacity',
+    'validate_capacity_schedule',
+    'validate_cold_factor',
     'validate_delay',
+    'validate_fixed_costs',
+    'validate_interval',
     'validate_max_concurrency',
+    'validate_max_debt',
     'validate_max_pending',
+    'validate_priority',
+    'validate_reserved_capacity',
+    'validate_target_delay',
     'validate_tokens',
+    'validate_warmup',
+    'validate_weight',
 ]
 
-from typing import Optional
+import math
+import sys
+from typing import Optional, TypeVar
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Collection, Mapping
+else:
+    from typing import Collection, Mapping
+
+_T = TypeVar('_T')
+
+
+def validate_aging(aging: Optional[float]) -> None:
+    """
+    Raises:
+        ValueError: Negative or zero aging delay was provided.
+    """
+    if aging is not None and aging <= 0:
+        raise ValueError(f"'aging' must be strictly positive, or '{None}' for no aging. Received {aging}")
+
+
+def validate_backfill(backfill: int) -> None:
+    """
+    Raises:
+        ValueError: Negative amount of bypasses was provided.
+    """
+    if backfill < 0:
+        raise ValueError(f"'backfill' must be positive or zero. Received {backfill}")
 
 
 def validate_capacity(capacity: float) -> None:
@@ -18,6 +57,26 @@ def validate_capacity(capacity: float) -> None:
         raise ValueError(f'The bucket capacity has to be strictly positive. Received {capacity}')
 
 
+def validate_capacity_schedule(capacities: Mapping[_T, float]) -> None:
+    """
+    Raises:
+        ValueError: No capacity was provided, or some of them are negative or zero.
+    """
+    if not capacities:
+        raise ValueError('The capacity schedule must define at least one capacity')
+    for capacity in capacities.values():
+        validate_capacity(capacity)
+
+
+def validate_cold_factor(cold_factor: float) -> None:
+    """
+    Raises:
+        ValueError: Cold factor lower than 1 was provided.
+    """
+    if cold_factor < 1:
+        raise ValueError(f"'cold_factor' must be greater than or equal to 1. Received {cold_factor}")
+
+
 def validate_delay(delay: float) -> None:
     """
     Raises:
@@ -27,6 +86,27 @@ def validate_delay(delay: float) -> None:
         raise ValueError(f'The bucket refill delay has to be strictly positive. Received {delay}')
 
 
+def validate_fixed_costs(fixed_costs: Mapping[_T, float], buckets: Collection[_T]) -> None:
+    """
+    Raises:
+        ValueError: A fixed cost was provided for a bucket outside of the group, or is negative.
+    """
+    for bucket, cost in fixed_costs.items():
+        if bucket not in buckets:
+            raise ValueError(f'Cannot set a fixed cost for {bucket}, which is not part of the group')
+        if cost < 0:
+            raise ValueError(f'The fixed cost of {bucket} must be positive or zero. Received {cost}')
+
+
+def validate_interval(interval: float) -> None:
+    """
+    Raises:
+        ValueError: Negative or zero interval was provided.
+    """
+    if interval <= 0:
+        raise ValueError(f'The interval has to be strictly positive. Received {interval}')
+
+
 def validate_max_concurrency(max_concurrency: Optional[int]) -> None:
     """
     Raises:
@@ -38,6 +118,15 @@ def validate_max_concurrency(max_concurrency: Optional[int]) -> None:
         )
 
 
+def validate_max_debt(max_debt: float) -> None:
+    """
+    Raises:
+        ValueError: Negative debt limit was provided.
+    """
+    if max_debt < 0:
+        raise ValueError(f"'max_debt' must be positive or zero. Received {max_debt}")
+
+
 def validate_max_pending(max_pending: Optional[int]) -> None:
     """
     Raises:
@@ -49,6 +138,33 @@ def validate_max_pending(max_pending: Optional[int]) -> None:
         )
 
 
+def validate_priority(priority: float) -> None:
+    """
+    Raises:
+        ValueError: The priority cannot be ordered.
+    """
+    if math.isnan(priority):
+        raise ValueError(f"'priority' must be a number. Received {priority}")
+
+
+def validate_reserved_capacity(reserved_capacity: float) -> None:
+    """
+    Raises:
+        ValueError: The reserved capacity is not a fraction between 0 and 1.
+    """
+    if not 0 <= reserved_capacity <= 1:
+        raise ValueError(f"'reserved_capacity' must be a fraction between 0 and 1. Received {reserved_capacity}")
+
+
+def validate_target_delay(target: float) -> None:
+    """
+    Raises:
+        ValueError: Negative or zero target delay was provided.
+    """
+    if target <= 0:
+        raise ValueError(f'The target delay has to be strictly positive. Received {target}')
+
+
 def validate_tokens(tokens: float) -> None:
     """
     Raises:
@@ -56,3 +172,21 @@ def validate_tokens(tokens: float) -> None:
     """
     if tokens < 0:
         raise ValueError(f'Cannot acquire a negative amount of tokens. Received {tokens}')
+
+
+def validate_warmup(warmup: float) -> None:
+    """
+    Raises:
+        ValueError: Negative or zero warm-up period was provided.
+    """
+    if warmup <= 0:
+        raise ValueError(f'The warm-up period has to be strictly positive. Received {warmup}')
+
+
+def validate_weight(weight: float) -> None:
+    """
+    Raises:
+        ValueError: Negative or zero weight was provided.
+    """
+    if weight <= 0:
+        raise ValueError(f'The weight must be strictly positive. Received {weight}')
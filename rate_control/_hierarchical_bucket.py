@@ -0,0 +1,171 @@
+__all__ = [
+    'HierarchicalBucket',
+]
+
+import sys
+from typing import Any, Optional
+
+from rate_control._buckets import Bucket
+from rate_control._buckets._base import CompositeBucket
+from rate_control._helpers import mk_repr
+from rate_control._helpers._validation import validate_tokens
+
+if sys.version_info >= (3, 9):
+    from builtins import tuple as Tuple
+    from collections.abc import Iterable
+else:
+    from typing import Iterable, Tuple
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class HierarchicalBucket(CompositeBucket):
+    """Composite bucket that guarantees a share of capacity, and borrows the unused capacity
+    of a parent bucket beyond it, in the style of the hierarchical token bucket algorithm.
+
+    Tokens are taken from the ``guaranteed`` bucket whenever it can provide them,
+    and borrowed from the ``parent`` bucket otherwise, within the limit set by the ``ceiling`` bucket.
+    The parent is charged in both cases, so that it accounts for the whole usage of its children.
+
+    The parent can itself be a hierarchical bucket, for instance for global, organization and user limits.
+    Acquiring tokens then only involves the buckets on the path to the root, and not the sibling buckets.
+    """
+
+    def __init__(
+        self,
+        guaranteed: Bucket,
+        parent: Optional[Bucket] = None,
+        ceiling: Optional[Bucket] = None,
+        should_enter_context: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            guaranteed: The bucket holding the share of capacity that is guaranteed,
+                whatever the usage of the sibling buckets.
+            parent: The bucket shared with the sibling buckets, which unused capacity can be borrowed.
+                Defaults to `None` (no borrowing).
+            ceiling: The bucket limiting the overall usage, including the borrowed tokens.
+                Defaults to `None` (no limit besides the capacity of the parent).
+            should_enter_context: Whether entering the context of the hierarchical bucket should also enter
+                the context of the guaranteed and ceiling buckets. Being shared, the parent is not entered.
+                Defaults to `True`.
+        """
+        buckets = (guaranteed,) + tuple(bucket for bucket in (parent, ceiling) if bucket is not None)
+        super().__init__(*buckets, should_enter_context=should_enter_context, **kwargs)
+        self._guaranteed = guaranteed
+        self._parent = parent
+        self._ceiling = ceiling
+        self._borrowing = False
+
+    @override
+    def __repr__(self) -> str:
+        return mk_repr(
+            self,
+            self._guaranteed,
+            parent=self._parent,
+            ceiling=self._ceiling,
+            should_enter_context=self._should_enter_context,
+        )
+
+    @property
+    @override
+    def _owned_buckets(self) -> Iterable[Bucket]:
+        return (bucket for bucket in (self._guaranteed, self._ceiling) if bucket is not None)
+
+    @property
+    @override
+    def capacity(self) -> float:
+        """The largest amount of tokens that can be acquired at once,
+        either from the guaranteed bucket or from the parent, within the ceiling.
+        """
+        capacity = self._guaranteed.capacity
+        if self._parent is not None:
+            capacity = max(capacity, self._parent.capacity)
+        if self._ceiling is not None:
+            capacity = min(capacity, self._ceiling.capacity)
+        return capacity
+
+    @override
+    def can_acquire(self, tokens: float) -> bool:
+        """Whether the given amount of tokens can be acquired.
+
+        Args:
+            tokens: The amount of tokens that we want to acquire.
+
+        Returns:
+            Whether the ceiling bucket can acquire the given amount of tokens,
+            and either the guaranteed bucket or the parent can provide them.
+        """
+        return (self._ceiling is None or self._ceiling.can_acquire(tokens)) and (
+            self._guaranteed.can_acquire(tokens) or (self._parent is not None and self._parent.can_acquire(tokens))
+        )
+
+    @override
+    def time_until_available(self, tokens: float) -> Optional[float]:
+        """Estimate when the given amount of tokens can be acquired,
+        assuming that no other tokens get acquired in the meantime.
+
+        Args:
+            tokens: The amount of tokens that we want to acquire.
+
+        Returns:
+            The estimate of the ceiling bucket, or the earliest estimate among the guaranteed bucket
+            and the parent if it is longer, or `None` if any of them cannot tell.
+        """
+        delays = [self._guaranteed.time_until_available(tokens)]
+        if self._parent is not None:
+            delays.append(self._parent.time_until_available(tokens))
+        ceiling_delay = 0 if self._ceiling is None else self._ceiling.time_until_available(tokens)
+        if ceiling_delay is None or None in delays:
+            return None
+        return max(ceiling_delay, min(delay for delay in delays if delay is not None))
+
+    @override
+    def refund(self, tokens: float) -> None:
+        """Give back tokens of the latest acquisition to the parent and the ceiling bucket,
+        which are charged for every acquisition, and to the guaranteed bucket if it provided them,
+        so that borrowing does not add guaranteed capacity.
+
+        Args:
+            tokens: The amount of tokens to give back.
+        """
+        validate_tokens(tokens)
+        self._refund(tokens, self._receipt())
+
+    @override
+    def _consume(self, tokens: float) -> None:
+        self._borrowing = self._parent is not None and not self._guaranteed.can_acquire(tokens)
+        if not self._borrowing:
+            self._guaranteed._consume(tokens)
+        if self._parent is not None:
+            self._parent._consume(tokens)
+        if self._ceiling is not None:
+            self._ceiling._consume(tokens)
+
+    @override
+    def _receipt(self) -> Tuple[bool, Any, Any, Any]:
+        """
+        Returns:
+            Whether the tokens that were just consumed were borrowed,
+            along with the receipts of the guaranteed, parent and ceiling buckets.
+        """
+        return (
+            self._borrowing,
+            None if self._borrowing else self._guaranteed._receipt(),
+            None if self._parent is None else self._parent._receipt(),
+            None if self._ceiling is None else self._ceiling._receipt(),
+        )
+
+    @override
+    def _refund(self, tokens: float, receipt: Tuple[bool, Any, Any, Any]) -> None:
+        borrowed, guaranteed_receipt, parent_receipt, ceiling_receipt = receipt
+        if self._parent is not None:
+            self._parent._refund(tokens, parent_receipt)
+        if self._ceiling is not None:
+            self._ceiling._refund(tokens, ceiling_receipt)
+        if not borrowed:
+            self._guaranteed._refund(tokens, guaranteed_receipt)
@@ -0,0 +1,53 @@
+__all__ = [
+    'Reservation',
+]
+
+import sys
+from typing import TYPE_CHECKING
+
+from rate_control._helpers import mk_repr
+
+if TYPE_CHECKING:
+    from rate_control._buckets import Bucket
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class Reservation:
+    """Tokens booked against the future capacity of a bucket, as returned by :meth:`.Bucket.reserve`.
+
+    The tokens are committed as soon as the reservation is made,
+    and can be used once :attr:`delay` seconds have elapsed.
+    """
+
+    __slots__ = ('_at', '_bucket', '_cancelled', 'delay', 'tokens')
+
+    def __init__(self, bucket: 'Bucket', tokens: float, at: float, delay: float) -> None:
+        """
+        Args:
+            bucket: The bucket that the tokens were booked from.
+            tokens: The amount of tokens booked.
+            at: The time from which the tokens can be used, as returned by :func:`anyio.current_time`.
+            delay: The amount of seconds to wait before using the tokens.
+        """
+        self._bucket = bucket
+        self.tokens = tokens
+        self._at = at
+        self.delay = delay
+        self._cancelled = False
+
+    @override
+    def __repr__(self) -> str:
+        return mk_repr(self, self._bucket, tokens=self.tokens, delay=self.delay)
+
+    def cancel(self) -> None:
+        """Give the booked tokens back to the bucket, if it supports refunds.
+
+        Cancelling a reservation more than once has no effect.
+        """
+        if not self._cancelled:
+            self._cancelled = True
+            self._bucket._cancel_reservation(self.tokens, self._at)
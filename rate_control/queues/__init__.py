@@ -1,4 +1,6 @@
 __all__ = [
+    'EdfQueue',
+    'FairQueue',
     'FifoQueue',
     'LifoQueue',
     'PriorityQueue',
@@ -6,6 +8,8 @@ __all__ = [
 ]
 
 from ._abc import Queue
+from ._edf import EdfQueue
+from ._fair import FairQueue
 from ._fifo import FifoQueue
 from ._lifo import LifoQueue
 from ._priority import PriorityQueue
@@ -6,6 +6,11 @@ import sys
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar
 
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterator
+else:
+    from typing import Iterator
+
 if sys.version_info >= (3, 12):
     from typing import override
 else:
@@ -31,6 +36,15 @@ class Queue(ABC, Generic[_T]):
         The elements appear in the order they will be popped.
         """
 
+    def __iter__(self) -> Iterator[_T]:
+        """Iterate over the elements of the queue, in the order they will be popped.
+
+        Queues that do not override this method only yield their head element,
+        which disables backfilling in the :class:`.Scheduler`.
+        """
+        if self:
+            yield self.head()
+
     @abstractmethod
     def head(self) -> _T:
         """
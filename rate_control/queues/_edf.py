@@ -0,0 +1,109 @@
+__all__ = [
+    'EdfQueue',
+]
+
+import sys
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Any, TypeVar
+
+from anyio import current_time
+
+from rate_control._errors import Empty
+from rate_control._helpers import mk_repr
+from rate_control._helpers._heap import iter_heap
+from rate_control._helpers._protocols import Expiring
+from rate_control.queues._abc import Queue
+
+if sys.version_info >= (3, 9):
+    from builtins import list as List
+    from builtins import tuple as Tuple
+    from collections.abc import Callable, Iterator
+else:
+    from typing import Callable, Iterator, List, Tuple
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+_T = TypeVar('_T', bound=Expiring)
+
+
+class EdfQueue(Queue[_T]):
+    """ "Earliest Deadline First" queue.
+
+    Elements are retrieved by ascending deadline,
+    and in the order they arrived if their deadlines are equal.
+
+    Elements whose deadline has passed are lazily dropped
+    from the queue, the next time that it is inspected.
+    """
+
+    __slots__ = ('_clock', '_counter', '_queue')
+
+    def __init__(self, *elements: _T, clock: Callable[[], float] = current_time, **kwargs: Any) -> None:
+        """
+        Args:
+            elements: The elements to initialize the queue with.
+            clock: The function returning the current time, to compare the deadlines against.
+                Defaults to :func:`anyio.current_time`.
+        """
+        self._clock = clock
+        self._counter = count()
+        self._queue: List[Tuple[float, int, _T]] = [
+            (element.deadline, next(self._counter), element) for element in elements
+        ]
+        heapify(self._queue)
+        super().__init__(**kwargs)
+
+    @override
+    def __repr__(self) -> str:
+        return mk_repr(self, *(element for *_, element in sorted(self._queue)))
+
+    @override
+    def __bool__(self) -> bool:
+        self._drop_expired()
+        return bool(self._queue)
+
+    @override
+    def __iter__(self) -> Iterator[_T]:
+        self._drop_expired()
+        for *_, element in iter_heap(self._queue):
+            yield element
+
+    @override
+    def head(self) -> _T:
+        self._drop_expired()
+        try:
+            return self._queue[0][-1]
+        except IndexError as e:
+            raise Empty from e
+
+    @override
+    def pop(self) -> _T:
+        self._drop_expired()
+        try:
+            return heappop(self._queue)[-1]
+        except IndexError as e:
+            raise Empty from e
+
+    @override
+    def add(self, element: _T) -> None:
+        heappush(self._queue, (element.deadline, next(self._counter), element))
+
+    @override
+    def remove(self, element: _T) -> None:
+        for index, (*_, queued) in enumerate(self._queue):
+            if queued == element:
+                del self._queue[index]
+                heapify(self._queue)
+                return
+        raise ValueError(f'{element!r} is not in the queue')
+
+    def _drop_expired(self) -> None:
+        """Remove the elements whose deadline has passed from the head of the queue."""
+        now = self._clock()
+        while self._queue and self._queue[0][0] <= now:
+            heappop(self._queue)
@@ -0,0 +1,136 @@
+__all__ = [
+    'FairQueue',
+]
+
+import sys
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Any, Hashable, Optional, TypeVar
+
+from rate_control._errors import Empty
+from rate_control._helpers import mk_repr
+from rate_control._helpers._heap import iter_heap
+from rate_control._helpers._protocols import Billable
+from rate_control._helpers._validation import validate_weight
+from rate_control.queues._abc import Queue
+
+if sys.version_info >= (3, 9):
+    from builtins import dict as Dict
+    from builtins import list as List
+    from builtins import tuple as Tuple
+    from collections.abc import Iterator, Mapping
+else:
+    from typing import Dict, Iterator, List, Mapping, Tuple
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+_T = TypeVar('_T', bound=Billable)
+
+
+class FairQueue(Queue[_T]):
+    """Weighted fair queue, that shares the tokens between tenants according to their weights.
+
+    Each element is stamped on arrival with the virtual time at which it would finish
+    if every backlogged tenant was served at a rate proportional to its weight,
+    and elements are retrieved by ascending stamp. Elements of a same tenant
+    are therefore retrieved in the order they arrived, and a tenant with
+    a deep backlog does not delay the elements of the other tenants.
+
+    Adding and retrieving elements takes logarithmic time in the amount of elements,
+    regardless of the amount of tenants.
+    """
+
+    __slots__ = ('_backlogs', '_counter', '_default_weight', '_last_finish', '_queue', '_virtual_time', '_weights')
+
+    def __init__(
+        self,
+        *elements: _T,
+        weights: Optional[Mapping[Hashable, float]] = None,
+        default_weight: float = 1,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            elements: The elements to initialize the queue with.
+            weights: The weight of each tenant. Defaults to `None` (every tenant has the default weight).
+            default_weight: The weight of the tenants that are not listed in ``weights``.
+                Defaults to `1`.
+        """
+        weights = weights or {}
+        for weight in weights.values():
+            validate_weight(weight)
+        validate_weight(default_weight)
+        self._weights = dict(weights)
+        self._default_weight = default_weight
+        self._virtual_time = 0.0
+        self._last_finish: Dict[Hashable, float] = {}
+        self._backlogs: Dict[Hashable, int] = {}
+        self._counter = count()
+        self._queue: List[Tuple[float, int, _T]] = []
+        for element in elements:
+            self.add(element)
+        super().__init__(**kwargs)
+
+    @override
+    def __repr__(self) -> str:
+        return mk_repr(self, *(element for *_, element in sorted(self._queue)))
+
+    @override
+    def __bool__(self) -> bool:
+        return bool(self._queue)
+
+    @override
+    def __iter__(self) -> Iterator[_T]:
+        for *_, element in iter_heap(self._queue):
+            yield element
+
+    @override
+    def head(self) -> _T:
+        try:
+            return self._queue[0][-1]
+        except IndexError as e:
+            raise Empty from e
+
+    @override
+    def pop(self) -> _T:
+        try:
+            finish, _, element = heappop(self._queue)
+        except IndexError as e:
+            raise Empty from e
+        self._virtual_time = finish
+        self._forget(element.tenant)
+        return element
+
+    @override
+    def add(self, element: _T) -> None:
+        tenant = element.tenant
+        start = max(self._virtual_time, self._last_finish.get(tenant, self._virtual_time))
+        finish = start + element.cost / self._weights.get(tenant, self._default_weight)
+        self._last_finish[tenant] = finish
+        self._backlogs[tenant] = self._backlogs.get(tenant, 0) + 1
+        heappush(self._queue, (finish, next(self._counter), element))
+
+    @override
+    def remove(self, element: _T) -> None:
+        for index, (*_, queued) in enumerate(self._queue):
+            if queued == element:
+                del self._queue[index]
+                heapify(self._queue)
+                self._forget(element.tenant)
+                return
+        raise ValueError(f'{element!r} is not in the queue')
+
+    def _forget(self, tenant: Hashable) -> None:
+        """Record that an element of the given tenant left the queue,
+        and stop tracking the tenant once it has no element left.
+        """
+        backlog = self._backlogs[tenant] - 1
+        if backlog:
+            self._backlogs[tenant] = backlog
+        else:
+            del self._backlogs[tenant]
+            del self._last_finish[tenant]
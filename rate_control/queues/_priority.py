@@ -8,9 +8,15 @@ from typing import Any, TypeVar
 
 from rate_control._errors import Empty
 from rate_control._helpers import mk_repr
+from rate_control._helpers._heap import iter_heap
 from rate_control._helpers._protocols import Comparable
 from rate_control.queues._abc import Queue
 
+if sys.version_info >= (3, 9):
+    from collections.abc import Iterator
+else:
+    from typing import Iterator
+
 if sys.version_info >= (3, 12):
     from typing import override
 else:
@@ -47,6 +53,10 @@ class PriorityQueue(Queue[_T]):
     def __bool__(self) -> bool:
         return bool(self._queue)
 
+    @override
+    def __iter__(self) -> Iterator[_T]:
+        return iter_heap(self._queue)
+
     @override
     def head(self) -> _T:
         try:
@@ -19,8 +19,3 @@ def some_valid_delay(delay: float) -> float:
 @pytest.fixture
 def some_valid_duration(duration: float) -> float:
     return duration
-
-
-@pytest.fixture
-def tiny_delay() -> float:
-    return 1e-4
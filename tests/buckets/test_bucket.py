@@ -0,0 +1,68 @@
+import sys
+
+import pytest
+
+from rate_control import Bucket, RateLimit
+
+if sys.version_info >= (3, 9):
+    from builtins import list as List
+else:
+    from typing import List
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class _CountingBucket(Bucket):
+    def __init__(self, capacity: float) -> None:
+        self.remaining = capacity
+
+    @override
+    async def wait_for_refill(self) -> None: ...
+
+    @override
+    def can_acquire(self, tokens: float) -> bool:
+        return tokens <= self.remaining
+
+
+class _ConsumingBucket(_CountingBucket):
+    @override
+    def _consume(self, tokens: float) -> None:
+        self.remaining -= tokens
+
+
+class _LoggingBucket(_ConsumingBucket):
+    def __init__(self, capacity: float) -> None:
+        super().__init__(capacity)
+        self.attempts: List[float] = []
+
+    @override
+    def try_acquire(self, tokens: float) -> bool:
+        self.attempts.append(tokens)
+        return super().try_acquire(tokens)
+
+
+def test_acquire() -> None:
+    bucket = _ConsumingBucket(3)
+    bucket.acquire(2)
+    assert bucket.try_acquire(1)
+    assert not bucket.try_acquire(1)
+    with pytest.raises(RateLimit):
+        bucket.acquire(1)
+    assert bucket.remaining == 0
+
+
+def test_overriding_try_acquire() -> None:
+    bucket = _LoggingBucket(3)
+    bucket.acquire(2)
+    bucket._charge(2)
+    assert not bucket.try_acquire(1)
+    assert bucket.attempts == [2, 1]
+    assert bucket.remaining == -1
+
+
+def test_acquire_not_implemented() -> None:
+    with pytest.raises(NotImplementedError):
+        _CountingBucket(3).acquire(1)
@@ -1,4 +1,6 @@
+import math
 import sys
+from datetime import datetime, time, timezone
 from math import floor
 
 import pytest
@@ -6,7 +8,7 @@ from aiofastforward import FastForward
 from anyio.abc import TaskGroup
 from anyio.lowlevel import checkpoint
 
-from rate_control import RateLimit
+from rate_control import CapacitySchedule, RateLimit
 from rate_control._buckets import FixedWindowCounter
 from tests import assert_not_raises, checkpoints
 
@@ -39,6 +41,8 @@ async def test_argument_validation(
         FixedWindowCounter(capacity=some_valid_capacity, duration=some_negative_value)
     with pytest.raises(ValueError):
         FixedWindowCounter(capacity=some_valid_capacity, duration=0)
+    with pytest.raises(ValueError):
+        FixedWindowCounter(capacity=some_valid_capacity, duration=some_valid_duration, max_debt=some_negative_value)
     with assert_not_raises():
         FixedWindowCounter(capacity=some_valid_capacity, duration=some_valid_duration)
 
@@ -49,6 +53,8 @@ async def test_acquire_validation(bucket: FixedWindowCounter, some_negative_valu
         bucket.can_acquire(some_negative_value)
     with pytest.raises(ValueError):
         bucket.acquire(some_negative_value)
+    with pytest.raises(ValueError):
+        bucket.try_acquire(some_negative_value)
 
 
 @pytest.mark.anyio
@@ -60,6 +66,13 @@ async def test_token_consumption(bucket: FixedWindowCounter, capacity: float, an
         bucket.acquire(any_token)
 
 
+@pytest.mark.anyio
+async def test_try_acquire(bucket: FixedWindowCounter, capacity: float, any_token: float) -> None:
+    assert bucket.try_acquire(capacity)
+    assert not bucket.can_acquire(any_token)
+    assert not bucket.try_acquire(any_token)
+
+
 @pytest.mark.anyio
 async def test_multiple_consumptions_with_float_capacity(bucket: FixedWindowCounter, capacity: float) -> None:
     for _ in range(floor(capacity)):
@@ -111,6 +124,75 @@ async def test_refill_delay(
     assert bucket.can_acquire(capacity)
 
 
+@pytest.mark.anyio
+async def test_time_until_available(
+    bucket: FixedWindowCounter, capacity: float, duration: float, any_token: float, fast_forward: FastForward
+) -> None:
+    assert bucket.time_until_available(capacity) == 0
+    bucket.acquire(capacity)
+    await fast_forward(duration / 4)
+    assert bucket.time_until_available(any_token) == pytest.approx(3 * duration / 4)
+    assert bucket.time_until_available(capacity + any_token) == math.inf
+    await fast_forward(3 * duration / 4)
+    await checkpoint()
+    assert bucket.time_until_available(capacity) == 0
+
+
+@pytest.mark.anyio
+async def test_retry_after(
+    bucket: FixedWindowCounter, capacity: float, duration: float, any_token: float, fast_forward: FastForward
+) -> None:
+    bucket.acquire(capacity)
+    await fast_forward(duration / 4)
+    with pytest.raises(RateLimit) as exc_info:
+        bucket.acquire(any_token)
+    assert exc_info.value.retry_after == pytest.approx(3 * duration / 4)
+    assert exc_info.value.bucket is bucket
+
+    with pytest.raises(RateLimit) as exc_info:
+        bucket.acquire(capacity + any_token)
+    assert exc_info.value.retry_after == math.inf
+
+
+@pytest.mark.anyio
+async def test_reserve(bucket: FixedWindowCounter, capacity: float, duration: float, fast_forward: FastForward) -> None:
+    assert bucket.reserve(capacity / 2).delay == 0
+    await fast_forward(duration / 4)
+    assert bucket.reserve(capacity / 2).delay == 0
+    assert bucket.reserve(capacity).delay == pytest.approx(3 * duration / 4)
+    assert bucket.reserve(capacity / 2).delay == pytest.approx(7 * duration / 4)
+    assert not bucket.can_acquire(capacity / 4)
+
+    await fast_forward(3 * duration / 4)
+    await checkpoint()
+    assert not bucket.can_acquire(capacity / 4)
+    await fast_forward(duration)
+    await checkpoint()
+    assert bucket.can_acquire(capacity / 2)
+    assert not bucket.can_acquire(capacity)
+
+    with pytest.raises(RateLimit):
+        bucket.reserve(2 * capacity)
+
+
+@pytest.mark.anyio
+async def test_cancel_reservation(
+    bucket: FixedWindowCounter, capacity: float, duration: float, fast_forward: FastForward
+) -> None:
+    current = bucket.reserve(capacity)
+    upcoming = bucket.reserve(capacity)
+    assert upcoming.delay == pytest.approx(duration)
+    upcoming.cancel()
+    upcoming.cancel()
+    assert bucket.reserve(capacity).delay == pytest.approx(duration)
+
+    current.cancel()
+    assert bucket.can_acquire(capacity)
+    await fast_forward(duration)
+    await checkpoint()
+    assert not bucket.can_acquire(capacity / 2)
+
+
 @pytest.mark.anyio
 async def test_wait_for_refill(
     bucket: FixedWindowCounter,
@@ -137,6 +219,55 @@ async def test_wait_for_refill(
     assert refilled
 
 
+@pytest.mark.anyio
+async def test_refund(
+    bucket: FixedWindowCounter, capacity: float, any_token: float, some_negative_value: float
+) -> None:
+    bucket.acquire(capacity)
+    bucket.refund(any_token)
+    assert bucket.can_acquire(any_token)
+    assert not bucket.can_acquire(2 * any_token)
+
+    bucket.refund(capacity)
+    assert bucket.can_acquire(capacity)
+    assert not bucket.can_acquire(capacity + any_token)
+
+    with pytest.raises(ValueError):
+        bucket.refund(some_negative_value)
+
+
+@pytest.mark.anyio
+async def test_capacity(bucket: FixedWindowCounter, capacity: float) -> None:
+    assert bucket.capacity == capacity
+
+
+@pytest.mark.anyio
+async def test_debt(capacity: float, duration: float, any_token: float, fast_forward: FastForward) -> None:
+    async with FixedWindowCounter(capacity, duration, max_debt=2 * capacity) as bucket:
+        assert bucket.capacity == 3 * capacity
+        bucket.acquire(3 * capacity)
+        assert not bucket.can_acquire(any_token)
+        assert bucket.time_until_available(capacity) == pytest.approx(duration)
+        assert bucket.time_until_available(3 * capacity) == pytest.approx(3 * duration)
+
+        await fast_forward(duration)
+        await checkpoint()
+        assert bucket.can_acquire(capacity)
+        assert not bucket.can_acquire(capacity + any_token)
+
+        await fast_forward(2 * duration)
+        await checkpoints(2)
+        assert bucket.can_acquire(3 * capacity)
+
+
+@pytest.mark.anyio
+async def test_reserve_with_debt(capacity: float, duration: float, fast_forward: FastForward) -> None:
+    async with FixedWindowCounter(capacity, duration, max_debt=capacity) as bucket:
+        bucket.acquire(2 * capacity)
+        assert bucket.reserve(capacity).delay == pytest.approx(duration)
+        assert bucket.reserve(2 * capacity).delay == pytest.approx(3 * duration)
+
+
 @pytest.mark.anyio
 async def test_update_capacity(
     bucket: FixedWindowCounter,
@@ -150,6 +281,7 @@ async def test_update_capacity(
     bucket.acquire(capacity)
 
     bucket.update_capacity(lower_capacity)
+    assert bucket.capacity == lower_capacity
     assert not bucket.can_acquire(any_token)
     await fast_forward(duration)
     assert bucket.can_acquire(lower_capacity)
@@ -159,6 +291,23 @@ async def test_update_capacity(
     assert bucket.can_acquire(capacity)
 
 
+@pytest.mark.anyio
+async def test_capacity_schedule(
+    capacity: float, duration: float, any_token: float, fast_forward: FastForward, wall_clock: datetime
+) -> None:
+    schedule = CapacitySchedule({time(9): 2 * capacity, time(18): capacity}, tz=timezone.utc)
+    async with FixedWindowCounter(capacity, duration, capacity_schedule=schedule) as bucket:
+        assert bucket.capacity == capacity
+        bucket.acquire(capacity)
+        assert not bucket.can_acquire(any_token)
+
+        await fast_forward(1)
+        await checkpoint()
+        assert bucket.capacity == 2 * capacity
+        assert bucket.can_acquire(capacity)
+        assert not bucket.can_acquire(capacity + any_token)
+
+
 @pytest.mark.anyio
 async def test_update_capacity_validation(
     bucket: FixedWindowCounter, some_negative_value: float, some_valid_capacity: float
@@ -191,3 +340,12 @@ async def test_entering_context_multiple_times(capacity: float, duration: float)
 @pytest.mark.anyio
 async def test_repr(bucket: FixedWindowCounter, capacity: float, duration: float) -> None:
     assert repr(bucket) == f'FixedWindowCounter({capacity=}, {duration=})'
+
+
+@pytest.mark.anyio
+async def test_repr_with_max_debt(capacity: float, duration: float) -> None:
+    max_debt = 2 * capacity
+    assert (
+        repr(FixedWindowCounter(capacity, duration, max_debt=max_debt))
+        == f'FixedWindowCounter({capacity=}, {duration=}, {max_debt=})'
+    )
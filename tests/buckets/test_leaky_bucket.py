@@ -1,3 +1,4 @@
+import math
 import sys
 
 import pytest
@@ -40,6 +41,58 @@ async def test_consumption(bucket: LeakyBucket) -> None:
         bucket.acquire()
 
 
+@pytest.mark.anyio
+async def test_try_acquire(bucket: LeakyBucket, delay: float, fast_forward: FastForward) -> None:
+    assert bucket.try_acquire()
+    assert not bucket.can_acquire()
+    assert not bucket.try_acquire()
+    await fast_forward(delay)
+    assert bucket.try_acquire()
+
+
+@pytest.mark.anyio
+async def test_time_until_available(bucket: LeakyBucket, delay: float, fast_forward: FastForward) -> None:
+    assert bucket.time_until_available() == 0
+    bucket.acquire()
+    await fast_forward(delay / 4)
+    assert bucket.time_until_available() == pytest.approx(3 * delay / 4)
+
+
+@pytest.mark.anyio
+async def test_retry_after(bucket: LeakyBucket, delay: float, fast_forward: FastForward) -> None:
+    bucket.acquire()
+    bucket.refund()
+    await fast_forward(delay / 4)
+    bucket.acquire()
+    with pytest.raises(RateLimit) as exc_info:
+        bucket.acquire()
+    assert exc_info.value.retry_after == pytest.approx(delay)
+    assert exc_info.value.bucket is bucket
+
+
+@pytest.mark.anyio
+async def test_reserve(bucket: LeakyBucket, delay: float, fast_forward: FastForward) -> None:
+    assert bucket.reserve(1).delay == 0
+    await fast_forward(delay / 4)
+    assert bucket.reserve(1).delay == pytest.approx(3 * delay / 4)
+    assert bucket.reserve(1).delay == pytest.approx(7 * delay / 4)
+
+    await fast_forward(7 * delay / 4)
+    await checkpoint()
+    assert not bucket.can_acquire()
+    await fast_forward(delay)
+    await checkpoint()
+    assert bucket.can_acquire()
+
+
+@pytest.mark.anyio
+async def test_cancel_reservation(bucket: LeakyBucket, delay: float, fast_forward: FastForward) -> None:
+    bucket.reserve(1)
+    reservation = bucket.reserve(1)
+    reservation.cancel()
+    assert bucket.reserve(1).delay == pytest.approx(2 * delay)
+
+
 @pytest.mark.anyio
 async def test_refill(bucket: LeakyBucket, delay: float, some_positive_int: int, fast_forward: FastForward) -> None:
     for _ in range(some_positive_int):
@@ -84,6 +137,32 @@ async def test_wait_for_refill(
     assert refilled
 
 
+@pytest.mark.anyio
+async def test_refund(bucket: LeakyBucket, delay: float, fast_forward: FastForward) -> None:
+    bucket.refund()
+    bucket.acquire()
+    bucket.refund()
+    assert bucket.can_acquire()
+
+    bucket.acquire()
+    await checkpoint()
+    await fast_forward(delay / 2)
+    bucket.refund()
+    bucket.acquire()
+    await checkpoint()
+    await fast_forward(delay / 2)
+    await checkpoint()
+    assert not bucket.can_acquire()
+    await fast_forward(delay / 2)
+    await checkpoint()
+    assert bucket.can_acquire()
+
+
+@pytest.mark.anyio
+async def test_capacity(bucket: LeakyBucket) -> None:
+    assert bucket.capacity == math.inf
+
+
 def test_not_entering_context(delay: float) -> None:
     bucket = LeakyBucket(delay)
     with pytest.raises(RuntimeError):
@@ -1,3 +1,4 @@
+import math
 import sys
 from math import floor
 
@@ -40,6 +41,8 @@ async def test_argument_validation(
         SlidingWindowLog(capacity=some_valid_capacity, duration=some_negative_value)
     with pytest.raises(ValueError):
         SlidingWindowLog(capacity=some_valid_capacity, duration=0)
+    with pytest.raises(ValueError):
+        SlidingWindowLog(capacity=some_valid_capacity, duration=some_valid_duration, max_debt=some_negative_value)
     with assert_not_raises():
         SlidingWindowLog(capacity=some_valid_capacity, duration=some_valid_duration)
 
@@ -122,6 +125,101 @@ async def test_refill_delay(
     assert bucket.can_acquire(capacity)
 
 
+@pytest.mark.anyio
+async def test_time_until_available(
+    bucket: SlidingWindowLog, capacity: float, duration: float, any_token: float, fast_forward: FastForward
+) -> None:
+    assert bucket.time_until_available(capacity) == 0
+    bucket.acquire(capacity / 2)
+    await fast_forward(duration / 2)
+    bucket.acquire(capacity / 2)
+    assert bucket.time_until_available(capacity / 2) == pytest.approx(duration / 2)
+    assert bucket.time_until_available(capacity) == pytest.approx(duration)
+    assert bucket.time_until_available(capacity + any_token) == math.inf
+
+
+@pytest.mark.anyio
+async def test_retry_after(
+    bucket: SlidingWindowLog, capacity: float, duration: float, fast_forward: FastForward
+) -> None:
+    bucket.acquire(capacity / 4)
+    await fast_forward(duration / 4)
+    bucket.acquire(capacity / 2)
+    await fast_forward(duration / 4)
+    bucket.acquire(capacity / 4)
+    bucket.refund(capacity / 8)
+    with pytest.raises(RateLimit) as exc_info:
+        bucket.acquire(capacity / 4)
+    assert exc_info.value.retry_after == pytest.approx(duration / 2)
+    assert exc_info.value.bucket is bucket
+
+    with pytest.raises(RateLimit) as exc_info:
+        bucket.acquire(capacity / 2)
+    assert exc_info.value.retry_after == pytest.approx(3 * duration / 4)
+
+
+@pytest.mark.anyio
+async def test_reserve(bucket: SlidingWindowLog, capacity: float, duration: float, fast_forward: FastForward) -> None:
+    bucket.acquire(capacity / 2)
+    await fast_forward(duration / 2)
+    assert bucket.reserve(capacity / 2).delay == 0
+    assert bucket.reserve(capacity / 2).delay == pytest.approx(duration / 2)
+    assert bucket.reserve(capacity / 2).delay == pytest.approx(duration)
+    assert not bucket.can_acquire(capacity / 4)
+
+    await fast_forward(duration / 2)
+    await checkpoint()
+    assert not bucket.can_acquire(capacity / 4)
+    await fast_forward(duration)
+    await checkpoint()
+    assert bucket.can_acquire(capacity / 2)
+    assert not bucket.can_acquire(capacity)
+
+    with pytest.raises(RateLimit):
+        bucket.reserve(2 * capacity)
+
+
+@pytest.mark.anyio
+async def test_cancel_reservation(
+    bucket: SlidingWindowLog, capacity: float, duration: float, fast_forward: FastForward
+) -> None:
+    bucket.acquire(capacity)
+    reservation = bucket.reserve(capacity / 2)
+    assert reservation.delay == pytest.approx(duration)
+    reservation.cancel()
+    reservation.cancel()
+    assert not bucket.can_acquire(capacity / 4)
+    assert bucket.time_until_available(capacity) == pytest.approx(duration)
+
+    await fast_forward(2 * duration)
+    await checkpoint()
+    assert bucket.can_acquire(capacity)
+    assert not bucket.can_acquire(capacity + capacity / 4)
+
+
+@pytest.mark.anyio
+async def test_reserve_cancelled_slot(
+    bucket: SlidingWindowLog, capacity: float, duration: float, fast_forward: FastForward
+) -> None:
+    tokens = 4 * capacity / 5
+    reservations = [bucket.reserve(tokens) for _ in range(4)]
+    assert [reservation.delay for reservation in reservations] == pytest.approx(
+        [0, duration, 2 * duration, 3 * duration]
+    )
+    assert bucket.time_until_available(tokens) == pytest.approx(4 * duration)
+
+    reservations[1].cancel()
+    assert bucket.time_until_available(tokens) == pytest.approx(duration)
+    assert bucket.reserve(tokens).delay == pytest.approx(duration)
+    assert bucket.time_until_available(tokens) == pytest.approx(4 * duration)
+
+    reservations[2].cancel()
+    assert bucket.reserve(tokens / 2).delay == pytest.approx(2 * duration)
+    await fast_forward(2 * duration)
+    await checkpoints(2)
+    assert bucket.time_until_available(tokens) == pytest.approx(2 * duration)
+
+
 @pytest.mark.anyio
 async def test_wait_for_refill(
     bucket: SlidingWindowLog,
@@ -158,6 +256,77 @@ async def test_wait_for_refill(
     assert refilled == 2
 
 
+@pytest.mark.anyio
+async def test_refund(
+    bucket: SlidingWindowLog,
+    capacity: float,
+    duration: float,
+    any_token: float,
+    fast_forward: FastForward,
+) -> None:
+    half_capacity = capacity / 2
+    bucket.acquire(half_capacity)
+    await checkpoint()
+    await fast_forward(duration / 2)
+    bucket.acquire(half_capacity)
+    bucket.refund(half_capacity)
+    assert bucket.can_acquire(half_capacity)
+    assert not bucket.can_acquire(half_capacity + any_token)
+
+    bucket.acquire(half_capacity)
+    await checkpoint()
+    await fast_forward(duration)
+    await checkpoint()
+    assert bucket.can_acquire(capacity)
+    assert not bucket.can_acquire(capacity + any_token)
+
+
+@pytest.mark.anyio
+async def test_capacity(bucket: SlidingWindowLog, capacity: float) -> None:
+    assert bucket.capacity == capacity
+
+
+@pytest.mark.anyio
+async def test_debt(capacity: float, duration: float, any_token: float, fast_forward: FastForward) -> None:
+    async with SlidingWindowLog(capacity, duration, max_debt=capacity) as bucket:
+        assert bucket.capacity == 2 * capacity
+        bucket.acquire(capacity / 2)
+        await fast_forward(duration / 2)
+        bucket.acquire(3 * capacity / 2)
+        assert not bucket.can_acquire(any_token)
+        assert bucket.time_until_available(capacity / 2) == pytest.approx(duration / 2)
+        assert bucket.time_until_available(2 * capacity) == pytest.approx(2 * duration)
+
+        await fast_forward(duration / 2)
+        await checkpoint()
+        assert bucket.can_acquire(capacity / 2)
+        assert not bucket.can_acquire(capacity / 2 + any_token)
+
+        await fast_forward(duration / 2)
+        await checkpoint()
+        assert bucket.can_acquire(capacity)
+        assert not bucket.can_acquire(capacity + any_token)
+
+        await fast_forward(duration / 2)
+        await fast_forward(duration / 2)
+        await checkpoint()
+        assert bucket.can_acquire(2 * capacity)
+
+
+@pytest.mark.anyio
+async def test_debt_rate(int_capacity: int, duration: float, fast_forward: FastForward) -> None:
+    windows = 8
+    max_debt = int_capacity // 2
+    acquired = 0
+    async with SlidingWindowLog(int_capacity, duration, max_debt=max_debt) as bucket:
+        for _ in range(windows):
+            while bucket.try_acquire(1):
+                acquired += 1
+            await fast_forward(duration)
+            await checkpoints(2)
+    assert acquired == windows * int_capacity + max_debt
+
+
 @pytest.mark.anyio
 async def test_update_capacity(
     bucket: SlidingWindowLog,
@@ -171,6 +340,7 @@ async def test_update_capacity(
     bucket.acquire(capacity)
 
     bucket.update_capacity(lower_capacity)
+    assert bucket.capacity == lower_capacity
     assert not bucket.can_acquire(any_token)
     await fast_forward(duration)
     assert bucket.can_acquire(lower_capacity)
@@ -212,3 +382,12 @@ async def test_entering_context_multiple_times(capacity: float, duration: float)
 @pytest.mark.anyio
 async def test_repr(bucket: SlidingWindowLog, capacity: float, duration: float) -> None:
     assert repr(bucket) == f'SlidingWindowLog({capacity=}, {duration=})'
+
+
+@pytest.mark.anyio
+async def test_repr_with_max_debt(capacity: float, duration: float) -> None:
+    max_debt = 2 * capacity
+    assert (
+        repr(SlidingWindowLog(capacity, duration, max_debt=max_debt))
+        == f'SlidingWindowLog({capacity=}, {duration=}, {max_debt=})'
+    )
@@ -0,0 +1,192 @@
+import math
+import sys
+
+import pytest
+from aiofastforward import FastForward
+from anyio import sleep_forever
+from anyio.abc import TaskGroup
+from anyio.lowlevel import checkpoint
+
+from rate_control import BucketGroup, FixedWindowCounter, RateLimit
+from rate_control._buckets import WarmingUpBucket
+from tests import assert_not_raises, checkpoints
+
+if sys.version_info >= (3, 9):
+    from collections.abc import AsyncIterator
+else:
+    from typing import AsyncIterator
+
+
+@pytest.fixture
+def capacity() -> float:
+    # Dyadic values keep the warm-up arithmetic exact, so that fast forwarding lands on the wake-ups
+    return 4
+
+
+@pytest.fixture
+def duration() -> float:
+    return 2
+
+
+@pytest.fixture
+def warmup(duration: float) -> float:
+    return duration
+
+
+@pytest.fixture
+async def bucket(capacity: float, duration: float, warmup: float) -> AsyncIterator[WarmingUpBucket]:
+    async with WarmingUpBucket(capacity, duration, warmup) as _bucket:
+        yield _bucket
+
+
+@pytest.mark.anyio
+async def test_argument_validation(
+    some_negative_value: float, some_valid_capacity: float, some_valid_duration: float, warmup: float
+) -> None:
+    with pytest.raises(ValueError):
+        WarmingUpBucket(capacity=0, duration=some_valid_duration, warmup=warmup)
+    with pytest.raises(ValueError):
+        WarmingUpBucket(capacity=some_valid_capacity, duration=0, warmup=warmup)
+    with pytest.raises(ValueError):
+        WarmingUpBucket(capacity=some_valid_capacity, duration=some_valid_duration, warmup=0)
+    with pytest.raises(ValueError):
+        WarmingUpBucket(capacity=some_valid_capacity, duration=some_valid_duration, warmup=some_negative_value)
+    with pytest.raises(ValueError):
+        WarmingUpBucket(capacity=some_valid_capacity, duration=some_valid_duration, warmup=warmup, cold_factor=0.5)
+    with assert_not_raises():
+        WarmingUpBucket(capacity=some_valid_capacity, duration=some_valid_duration, warmup=warmup, cold_factor=1)
+
+
+@pytest.mark.anyio
+async def test_acquire_validation(bucket: WarmingUpBucket, some_negative_value: float) -> None:
+    with pytest.raises(ValueError):
+        bucket.can_acquire(some_negative_value)
+    with pytest.raises(ValueError):
+        bucket.acquire(some_negative_value)
+
+
+@pytest.mark.anyio
+async def test_cold_rate(bucket: WarmingUpBucket, capacity: float, duration: float, any_token: float) -> None:
+    assert bucket.can_acquire(2 * capacity)
+    bucket.acquire(any_token)
+    assert not bucket.can_acquire(any_token)
+    assert bucket.time_until_available(any_token) == pytest.approx(3 * any_token * duration / capacity, rel=1e-2)
+    with pytest.raises(RateLimit):
+        bucket.acquire(any_token)
+
+
+@pytest.mark.anyio
+async def test_warm_up(
+    bucket: WarmingUpBucket, capacity: float, duration: float, warmup: float, fast_forward: FastForward
+) -> None:
+    bucket.acquire(capacity / 2)
+    assert bucket.time_until_available(capacity) == pytest.approx(warmup)
+    await fast_forward(warmup)
+    bucket.acquire(capacity / 2)
+    assert bucket.time_until_available(capacity) == pytest.approx(duration / 2)
+
+
+@pytest.mark.anyio
+async def test_cool_down(
+    bucket: WarmingUpBucket,
+    capacity: float,
+    duration: float,
+    warmup: float,
+    fast_forward: FastForward,
+    task_group: TaskGroup,
+) -> None:
+    # Fast forwarding through idle periods requires some timer to be pending
+    task_group.start_soon(sleep_forever)
+    await checkpoint()
+    bucket.acquire(capacity / 2)
+    await fast_forward(warmup)
+    bucket.acquire(capacity / 4)
+    assert bucket.time_until_available(capacity) == pytest.approx(duration / 4)
+
+    await fast_forward(duration / 4 + warmup)
+    bucket.acquire(capacity / 2)
+    assert bucket.time_until_available(capacity) == pytest.approx(warmup)
+
+
+@pytest.mark.anyio
+async def test_reserve(
+    bucket: WarmingUpBucket, capacity: float, warmup: float, any_token: float, fast_forward: FastForward
+) -> None:
+    assert bucket.reserve(capacity / 2).delay == 0
+    assert bucket.reserve(any_token).delay == pytest.approx(warmup)
+
+
+@pytest.mark.anyio
+async def test_reserve_in_group(
+    bucket: WarmingUpBucket, capacity: float, duration: float, warmup: float, fast_forward: FastForward
+) -> None:
+    async with FixedWindowCounter(1, duration) as fixed_window_counter:
+        fixed_window_counter.acquire(1)
+        group = BucketGroup(fixed_window_counter, bucket, fixed_costs={fixed_window_counter: 1})
+        assert group.reserve(capacity / 2).delay == pytest.approx(duration)
+        assert bucket.time_until_available(capacity) == pytest.approx(duration + warmup)
+
+
+@pytest.mark.anyio
+async def test_wait_for_refill(
+    bucket: WarmingUpBucket,
+    capacity: float,
+    warmup: float,
+    fast_forward: FastForward,
+    tiny_delay: float,
+    task_group: TaskGroup,
+) -> None:
+    refilled = False
+
+    async def wait_for_refill() -> None:
+        await bucket.wait_for_refill()
+        nonlocal refilled
+        refilled = True
+
+    bucket.acquire(capacity / 2)
+    task_group.start_soon(wait_for_refill)
+    await fast_forward(warmup - tiny_delay)
+    await checkpoints(2)
+    assert not refilled
+    await fast_forward(tiny_delay)
+    await checkpoints(2)
+    assert refilled
+
+
+@pytest.mark.anyio
+async def test_refund(
+    bucket: WarmingUpBucket, capacity: float, duration: float, warmup: float, fast_forward: FastForward
+) -> None:
+    bucket.refund(capacity)
+    bucket.acquire(capacity / 2)
+    bucket.refund(capacity / 4)
+    assert bucket.time_until_available(capacity) == pytest.approx(warmup - duration / 4)
+    bucket.refund(capacity)
+    assert bucket.can_acquire(capacity)
+
+
+@pytest.mark.anyio
+async def test_capacity(bucket: WarmingUpBucket) -> None:
+    assert bucket.capacity == math.inf
+
+
+def test_not_entering_context(capacity: float, duration: float, warmup: float, any_token: float) -> None:
+    bucket = WarmingUpBucket(capacity, duration, warmup)
+    with pytest.raises(RuntimeError):
+        bucket.acquire(any_token)
+
+
+@pytest.mark.anyio
+async def test_entering_context_multiple_times(capacity: float, duration: float, warmup: float) -> None:
+    async with WarmingUpBucket(capacity, duration, warmup) as bucket:
+        with pytest.raises(RuntimeError):
+            async with bucket:
+                ...
+    with pytest.raises(RuntimeError):
+        async with bucket:
+            ...
+
+
+@pytest.mark.anyio
+async def test_repr(bucket: WarmingUpBucket, capacity: float, duration: float, warmup: float) -> None:
+    assert repr(bucket) == f'WarmingUpBucket({capacity=}, {duration=}, {warmup=}, cold_factor=3)'
@@ -1,16 +1,19 @@
+import math
 import secrets
 import sys
 from asyncio import get_running_loop
 from contextlib import AsyncExitStack
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 from aiofastforward import FastForward
-from anyio import create_task_group
+from anyio import create_task_group, current_time
 from anyio.abc import TaskGroup
-from pytest import Function, Parser
+from pytest import Function, MonkeyPatch, Parser
 
-from rate_control import Bucket, FixedWindowCounter
+from rate_control import Bucket, CapacitySchedule, FixedWindowCounter
 
 if sys.version_info >= (3, 9):
     from collections.abc import AsyncIterator, Sequence
@@ -39,6 +42,14 @@ async def fast_forward() -> AsyncIterator[FastForward]:
         yield forward
 
 
+@pytest.fixture
+def wall_clock(fast_forward: FastForward, monkeypatch: MonkeyPatch) -> datetime:
+    # The wall clock follows the fast forwarded time, starting one second before 9 AM
+    start = datetime(2024, 1, 1, 8, 59, 59, tzinfo=timezone.utc)
+    monkeypatch.setattr(CapacitySchedule, '_now', staticmethod(lambda: start + timedelta(seconds=current_time())))
+    return start
+
+
 @pytest.fixture
 async def task_group() -> AsyncIterator[TaskGroup]:
     async with create_task_group() as _task_group:
@@ -54,7 +65,14 @@ async def async_exit_stack() -> AsyncIterator[AsyncExitStack]:
 
 def _mk_mock_bucket() -> Mock:
     mock = Mock(Bucket)
-    mock.acquire = Mock()
+    mock.acquire = partial(Bucket.acquire, mock)
+    mock.try_acquire = partial(Bucket.try_acquire, mock)
+    mock._consume = Mock()
+    mock._charge = partial(Bucket._charge, mock)
+    mock._receipt = partial(Bucket._receipt, mock)
+    mock._refund = partial(Bucket._refund, mock)
+    mock._watch_refills = partial(Bucket._watch_refills, mock)
+    mock.capacity = math.inf
     mock.__aenter__ = AsyncMock()
     mock.__aexit__ = AsyncMock()
     return mock
@@ -96,6 +114,11 @@ def duration(delay: float) -> float:
     return delay
 
 
+@pytest.fixture
+def tiny_delay() -> float:
+    return 1e-4
+
+
 @pytest.fixture
 def aeons() -> float:
     return 123456.789
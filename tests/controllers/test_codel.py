@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from rate_control import CoDel
+from tests import assert_not_raises
+
+
+@pytest.fixture
+def target() -> float:
+    return 0.5
+
+
+@pytest.fixture
+def interval() -> float:
+    return 10
+
+
+@pytest.fixture
+def codel(target: float, interval: float) -> CoDel:
+    return CoDel(target, interval)
+
+
+def test_argument_validation(some_negative_value: float, target: float, interval: float) -> None:
+    with pytest.raises(ValueError):
+        CoDel(target=0, interval=interval)
+    with pytest.raises(ValueError):
+        CoDel(target=some_negative_value, interval=interval)
+    with pytest.raises(ValueError):
+        CoDel(target=target, interval=0)
+    with pytest.raises(ValueError):
+        CoDel(target=target, interval=some_negative_value)
+    with assert_not_raises():
+        CoDel(target=target, interval=interval)
+
+
+def test_delay_below_target(codel: CoDel, target: float, interval: float, aeons: float) -> None:
+    for now in range(math.ceil(aeons / interval)):
+        assert not codel.should_drop(target / 2, now * interval)
+
+
+def test_delay_above_target_for_less_than_an_interval(
+    codel: CoDel, target: float, interval: float, tiny_delay: float
+) -> None:
+    assert not codel.should_drop(2 * target, 0)
+    assert not codel.should_drop(2 * target, interval - tiny_delay)
+    assert not codel.should_drop(target / 2, interval)
+    assert not codel.should_drop(2 * target, interval + tiny_delay)
+
+
+def test_dropping(codel: CoDel, target: float, interval: float, tiny_delay: float) -> None:
+    assert not codel.should_drop(2 * target, 0)
+    assert codel.should_drop(2 * target, interval)
+
+    next_drop = 2 * interval
+    assert not codel.should_drop(2 * target, next_drop - tiny_delay)
+    assert codel.should_drop(2 * target, next_drop)
+
+    next_drop += interval / math.sqrt(2)
+    assert not codel.should_drop(2 * target, next_drop - tiny_delay)
+    assert codel.should_drop(2 * target, next_drop)
+
+
+def test_stop_dropping(codel: CoDel, target: float, interval: float) -> None:
+    assert not codel.should_drop(2 * target, 0)
+    assert codel.should_drop(2 * target, interval)
+    assert not codel.should_drop(target / 2, 2 * interval)
+    assert not codel.should_drop(2 * target, 2 * interval)
+
+
+def test_repr(codel: CoDel, target: float, interval: float) -> None:
+    assert repr(codel) == f'CoDel({target=}, {interval=})'
@@ -30,6 +30,8 @@ def test_init(mock_buckets: Iterable[Bucket]) -> None:
 async def test_can_acquire(noop_controller: NoopController, some_positive_int: int) -> None:
     for _ in range(some_positive_int):
         assert noop_controller.can_acquire()
+        assert noop_controller.try_acquire()
+        assert noop_controller.time_until_available() == 0
         with assert_not_raises():
             async with noop_controller.request():
                 ...
@@ -40,6 +42,20 @@ async def test_can_acquire(noop_controller: NoopController, some_positive_int: i
                 task_group.start_soon(noop_controller.request().__aenter__)
 
 
+@pytest.mark.anyio
+async def test_refund_and_charge(
+    noop_controller: NoopController, some_tokens: float, some_negative_value: float
+) -> None:
+    async with noop_controller.request() as handle:
+        with assert_not_raises():
+            handle.refund(some_tokens)
+            handle.charge(some_tokens)
+        with pytest.raises(ValueError):
+            handle.refund(some_negative_value)
+        with pytest.raises(ValueError):
+            handle.charge(some_negative_value)
+
+
 @pytest.mark.anyio
 async def test_not_enter_buckets_context(mock_buckets: Collection[Mock]) -> None:
     async with NoopController(*mock_buckets):
@@ -3,8 +3,18 @@ from contextlib import AsyncExitStack
 from unittest.mock import Mock
 
 import pytest
-
-from rate_control import Bucket, RateLimit, RateLimiter
+from aiofastforward import FastForward
+from anyio.lowlevel import checkpoint
+
+from rate_control import (
+    Bucket,
+    BucketGroup,
+    FixedWindowCounter,
+    LeakyBucket,
+    RateLimit,
+    RateLimiter,
+    SlidingWindowLog,
+)
 from tests import assert_not_raises
 
 if sys.version_info >= (3, 9):
@@ -51,10 +61,128 @@ async def test_simple_rate_limiting(
     with pytest.raises(RateLimit):
         async with rate_limiter.request(some_tokens + any_token):
             ...
-    mock_bucket.acquire.assert_not_called()
+    mock_bucket._consume.assert_not_called()
 
     async with rate_limiter.request(some_tokens):
-        mock_bucket.acquire.assert_called_once_with(some_tokens)
+        mock_bucket._consume.assert_called_once_with(some_tokens)
+
+
+@pytest.mark.anyio
+async def test_try_acquire(rate_limiter: RateLimiter, mock_bucket: Mock, some_tokens: float, any_token: float) -> None:
+    mock_bucket.can_acquire = lambda tokens: tokens <= some_tokens
+
+    assert not rate_limiter.try_acquire(some_tokens + any_token)
+    mock_bucket._consume.assert_not_called()
+    assert rate_limiter.try_acquire(some_tokens)
+    mock_bucket._consume.assert_called_once_with(some_tokens)
+
+
+@pytest.mark.anyio
+async def test_time_until_available(
+    fixed_window_counter: Bucket, capacity: float, duration: float, any_token: float, fast_forward: FastForward
+) -> None:
+    async with RateLimiter(fixed_window_counter, should_enter_context=False, max_concurrency=1) as rate_limiter:
+        assert rate_limiter.time_until_available(capacity) == 0
+        async with rate_limiter.request(capacity):
+            assert rate_limiter.time_until_available(any_token) is None
+        assert rate_limiter.time_until_available(any_token) == pytest.approx(duration)
+
+
+@pytest.mark.anyio
+async def test_retry_after(
+    fixed_window_counter: Bucket, capacity: float, duration: float, any_token: float, fast_forward: FastForward
+) -> None:
+    async with RateLimiter(fixed_window_counter, should_enter_context=False, max_concurrency=1) as rate_limiter:
+        async with rate_limiter.request(capacity):
+            with pytest.raises(RateLimit) as exc_info:
+                async with rate_limiter.request(any_token):
+                    ...
+            assert exc_info.value.retry_after == pytest.approx(duration)
+            assert exc_info.value.bucket is fixed_window_counter
+
+        fixed_window_counter.refund(capacity)
+        async with rate_limiter.request(any_token):
+            with pytest.raises(RateLimit) as exc_info:
+                async with rate_limiter.request(any_token):
+                    ...
+            assert exc_info.value.retry_after is None
+            assert exc_info.value.bucket is None
+
+
+@pytest.mark.anyio
+async def test_refund_and_charge(
+    capacity: float, duration: float, any_token: float, some_negative_value: float
+) -> None:
+    async with RateLimiter(SlidingWindowLog(capacity, duration)) as rate_limiter:
+        async with rate_limiter.request(capacity) as handle:
+            handle.refund(capacity / 2)
+            assert rate_limiter.can_acquire(capacity / 2)
+            assert not rate_limiter.can_acquire(capacity / 2 + any_token)
+
+            handle.charge(capacity)
+            assert not rate_limiter.can_acquire(any_token)
+            handle.refund(capacity / 2)
+            assert not rate_limiter.can_acquire(any_token)
+
+            with pytest.raises(ValueError):
+                handle.refund(capacity + any_token)
+            with pytest.raises(ValueError):
+                handle.refund(some_negative_value)
+            with pytest.raises(ValueError):
+                handle.charge(some_negative_value)
+
+
+@pytest.mark.anyio
+async def test_charge_with_fixed_costs(capacity: float, duration: float) -> None:
+    requests, tokens = FixedWindowCounter(2, duration), FixedWindowCounter(capacity, duration)
+    async with RateLimiter(BucketGroup(requests, tokens, fixed_costs={requests: 1})) as rate_limiter:
+        async with rate_limiter.request(capacity / 4) as handle:
+            handle.charge(capacity / 4)
+            handle.charge(capacity / 4)
+        assert requests.can_acquire(1)
+        assert not requests.can_acquire(2)
+        assert tokens.can_acquire(capacity / 4)
+        assert not tokens.can_acquire(capacity / 2)
+
+
+@pytest.mark.anyio
+async def test_refund_after_window(capacity: float, duration: float, fast_forward: FastForward) -> None:
+    async with RateLimiter(FixedWindowCounter(capacity, duration)) as rate_limiter:
+        async with rate_limiter.request(capacity) as first_handle:
+            await fast_forward(duration)
+            await checkpoint()
+            async with rate_limiter.request(capacity / 2) as second_handle:
+                first_handle.refund(capacity)
+                assert not rate_limiter.can_acquire(capacity)
+                second_handle.refund(capacity / 4)
+                assert rate_limiter.can_acquire(3 * capacity / 4)
+                assert not rate_limiter.can_acquire(capacity)
+
+
+@pytest.mark.anyio
+async def test_charge_after_window(capacity: float, duration: float, fast_forward: FastForward) -> None:
+    async with RateLimiter(FixedWindowCounter(capacity, duration)) as rate_limiter:
+        async with rate_limiter.request(capacity) as handle:
+            handle.charge(capacity)
+            await fast_forward(duration)
+            await checkpoint()
+            assert not rate_limiter.can_acquire(capacity / 2)
+            handle.refund(capacity)
+            assert not rate_limiter.can_acquire(capacity / 2)
+            await fast_forward(duration)
+            await checkpoint()
+            assert rate_limiter.can_acquire(capacity)
+
+
+@pytest.mark.anyio
+async def test_refund_after_another_pass(delay: float, fast_forward: FastForward) -> None:
+    async with RateLimiter(LeakyBucket(delay)) as rate_limiter:
+        async with rate_limiter.request() as handle:
+            await fast_forward(delay)
+            await checkpoint()
+            async with rate_limiter.request():
+                handle.refund(1)
+                assert not rate_limiter.can_acquire()
 
 
 @pytest.mark.anyio
@@ -66,6 +194,7 @@ async def test_max_concurrency(rate_limiter_without_bucket: RateLimiter, max_con
 
         async with rate_limiter_without_bucket.request():
             assert not rate_limiter_without_bucket.can_acquire()
+            assert not rate_limiter_without_bucket.try_acquire()
             with pytest.raises(RateLimit):
                 async with rate_limiter_without_bucket.request():
                     ...
@@ -80,7 +209,7 @@ async def test_max_concurrency(rate_limiter_without_bucket: RateLimiter, max_con
 async def test_multiple_buckets(mock_buckets: Collection[Mock], any_token: float) -> None:
     async with RateLimiter(*mock_buckets, should_enter_context=False) as rate_limiter, rate_limiter.request(any_token):
         for bucket in mock_buckets:
-            bucket.acquire.assert_called_once_with(any_token)
+            bucket._consume.assert_called_once_with(any_token)
 
 
 @pytest.mark.anyio
@@ -1,22 +1,43 @@
+import math
 import sys
 from contextlib import AsyncExitStack
+from datetime import datetime, time, timezone
+from functools import partial
 from typing import Any
 from unittest.mock import MagicMock, Mock
 
 import pytest
 from aiofastforward import FastForward
-from anyio import create_task_group
+from anyio import CancelScope, create_task_group, sleep_forever
 from anyio.abc import TaskGroup
 from anyio.lowlevel import checkpoint
 
-from rate_control import Bucket, Priority, RateLimit, ReachedMaxPending, Scheduler
+from rate_control import (
+    Bucket,
+    BucketGroup,
+    CapacitySchedule,
+    CoDel,
+    Evicted,
+    FixedWindowCounter,
+    Overflow,
+    Overloaded,
+    Priority,
+    RateLimit,
+    ReachedMaxPending,
+    Scheduler,
+    SlidingWindowLog,
+)
+from rate_control._controllers._scheduler import _BACKFILL_LOOKAHEAD
+from rate_control.queues import EdfQueue, FairQueue, FifoQueue
 from tests import assert_not_raises, checkpoints
 
 if sys.version_info >= (3, 9):
+    from builtins import list as List
     from builtins import tuple as Tuple
+    from builtins import type as Type
     from collections.abc import AsyncIterator, Awaitable, Callable, Collection
 else:
-    from typing import AsyncIterator, Awaitable, Callable, Collection, Tuple
+    from typing import AsyncIterator, Awaitable, Callable, Collection, List, Tuple, Type
 
 
 class _Called:
@@ -30,7 +51,9 @@ class _Called:
 @pytest.fixture
 def mocked_window_counter(fixed_window_counter: Bucket) -> Mock:
     mock = MagicMock(wraps=fixed_window_counter)
-    mock.acquire = Mock(wraps=fixed_window_counter.acquire)
+    mock.try_acquire = partial(Bucket.try_acquire, mock)
+    mock._consume = Mock(wraps=fixed_window_counter._consume)
+    mock.capacity = fixed_window_counter.capacity
     return mock
 
 
@@ -62,6 +85,20 @@ def _prepare_request(scheduler: Scheduler) -> Tuple[Callable[..., Awaitable[None
     return schedule, called
 
 
+def _prepare_failing_request(
+    scheduler: Scheduler, exc_type: Type[Exception]
+) -> Tuple[Callable[..., Awaitable[None]], _Called]:
+    failed = _Called()
+
+    async def schedule(*args: Any, **kwargs: Any) -> None:
+        with pytest.raises(exc_type):
+            async with scheduler.request(*args, **kwargs):
+                ...
+        failed.value = True
+
+    return schedule, failed
+
+
 @pytest.mark.anyio
 async def test_argument_validation(some_negative_int: int, some_positive_int: int) -> None:
     with assert_not_raises():
@@ -85,6 +122,37 @@ async def test_argument_validation(some_negative_int: int, some_positive_int: in
     with assert_not_raises():
         Scheduler(max_pending=some_positive_int)
 
+    with pytest.raises(ValueError):
+        Scheduler(max_pending_per_priority={Priority.LOW: 0})
+    with pytest.raises(ValueError):
+        Scheduler(max_pending_per_priority={Priority.LOW: some_negative_int})
+    with assert_not_raises():
+        Scheduler(max_pending_per_priority={Priority.LOW: some_positive_int})
+
+    with pytest.raises(ValueError):
+        Scheduler(reserved_capacity=-0.1)
+    with pytest.raises(ValueError):
+        Scheduler(reserved_capacity=1.1)
+    with assert_not_raises():
+        Scheduler(reserved_capacity=0.5)
+
+    with pytest.raises(ValueError):
+        Scheduler(reserved_priority=math.nan)
+    with pytest.raises(ValueError):
+        Scheduler(max_pending_per_priority={math.nan: some_positive_int})
+
+    with pytest.raises(ValueError):
+        Scheduler(backfill=some_negative_int)
+    with assert_not_raises():
+        Scheduler(backfill=some_positive_int)
+
+    with pytest.raises(ValueError):
+        Scheduler(aging=0)
+    with pytest.raises(ValueError):
+        Scheduler(aging=some_negative_int)
+    with assert_not_raises():
+        Scheduler(aging=some_positive_int)
+
 
 @pytest.mark.anyio
 async def test_simple_scheduling(
@@ -106,13 +174,13 @@ async def test_simple_scheduling(
     await checkpoints(4)
     assert draw_called
     assert not other_called
-    mocked_window_counter.acquire.assert_called_once_with(capacity)
-    mocked_window_counter.acquire.reset_mock()
+    mocked_window_counter._consume.assert_called_once_with(capacity)
+    mocked_window_counter._consume.reset_mock()
 
     await fast_forward(duration)
     await checkpoints(3)
     assert other_called
-    mocked_window_counter.acquire.assert_called_once_with(any_token)
+    mocked_window_counter._consume.assert_called_once_with(any_token)
 
 
 @pytest.mark.anyio
@@ -139,10 +207,40 @@ async def test_request_priority(
     assert not low_priority_called
 
     await fast_forward(duration)
-    await checkpoints(2)
+    await checkpoints(3)
     assert low_priority_called
 
 
+@pytest.mark.anyio
+async def test_numeric_priorities(
+    scheduler: Scheduler,
+    capacity: float,
+    duration: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    priorities = (1000, -2.5, Priority.LOW, 42, 0.5)
+    served: List[float] = []
+
+    async def schedule(priority: float) -> None:
+        async with scheduler.request(capacity, priority):
+            served.append(priority)
+
+    async with scheduler.request(capacity):
+        for priority in priorities:
+            task_group.start_soon(schedule, priority)
+        await checkpoints(2)
+
+    for _ in priorities:
+        await fast_forward(duration)
+        await checkpoints(3)
+    assert served == sorted(priorities)
+
+    with pytest.raises(ValueError):
+        async with scheduler.request(priority=math.nan):
+            ...
+
+
 @pytest.mark.anyio
 async def test_max_concurrency(
     scheduler_without_bucket: Scheduler,
@@ -183,6 +281,286 @@ async def test_max_pending(
             ...
 
 
+@pytest.mark.anyio
+async def test_max_pending_per_priority(mock_bucket: Mock, max_pending: int, task_group: TaskGroup) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    async with Scheduler(mock_bucket, max_pending_per_priority={Priority.LOW: max_pending}) as scheduler:
+        for _ in range(max_pending):
+            task_group.start_soon(_prepare_request(scheduler)[0], 1, Priority.LOW)
+        await checkpoint()
+
+        with pytest.raises(ReachedMaxPending):
+            async with scheduler.request(1, Priority.LOW):
+                ...
+
+        schedule_high, high_rejected = _prepare_failing_request(scheduler, ReachedMaxPending)
+        task_group.start_soon(schedule_high, 1, Priority.HIGH)
+        await checkpoint()
+        assert not high_rejected
+
+
+@pytest.mark.anyio
+async def test_reserved_capacity(
+    fixed_window_counter: Bucket,
+    capacity: float,
+    any_token: float,
+    task_group: TaskGroup,
+) -> None:
+    async with Scheduler(
+        fixed_window_counter, should_enter_context=False, reserved_capacity=0.5, reserved_priority=Priority.HIGH
+    ) as scheduler:
+        schedule_low, low_called = _prepare_request(scheduler)
+        schedule_high, high_called = _prepare_request(scheduler)
+
+        async with scheduler.request(capacity / 2, Priority.LOW):
+            assert scheduler.can_acquire(any_token)
+            assert not scheduler.try_acquire(any_token, Priority.LOW)
+            task_group.start_soon(schedule_low, any_token, Priority.LOW)
+            await checkpoints(2)
+            assert not low_called
+
+            task_group.start_soon(schedule_high, capacity / 2, Priority.HIGH)
+            await checkpoints(2)
+            assert high_called
+            assert not low_called
+
+    fixed_window_counter.refund(capacity)
+    assert scheduler.try_acquire(capacity / 2, Priority.HIGH)
+    assert not fixed_window_counter.can_acquire(capacity)
+
+
+@pytest.mark.anyio
+async def test_aging(
+    mocked_window_counter: Mock,
+    capacity: float,
+    duration: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    async with Scheduler(mocked_window_counter, aging=duration / 4) as scheduler:
+        schedule_draw, draw_called = _prepare_request(scheduler)
+        schedule_low, low_called = _prepare_request(scheduler)
+        schedule_normal, normal_called = _prepare_request(scheduler)
+        task_group.start_soon(schedule_draw, capacity)
+        task_group.start_soon(schedule_low, capacity, Priority.LOW)
+        await checkpoints(2)
+        assert draw_called
+
+        await fast_forward(duration / 2)
+        task_group.start_soon(schedule_normal, capacity, Priority.NORMAL)
+        await fast_forward(duration / 2)
+        await checkpoints(4)
+        assert low_called
+        assert not normal_called
+
+        await fast_forward(duration)
+        await checkpoints(3)
+        assert normal_called
+
+
+@pytest.mark.anyio
+async def test_aging_recycled_request(
+    mocked_window_counter: Mock,
+    capacity: float,
+    duration: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    async with Scheduler(mocked_window_counter, aging=duration / 2, queue_factory=FifoQueue) as scheduler:
+        schedule_draw, draw_called = _prepare_request(scheduler)
+        schedule_timeout, timed_out = _prepare_failing_request(scheduler, TimeoutError)
+        schedule_normal, normal_called = _prepare_request(scheduler)
+        schedule_high, high_called = _prepare_request(scheduler)
+        task_group.start_soon(schedule_draw, capacity)
+        task_group.start_soon(partial(schedule_timeout, capacity, Priority.NORMAL, timeout=duration / 8))
+        await checkpoints(2)
+        assert draw_called
+
+        await fast_forward(duration / 4)
+        await checkpoints(2)
+        assert timed_out
+        task_group.start_soon(schedule_normal, capacity, Priority.NORMAL)
+        await fast_forward(duration / 2)
+        task_group.start_soon(schedule_high, capacity, Priority.HIGH)
+        await fast_forward(duration / 4)
+        await checkpoints(4)
+        assert high_called
+        assert not normal_called
+
+
+@pytest.mark.anyio
+async def test_aging_drop_oldest(
+    mock_bucket: Mock, duration: float, task_group: TaskGroup, fast_forward: FastForward
+) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    # Fast forwarding requires some timer to be pending
+    task_group.start_soon(sleep_forever)
+    async with Scheduler(mock_bucket, max_pending=2, overflow=Overflow.DROP_OLDEST, aging=duration) as scheduler:
+        schedule_oldest, oldest_evicted = _prepare_failing_request(scheduler, Evicted)
+        schedule_other, other_evicted = _prepare_failing_request(scheduler, Evicted)
+        task_group.start_soon(schedule_oldest, 1, Priority.NORMAL)
+        await checkpoint()
+        await fast_forward(duration / 2)
+        task_group.start_soon(schedule_other, 1, Priority.HIGH)
+        await checkpoint()
+        await fast_forward(duration / 2)
+        await checkpoints(2)
+
+        task_group.start_soon(_prepare_request(scheduler)[0], 1, Priority.HIGHEST)
+        await checkpoints(2)
+        assert oldest_evicted
+        assert not other_evicted
+
+
+@pytest.mark.anyio
+async def test_aging_max_pending_per_priority(
+    mock_bucket: Mock, duration: float, task_group: TaskGroup, fast_forward: FastForward
+) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    # Fast forwarding requires some timer to be pending
+    task_group.start_soon(sleep_forever)
+    async with Scheduler(mock_bucket, max_pending_per_priority={Priority.HIGH: 1}, aging=duration) as scheduler:
+        task_group.start_soon(_prepare_request(scheduler)[0], 1, Priority.NORMAL)
+        await checkpoint()
+        await fast_forward(duration / 2)
+        task_group.start_soon(_prepare_request(scheduler)[0], 1, Priority.HIGH)
+        await checkpoint()
+        await fast_forward(5 * duration / 4)
+        await checkpoints(2)
+
+        schedule_high, high_rejected = _prepare_failing_request(scheduler, ReachedMaxPending)
+        task_group.start_soon(schedule_high, 1, Priority.HIGH)
+        await checkpoints(2)
+        assert not high_rejected
+
+
+@pytest.mark.anyio
+async def test_backfill(
+    mocked_window_counter: Mock,
+    capacity: float,
+    duration: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    async with Scheduler(mocked_window_counter, backfill=1, queue_factory=FifoQueue) as scheduler:
+        schedule_draw, draw_called = _prepare_request(scheduler)
+        schedule_first, first_called = _prepare_request(scheduler)
+        schedule_blocked, blocked_called = _prepare_request(scheduler)
+        schedule_backfilled, backfilled_called = _prepare_request(scheduler)
+        schedule_last, last_called = _prepare_request(scheduler)
+        task_group.start_soon(schedule_draw, capacity)
+        task_group.start_soon(schedule_first, capacity / 2)
+        task_group.start_soon(schedule_blocked, 3 * capacity / 4)
+        task_group.start_soon(schedule_backfilled, capacity / 4)
+        task_group.start_soon(schedule_last, capacity / 4)
+
+        await checkpoints(2)
+        assert draw_called
+
+        await fast_forward(duration)
+        await checkpoints(6)
+        assert first_called
+        assert backfilled_called
+        assert not blocked_called
+        assert not last_called
+
+        await fast_forward(duration)
+        await checkpoints(6)
+        assert blocked_called
+        assert last_called
+
+
+@pytest.mark.anyio
+async def test_backfill_lookahead(mock_bucket: Mock, task_group: TaskGroup) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    cheap = [1 + i / (4 * _BACKFILL_LOOKAHEAD) for i in range(1, 2 * _BACKFILL_LOOKAHEAD)]
+    async with Scheduler(mock_bucket, backfill=1, queue_factory=FifoQueue) as scheduler:
+        for tokens in (2, 3, *cheap):
+            task_group.start_soon(_prepare_request(scheduler)[0], tokens)
+            await checkpoint()
+        mock_bucket.can_acquire.reset_mock()
+
+        task_group.start_soon(_prepare_request(scheduler)[0], 1)
+        await checkpoint()
+        asked = {call.args[0] for call in mock_bucket.can_acquire.call_args_list}
+        assert asked - {1} == {2, *cheap[: _BACKFILL_LOOKAHEAD - 1]}
+
+
+@pytest.mark.anyio
+async def test_backfill_ordered_by_cost(mock_bucket: Mock, task_group: TaskGroup) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    async with Scheduler(mock_bucket, backfill=1) as scheduler:
+        for tokens in (1, 2, 3):
+            task_group.start_soon(_prepare_request(scheduler)[0], tokens)
+            await checkpoint()
+        mock_bucket.can_acquire = Mock(side_effect=lambda tokens: tokens in (2, 3))
+
+        task_group.start_soon(_prepare_request(scheduler)[0], 4)
+        await checkpoint()
+        assert {call.args[0] for call in mock_bucket.can_acquire.call_args_list} == {1, 4}
+        mock_bucket._consume.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_overflow_drop_oldest(mock_bucket: Mock, task_group: TaskGroup) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    async with Scheduler(mock_bucket, max_pending=2, overflow=Overflow.DROP_OLDEST) as scheduler:
+        schedule_oldest, oldest_evicted = _prepare_failing_request(scheduler, Evicted)
+        schedule_other, other_evicted = _prepare_failing_request(scheduler, Evicted)
+        task_group.start_soon(schedule_oldest, 1, Priority.HIGHEST)
+        await checkpoint()
+        task_group.start_soon(schedule_other, 1, Priority.LOWEST)
+        await checkpoint()
+        assert not oldest_evicted
+
+        task_group.start_soon(_prepare_request(scheduler)[0])
+        await checkpoints(2)
+        assert oldest_evicted
+        assert not other_evicted
+
+
+@pytest.mark.anyio
+async def test_overflow_drop_lowest_priority(mock_bucket: Mock, task_group: TaskGroup) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    async with Scheduler(mock_bucket, max_pending=2, overflow=Overflow.DROP_LOWEST_PRIORITY) as scheduler:
+        schedule_low, low_evicted = _prepare_failing_request(scheduler, Evicted)
+        schedule_high, high_evicted = _prepare_failing_request(scheduler, Evicted)
+        task_group.start_soon(schedule_low, 1, Priority.LOW)
+        task_group.start_soon(schedule_high, 1, Priority.HIGH)
+        await checkpoint()
+
+        with pytest.raises(ReachedMaxPending):
+            async with scheduler.request(1, Priority.LOW):
+                ...
+        assert not low_evicted
+
+        task_group.start_soon(_prepare_request(scheduler)[0], 1, Priority.NORMAL)
+        await checkpoints(2)
+        assert low_evicted
+        assert not high_evicted
+
+
+@pytest.mark.anyio
+async def test_overflow_drop_largest_cost(mock_bucket: Mock, some_tokens: float, task_group: TaskGroup) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    async with Scheduler(mock_bucket, max_pending=2, overflow=Overflow.DROP_LARGEST_COST) as scheduler:
+        schedule_cheap, cheap_evicted = _prepare_failing_request(scheduler, Evicted)
+        schedule_costly, costly_evicted = _prepare_failing_request(scheduler, Evicted)
+        task_group.start_soon(schedule_cheap, some_tokens / 4)
+        task_group.start_soon(schedule_costly, some_tokens)
+        await checkpoint()
+
+        with pytest.raises(ReachedMaxPending):
+            async with scheduler.request(some_tokens):
+                ...
+        assert not costly_evicted
+
+        task_group.start_soon(_prepare_request(scheduler)[0], some_tokens / 2)
+        await checkpoints(2)
+        assert costly_evicted
+        assert not cheap_evicted
+
+
 @pytest.mark.anyio
 async def test_fill_or_kill(mocked_scheduler: Scheduler, mock_bucket: Mock) -> None:
     mock_bucket.can_acquire = Mock(return_value=False)
@@ -191,6 +569,256 @@ async def test_fill_or_kill(mocked_scheduler: Scheduler, mock_bucket: Mock) -> N
             ...
 
 
+@pytest.mark.anyio
+async def test_time_until_available(
+    capacity: float, duration: float, task_group: TaskGroup, fast_forward: FastForward
+) -> None:
+    async with SlidingWindowLog(capacity, duration) as bucket, Scheduler(
+        bucket, should_enter_context=False, max_concurrency=2
+    ) as scheduler:
+        assert scheduler.time_until_available(capacity) == 0
+        bucket.acquire(capacity / 2)
+        await fast_forward(duration / 2)
+        bucket.acquire(capacity / 2)
+        schedule_pending, _ = _prepare_request(scheduler)
+        task_group.start_soon(schedule_pending, capacity / 2, Priority.NORMAL)
+        await checkpoints(2)
+
+        assert scheduler.time_until_available(capacity / 2, Priority.HIGH) == pytest.approx(duration / 2)
+        assert scheduler.time_until_available(capacity / 2, Priority.NORMAL) == pytest.approx(duration)
+        assert scheduler.time_until_available(capacity, Priority.NORMAL) == pytest.approx(duration)
+        async with scheduler.request(0):
+            assert scheduler.time_until_available(capacity / 2, Priority.HIGH) == pytest.approx(duration / 2)
+            assert scheduler.time_until_available(capacity / 2, Priority.NORMAL) is None
+
+
+@pytest.mark.anyio
+async def test_refund_wakes_up_pending_requests(
+    fixed_window_counter: Bucket, capacity: float, task_group: TaskGroup
+) -> None:
+    async with Scheduler(fixed_window_counter, should_enter_context=False) as scheduler:
+        schedule_pending, called = _prepare_request(scheduler)
+        async with scheduler.request(capacity) as handle:
+            task_group.start_soon(schedule_pending, capacity / 2)
+            await checkpoints(2)
+            assert not called
+
+            handle.refund(capacity / 2)
+            await checkpoints(2)
+            assert called
+
+            handle.charge(capacity / 2)
+            assert not scheduler.can_acquire(capacity / 2)
+            with pytest.raises(ValueError):
+                handle.refund(capacity + capacity / 2)
+
+
+@pytest.mark.anyio
+async def test_fill_or_kill_retry_after(
+    fixed_window_counter: Bucket, capacity: float, duration: float, fast_forward: FastForward
+) -> None:
+    async with Scheduler(fixed_window_counter, should_enter_context=False, reserved_capacity=0.5) as scheduler:
+        async with scheduler.request(capacity / 4, Priority.HIGHEST):
+            with pytest.raises(RateLimit) as exc_info:
+                async with scheduler.request(capacity / 2, fill_or_kill=True):
+                    ...
+    assert exc_info.value.retry_after == pytest.approx(duration)
+    assert exc_info.value.bucket is fixed_window_counter
+
+
+@pytest.mark.anyio
+async def test_oversized_request(fixed_window_counter: Bucket, capacity: float) -> None:
+    async with Scheduler(
+        fixed_window_counter, should_enter_context=False, reserved_capacity=0.5, max_pending=1
+    ) as scheduler:
+        with pytest.raises(ValueError):
+            async with scheduler.request(2 * capacity, Priority.HIGHEST):
+                ...
+        with pytest.raises(ValueError):
+            async with scheduler.request(3 * capacity / 4, Priority.LOW):
+                ...
+        with assert_not_raises():
+            async with scheduler.request(capacity, Priority.HIGHEST):
+                ...
+
+
+@pytest.mark.anyio
+async def test_fixed_costs(capacity: float, duration: float, task_group: TaskGroup, fast_forward: FastForward) -> None:
+    requests, tokens = FixedWindowCounter(1, duration), FixedWindowCounter(capacity, duration)
+    async with Scheduler(BucketGroup(requests, tokens, fixed_costs={requests: 1})) as scheduler:
+        schedule_pending, called = _prepare_request(scheduler)
+        async with scheduler.request(capacity / 2):
+            task_group.start_soon(schedule_pending, capacity / 2)
+            await checkpoints(2)
+            assert not called
+
+        await fast_forward(duration)
+        await checkpoints(6)
+        assert called
+
+
+@pytest.mark.anyio
+async def test_capacity_schedule(
+    capacity: float, duration: float, task_group: TaskGroup, fast_forward: FastForward, wall_clock: datetime
+) -> None:
+    schedule = CapacitySchedule({time(9): 2 * capacity, time(18): capacity}, tz=timezone.utc)
+    async with Scheduler(FixedWindowCounter(capacity, duration, capacity_schedule=schedule)) as scheduler:
+        schedule_pending, called = _prepare_request(scheduler)
+        async with scheduler.request(capacity):
+            task_group.start_soon(schedule_pending, capacity)
+            await checkpoints(2)
+            assert not called
+
+            await fast_forward(1)
+            await checkpoints(4)
+            assert called
+
+
+@pytest.mark.anyio
+async def test_split_oversized(
+    mocked_window_counter: Mock,
+    capacity: float,
+    duration: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    async with Scheduler(mocked_window_counter, split_oversized=True) as scheduler:
+        schedule, called = _prepare_request(scheduler)
+        task_group.start_soon(schedule, 5 * capacity / 2)
+        await checkpoints(2)
+        mocked_window_counter._consume.assert_called_once_with(capacity)
+
+        await fast_forward(duration)
+        await checkpoints(4)
+        assert not called
+
+        await fast_forward(duration)
+        await checkpoints(4)
+        assert called
+        assert [call.args for call in mocked_window_counter._consume.call_args_list] == [
+            (capacity,),
+            (capacity,),
+            (capacity / 2,),
+        ]
+
+
+@pytest.mark.anyio
+async def test_timeout(
+    scheduler: Scheduler,
+    capacity: float,
+    duration: float,
+    tiny_delay: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    schedule_with_timeout, timed_out = _prepare_failing_request(scheduler, TimeoutError)
+    schedule_other, other_called = _prepare_request(scheduler)
+    async with scheduler.request(capacity):
+        task_group.start_soon(partial(schedule_with_timeout, capacity, timeout=duration / 2))
+        task_group.start_soon(schedule_other, capacity)
+        await fast_forward(duration / 2 - tiny_delay)
+        await checkpoints(2)
+        assert not timed_out
+        await fast_forward(tiny_delay)
+        await checkpoints(2)
+        assert timed_out
+
+    await fast_forward(duration / 2)
+    await checkpoints(3)
+    assert other_called
+
+
+@pytest.mark.anyio
+async def test_edf_queue(
+    mocked_window_counter: Mock,
+    capacity: float,
+    duration: float,
+    aeons: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    async with Scheduler(mocked_window_counter, queue_factory=EdfQueue) as scheduler:
+        schedule_draw, draw_called = _prepare_request(scheduler)
+        schedule_late, late_called = _prepare_request(scheduler)
+        schedule_urgent, urgent_called = _prepare_request(scheduler)
+        task_group.start_soon(schedule_draw, capacity)
+        task_group.start_soon(schedule_late, capacity, Priority.NORMAL, False, aeons)
+        task_group.start_soon(schedule_urgent, capacity, Priority.NORMAL, False, 2 * duration)
+
+        await checkpoints(2)
+        assert draw_called
+
+        await fast_forward(duration)
+        await checkpoints(4)
+        assert urgent_called
+        assert not late_called
+
+        await fast_forward(duration)
+        await checkpoints(3)
+        assert late_called
+
+
+@pytest.mark.anyio
+async def test_fair_queue(
+    mocked_window_counter: Mock,
+    capacity: float,
+    duration: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    tenants = ('noisy', 'noisy', 'noisy', 'quiet')
+    served: List[str] = []
+
+    async with Scheduler(mocked_window_counter, queue_factory=FairQueue) as scheduler:
+
+        async def schedule(tenant: str) -> None:
+            async with scheduler.request(capacity, tenant=tenant):
+                served.append(tenant)
+
+        async with scheduler.request(capacity):
+            for tenant in tenants:
+                task_group.start_soon(schedule, tenant)
+            await checkpoints(2)
+
+        for _ in tenants:
+            await fast_forward(duration)
+            await checkpoints(3)
+    assert served == ['noisy', 'quiet', 'noisy', 'noisy']
+
+
+@pytest.mark.anyio
+async def test_load_shedding(
+    mocked_window_counter: Mock,
+    capacity: float,
+    duration: float,
+    task_group: TaskGroup,
+    fast_forward: FastForward,
+) -> None:
+    load_shedding = CoDel(target=duration / 2, interval=duration)
+    async with Scheduler(mocked_window_counter, queue_factory=FifoQueue, load_shedding=load_shedding) as scheduler:
+        schedule_dropped, dropped = _prepare_failing_request(scheduler, Overloaded)
+        schedule_draw, draw_called = _prepare_request(scheduler)
+        schedule_first, first_called = _prepare_request(scheduler)
+        schedule_last, last_called = _prepare_request(scheduler)
+        task_group.start_soon(schedule_draw, capacity)
+        task_group.start_soon(schedule_first, capacity)
+        task_group.start_soon(schedule_dropped, capacity)
+        task_group.start_soon(schedule_last, capacity)
+
+        await checkpoints(2)
+        assert draw_called
+
+        await fast_forward(duration)
+        await checkpoints(4)
+        assert first_called
+        assert not dropped
+
+        await fast_forward(duration)
+        await checkpoints(4)
+        assert dropped
+        assert last_called
+
+
 @pytest.mark.anyio
 async def test_cancel_pending_task(
     scheduler: Scheduler,
@@ -216,8 +844,9 @@ async def test_cancel_pending_task(
 
 
 @pytest.mark.anyio
-async def test_adding_new_request_during_processing(
+async def test_tokens_committed_on_dispatch(
     scheduler: Scheduler,
+    mocked_window_counter: Mock,
     capacity: float,
     duration: float,
     task_group: TaskGroup,
@@ -227,19 +856,40 @@ async def test_adding_new_request_during_processing(
     async with scheduler.request(capacity):
         schedule_first, first_called = _prepare_request(scheduler)
         schedule_other, other_called = _prepare_request(scheduler)
-        schedule_in_between, in_between_called = _prepare_request(scheduler)
-        task_group.start_soon(schedule_first, any_token, Priority.NORMAL)
-        task_group.start_soon(schedule_other, any_token, Priority.NORMAL)
+        task_group.start_soon(schedule_first, any_token)
+        task_group.start_soon(schedule_other, any_token)
+        await checkpoints(2)
+        mocked_window_counter._consume.reset_mock()
 
         await fast_forward(duration)
-        await checkpoints(2)
+        await checkpoints(4)
         assert first_called
-        assert not other_called
-        task_group.start_soon(schedule_in_between, any_token, Priority.HIGH)
+        assert other_called
+        assert mocked_window_counter._consume.call_count == 2
 
-        await checkpoints(1)
-        assert not other_called
-        assert in_between_called
+
+@pytest.mark.anyio
+async def test_cancel_after_handoff(mock_bucket: Mock, any_token: float, task_group: TaskGroup) -> None:
+    mock_bucket.can_acquire = Mock(return_value=False)
+    async with Scheduler(mock_bucket, max_concurrency=1) as scheduler:
+        cancel_scope = CancelScope()
+        called = _Called()
+
+        async def schedule() -> None:
+            with cancel_scope:
+                async with scheduler.request(any_token):
+                    called.value = True
+
+        task_group.start_soon(schedule)
+        await checkpoint()
+
+        mock_bucket._consume = Mock(side_effect=lambda _: cancel_scope.cancel())
+        mock_bucket.can_acquire = Mock(return_value=True)
+        await checkpoints(3)
+        mock_bucket._consume.assert_called_once_with(any_token)
+        mock_bucket.refund.assert_called_once_with(any_token)
+        assert not called
+        assert scheduler.can_acquire(any_token)
 
 
 @pytest.mark.anyio
@@ -265,7 +915,7 @@ async def test_entering_context_multiple_times() -> None:
 async def test_multiple_buckets(mock_buckets: Collection[Mock], any_token: float) -> None:
     async with Scheduler(*mock_buckets, should_enter_context=False) as scheduler, scheduler.request(any_token):
         for bucket in mock_buckets:
-            bucket.acquire.assert_called_once_with(any_token)
+            bucket._consume.assert_called_once_with(any_token)
 
 
 @pytest.mark.anyio
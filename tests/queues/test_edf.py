@@ -0,0 +1,98 @@
+import math
+import sys
+from itertools import chain
+
+import pytest
+
+from rate_control._errors import Empty
+from rate_control._helpers import Request
+from rate_control.queues import EdfQueue
+
+if sys.version_info >= (3, 9):
+    from collections.abc import Sequence
+else:
+    from typing import Sequence
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture
+def elements() -> Sequence[Request]:
+    return tuple(Request(1, deadline=deadline) for deadline in (123.456, 42, math.inf, 42))
+
+
+@pytest.fixture
+def queue(elements: Sequence[Request], clock: _Clock) -> EdfQueue[Request]:
+    return EdfQueue(*elements, clock=clock)
+
+
+def test_nominal(queue: EdfQueue[Request], elements: Sequence[Request]) -> None:
+    other_elems = (Request(1, deadline=99), Request(1, deadline=12.3))
+    for elem in other_elems:
+        queue.add(elem)
+
+    for elem in sorted(chain(elements, other_elems), key=lambda request: request.deadline):
+        assert queue
+        assert queue.head() is elem
+        assert queue.pop() is elem
+
+    assert not queue
+    with pytest.raises(Empty):
+        queue.head()
+    with pytest.raises(Empty):
+        queue.pop()
+
+
+def test_equal_deadlines_in_arrival_order(queue: EdfQueue[Request], elements: Sequence[Request]) -> None:
+    first, second = (elem for elem in elements if elem.deadline == 42)
+    assert queue.pop() is first
+    assert queue.pop() is second
+
+
+def test_dropping_expired_elements(queue: EdfQueue[Request], elements: Sequence[Request], clock: _Clock) -> None:
+    clock.now = 100
+    assert queue.head().deadline == 123.456
+    clock.now = 123.456
+    assert queue.pop().deadline == math.inf
+
+    clock.now = math.inf
+    assert not queue
+    with pytest.raises(Empty):
+        queue.head()
+
+
+def test_removing_elements(queue: EdfQueue[Request], elements: Sequence[Request]) -> None:
+    earliest_elem = min(elements, key=lambda request: request.deadline)
+    assert queue.head() is earliest_elem
+
+    queue.remove(earliest_elem)
+    assert queue.head() is not earliest_elem
+    while queue:
+        assert queue.pop() is not earliest_elem
+
+    with pytest.raises(ValueError):
+        queue.remove(earliest_elem)
+
+
+def test_iter(queue: EdfQueue[Request], elements: Sequence[Request], clock: _Clock) -> None:
+    assert [request.deadline for request in queue] == sorted(request.deadline for request in elements)
+    clock.now = 100
+    assert [request.deadline for request in queue] == [123.456, math.inf]
+
+
+def test_repr(clock: _Clock) -> None:
+    first, second, third, fourth = (Request(1, deadline=deadline) for deadline in (1, 2, 3, 4))
+    queue = EdfQueue(second, first, fourth, clock=clock)
+    queue.add(third)
+    assert repr(queue) == f'EdfQueue({first!r}, {second!r}, {third!r}, {fourth!r})'
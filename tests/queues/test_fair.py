@@ -0,0 +1,110 @@
+import pytest
+
+from rate_control._errors import Empty
+from rate_control._helpers import Request
+from rate_control.queues import FairQueue
+from tests import assert_not_raises
+
+
+def _drain(queue: FairQueue[Request]) -> str:
+    tenants = ''
+    while queue:
+        tenants += str(queue.pop().tenant)
+    return tenants
+
+
+def test_argument_validation(some_negative_value: float) -> None:
+    with pytest.raises(ValueError):
+        FairQueue(default_weight=0)
+    with pytest.raises(ValueError):
+        FairQueue(default_weight=some_negative_value)
+    with pytest.raises(ValueError):
+        FairQueue(weights={'a': 0})
+    with pytest.raises(ValueError):
+        FairQueue(weights={'a': some_negative_value})
+    with assert_not_raises():
+        FairQueue(weights={'a': 2}, default_weight=0.5)
+
+
+def test_nominal() -> None:
+    elements = [Request(cost) for cost in (3, 1, 2)]
+    queue = FairQueue(*elements[:2])
+    queue.add(elements[2])
+
+    for elem in elements:
+        assert queue
+        assert queue.head() is elem
+        assert queue.pop() is elem
+
+    assert not queue
+    with pytest.raises(Empty):
+        queue.head()
+    with pytest.raises(Empty):
+        queue.pop()
+
+
+def test_sharing_by_weight() -> None:
+    queue: FairQueue[Request] = FairQueue(weights={'a': 2})
+    for _ in range(4):
+        queue.add(Request(1, tenant='a'))
+    for _ in range(2):
+        queue.add(Request(1, tenant='b'))
+    assert _drain(queue) == 'aabaab'
+
+
+def test_sharing_by_cost() -> None:
+    queue: FairQueue[Request] = FairQueue()
+    for _ in range(2):
+        queue.add(Request(2, tenant='a'))
+    for _ in range(4):
+        queue.add(Request(1, tenant='b'))
+    assert _drain(queue) == 'babbab'
+
+
+def test_backlog_does_not_delay_other_tenants() -> None:
+    queue: FairQueue[Request] = FairQueue()
+    for _ in range(100):
+        queue.add(Request(1, tenant='a'))
+    assert queue.pop().tenant == 'a'
+
+    queue.add(Request(1, tenant='b'))
+    assert queue.pop().tenant == 'a'
+    assert queue.pop().tenant == 'b'
+
+
+def test_idle_tenants_earn_no_credit() -> None:
+    queue: FairQueue[Request] = FairQueue()
+    for _ in range(5):
+        queue.add(Request(1, tenant='a'))
+        queue.pop()
+
+    for _ in range(3):
+        queue.add(Request(1, tenant='a'))
+        queue.add(Request(1, tenant='b'))
+    assert _drain(queue) == 'ababab'
+
+
+def test_removing_elements() -> None:
+    first, second, third = (Request(1, tenant=tenant) for tenant in 'aab')
+    queue = FairQueue(first, second, third)
+
+    queue.remove(first)
+    assert queue.pop() is third
+    assert queue.pop() is second
+    assert not queue
+
+    with pytest.raises(ValueError):
+        queue.remove(first)
+
+
+def test_iter() -> None:
+    first, second, third = (Request(1, tenant=tenant) for tenant in 'aab')
+    queue = FairQueue(first, second, third)
+    assert list(queue) == [first, third, second]
+
+
+def test_repr() -> None:
+    first, second, third = (Request(1, tenant=tenant) for tenant in 'aab')
+    queue = FairQueue(first, second)
+    queue.add(third)
+    assert repr(queue) == f'FairQueue({first!r}, {third!r}, {second!r})'
@@ -47,6 +47,10 @@ def test_removing_any_elements(queue: FifoQueue[object], any_elements: Sequence[
         queue.remove(first_elem)
 
 
+def test_iter(queue: FifoQueue[object], any_elements: Sequence[object]) -> None:
+    assert list(queue) == list(any_elements)
+
+
 def test_repr() -> None:
     queue = FifoQueue(2, 1, 3)
     queue.add(4)
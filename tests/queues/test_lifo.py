@@ -47,6 +47,12 @@ def test_removing_any_elements(queue: LifoQueue[object], any_elements: Sequence[
         queue.remove(last_elem)
 
 
+def test_iter() -> None:
+    queue = LifoQueue(2, 1, 3)
+    queue.add(4)
+    assert list(queue) == [4, 3, 1, 2]
+
+
 def test_repr() -> None:
     queue = LifoQueue(2, 1, 3)
     queue.add(4)
@@ -1,6 +1,6 @@
 import math
 import sys
-from itertools import chain
+from itertools import chain, islice
 
 import pytest
 
@@ -54,6 +54,17 @@ def test_removing_elements(queue: PriorityQueue[Comparable], elements: Sequence[
         queue.remove(lowest_valued_elem)
 
 
+def test_iter(queue: PriorityQueue[float], elements: Sequence[float]) -> None:
+    assert list(queue) == sorted(elements)
+
+
+def test_iter_deep_heap() -> None:
+    elements = [(37 * index) % 101 for index in range(101)]
+    queue = PriorityQueue(*elements)
+    assert list(queue) == sorted(elements)
+    assert list(islice(queue, 5)) == sorted(elements)[:5]
+
+
 def test_repr() -> None:
     queue = PriorityQueue(2, 1, 3)
     queue.add(4)
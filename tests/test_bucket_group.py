@@ -1,18 +1,19 @@
+import math
 import sys
 from unittest.mock import Mock
 
 import pytest
 from aiofastforward import FastForward
-from anyio import Event, sleep_forever
+from anyio import Event, get_running_tasks, sleep_forever
 from anyio.abc import TaskGroup
 
-from rate_control import Bucket, BucketGroup, RateLimit
+from rate_control import Bucket, BucketGroup, FixedWindowCounter, RateLimit, SlidingWindowLog
 from tests import checkpoints
 
 if sys.version_info >= (3, 9):
-    from collections.abc import AsyncIterator, Collection, Iterable
+    from collections.abc import AsyncIterator, Collection, Iterable, Sequence
 else:
-    from typing import AsyncIterator, Collection, Iterable
+    from typing import AsyncIterator, Collection, Iterable, Sequence
 
 
 @pytest.fixture
@@ -57,11 +58,154 @@ async def test_acquire(
     with pytest.raises(RateLimit):
         mocked_bucket_group.acquire(some_tokens + any_token)
     for bucket in mock_buckets:
-        bucket.acquire.assert_not_called()
+        bucket._consume.assert_not_called()
 
     mocked_bucket_group.acquire(some_tokens)
     for bucket in mock_buckets:
-        bucket.acquire.assert_called_once_with(some_tokens)
+        bucket._consume.assert_called_once_with(some_tokens)
+
+
+@pytest.mark.anyio
+async def test_bottleneck_checked_first(
+    mocked_bucket_group: BucketGroup, mock_buckets: Collection[Mock], mock_bucket: Mock, some_tokens: float
+) -> None:
+    for bucket in mock_buckets:
+        bucket.can_acquire = Mock(return_value=True)
+    mock_bucket.can_acquire = Mock(return_value=False)
+
+    assert not mocked_bucket_group.can_acquire(some_tokens)
+    for bucket in mock_buckets:
+        bucket.can_acquire.reset_mock()
+
+    assert not mocked_bucket_group.can_acquire(some_tokens)
+    mock_bucket.can_acquire.assert_called_once_with(some_tokens)
+    for bucket in mock_buckets:
+        if bucket is not mock_bucket:
+            bucket.can_acquire.assert_not_called()
+
+    mock_bucket.can_acquire = Mock(return_value=True)
+    assert mocked_bucket_group.can_acquire(some_tokens)
+    for bucket in mock_buckets:
+        bucket.can_acquire.assert_called_once_with(some_tokens)
+
+
+@pytest.mark.anyio
+async def test_try_acquire(
+    mocked_bucket_group: BucketGroup,
+    mock_buckets: Collection[Mock],
+    mock_bucket: Mock,
+    some_tokens: float,
+    any_token: float,
+) -> None:
+    for bucket in mock_buckets:
+        bucket.can_acquire = Mock(return_value=True)
+    mock_bucket.can_acquire = Mock(side_effect=lambda tokens: tokens <= some_tokens)
+
+    assert not mocked_bucket_group.try_acquire(some_tokens + any_token)
+    for bucket in mock_buckets:
+        bucket._consume.assert_not_called()
+
+    mock_bucket.can_acquire.reset_mock()
+    assert mocked_bucket_group.try_acquire(some_tokens)
+    mock_bucket.can_acquire.assert_called_once_with(some_tokens)
+    for bucket in mock_buckets:
+        bucket._consume.assert_called_once_with(some_tokens)
+
+
+@pytest.mark.anyio
+async def test_time_until_available(
+    mocked_bucket_group: BucketGroup, mock_buckets: Sequence[Mock], mock_bucket: Mock, some_tokens: float
+) -> None:
+    for delay, bucket in enumerate(mock_buckets):
+        bucket.time_until_available = Mock(return_value=delay)
+    assert mocked_bucket_group.time_until_available(some_tokens) == len(mock_buckets) - 1
+    mock_bucket.time_until_available.assert_called_once_with(some_tokens)
+
+    mock_bucket.time_until_available = Mock(return_value=None)
+    assert mocked_bucket_group.time_until_available(some_tokens) is None
+
+
+@pytest.mark.anyio
+async def test_retry_after(capacity: float, duration: float, any_token: float, fast_forward: FastForward) -> None:
+    short_window, long_window = FixedWindowCounter(capacity, duration), FixedWindowCounter(capacity, 2 * duration)
+    async with BucketGroup(short_window, long_window) as bucket_group:
+        bucket_group.acquire(capacity)
+        with pytest.raises(RateLimit) as exc_info:
+            bucket_group.acquire(any_token)
+    assert exc_info.value.retry_after == pytest.approx(2 * duration)
+    assert exc_info.value.bucket is long_window
+
+
+@pytest.mark.anyio
+async def test_reserve(capacity: float, duration: float, fast_forward: FastForward) -> None:
+    window_counter, window_log = FixedWindowCounter(capacity, 2 * duration), SlidingWindowLog(capacity, duration)
+    async with BucketGroup(window_counter, window_log) as bucket_group:
+        bucket_group.acquire(capacity / 2)
+        await fast_forward(duration / 2)
+        assert bucket_group.reserve(capacity / 2).delay == 0
+        assert bucket_group.reserve(capacity / 2).delay == pytest.approx(3 * duration / 2)
+
+        reservation = bucket_group.reserve(capacity / 2)
+        assert reservation.delay == pytest.approx(3 * duration / 2)
+        reservation.cancel()
+        assert bucket_group.time_until_available(capacity / 2) == pytest.approx(3 * duration / 2)
+
+        with pytest.raises(RateLimit):
+            bucket_group.reserve(2 * capacity)
+
+
+@pytest.mark.anyio
+async def test_reserve_with_running_clock(capacity: float, duration: float) -> None:
+    window_counter, window_log = FixedWindowCounter(capacity / 2, duration), SlidingWindowLog(capacity, duration)
+    async with BucketGroup(window_counter, window_log) as bucket_group:
+        assert bucket_group.reserve(capacity / 4).delay == 0
+        assert bucket_group.reserve(capacity / 2).delay == pytest.approx(duration, abs=1)
+        assert bucket_group.time_until_available(capacity / 2) == pytest.approx(2 * duration, abs=1)
+
+
+@pytest.mark.anyio
+async def test_refund(mocked_bucket_group: BucketGroup, mock_buckets: Collection[Mock], some_tokens: float) -> None:
+    mocked_bucket_group.refund(some_tokens)
+    for bucket in mock_buckets:
+        bucket.refund.assert_called_once_with(some_tokens)
+
+
+@pytest.mark.anyio
+async def test_capacity(mock_buckets: Sequence[Mock], some_tokens: float) -> None:
+    for index, bucket in enumerate(mock_buckets):
+        bucket.capacity = some_tokens + index
+    assert BucketGroup(*mock_buckets).capacity == some_tokens
+    assert BucketGroup().capacity == math.inf
+
+
+@pytest.mark.anyio
+async def test_fixed_costs(capacity: float, duration: float, any_token: float, fast_forward: FastForward) -> None:
+    requests, tokens = FixedWindowCounter(2, duration), FixedWindowCounter(capacity, duration)
+    async with BucketGroup(requests, tokens, fixed_costs={requests: 1}) as bucket_group:
+        assert bucket_group.capacity == capacity
+        assert bucket_group.can_acquire(capacity)
+        bucket_group.acquire(capacity / 2)
+        assert requests.can_acquire(1)
+        assert not requests.can_acquire(2)
+        assert tokens.can_acquire(capacity / 2)
+        assert not tokens.can_acquire(capacity / 2 + any_token)
+
+        bucket_group.refund(capacity / 2)
+        assert not requests.can_acquire(2)
+        assert tokens.can_acquire(capacity)
+
+        bucket_group.acquire(any_token)
+        with pytest.raises(RateLimit) as exc_info:
+            bucket_group.acquire(any_token)
+        assert exc_info.value.bucket is requests
+        assert bucket_group.time_until_available(any_token) == pytest.approx(duration)
+
+
+def test_fixed_costs_validation(mock_buckets: Sequence[Mock], mock_bucket: Mock, some_negative_value: float) -> None:
+    with pytest.raises(ValueError):
+        BucketGroup(*(bucket for bucket in mock_buckets if bucket is not mock_bucket), fixed_costs={mock_bucket: 1})
+    with pytest.raises(ValueError):
+        BucketGroup(*mock_buckets, fixed_costs={mock_bucket: some_negative_value})
 
 
 @pytest.mark.anyio
@@ -93,6 +237,37 @@ async def test_wait_for_refill(
     assert refilled
 
 
+@pytest.mark.anyio
+async def test_wait_for_refill_without_listeners(
+    capacity: float, duration: float, any_token: float, fast_forward: FastForward, task_group: TaskGroup
+) -> None:
+    short_window, long_window = FixedWindowCounter(capacity, duration), FixedWindowCounter(capacity, 2 * duration)
+    refills = 0
+
+    async def wait_for_refills() -> None:
+        nonlocal refills
+        while True:
+            await bucket_group.wait_for_refill()
+            refills += 1
+
+    async with short_window, long_window, BucketGroup(short_window, should_enter_context=False) as inner_group:
+        running_tasks = len(get_running_tasks())
+        async with BucketGroup(inner_group, long_window, should_enter_context=False) as bucket_group:
+            assert len(get_running_tasks()) == running_tasks
+            task_group.start_soon(wait_for_refills)
+            bucket_group.acquire(any_token)
+            await fast_forward(duration)
+            await checkpoints(2)
+            assert refills == 1
+            await fast_forward(duration)
+            await checkpoints(2)
+            assert refills == 2
+        bucket_group.acquire(any_token)
+        await fast_forward(duration)
+        await checkpoints(2)
+        assert refills == 2
+
+
 @pytest.mark.anyio
 async def test_entering_context_multiple_times() -> None:
     async with BucketGroup() as bucket_group:
@@ -114,3 +289,12 @@ async def test_iter(mocked_bucket_group: BucketGroup, mock_buckets: Collection[M
 async def test_repr(mock_bucket: Mock, fixed_window_counter: Bucket, should_enter_context: bool) -> None:
     bucket_group = BucketGroup(mock_bucket, fixed_window_counter, should_enter_context=should_enter_context)
     assert repr(bucket_group) == f'BucketGroup({mock_bucket!r}, {fixed_window_counter!r}, {should_enter_context=})'
+
+
+@pytest.mark.anyio
+async def test_repr_with_fixed_costs(mock_bucket: Mock, fixed_window_counter: Bucket) -> None:
+    bucket_group = BucketGroup(mock_bucket, fixed_window_counter, fixed_costs={mock_bucket: 1})
+    assert repr(bucket_group) == (
+        f'BucketGroup({mock_bucket!r}, {fixed_window_counter!r}, should_enter_context=True, '
+        f'fixed_costs={{{mock_bucket!r}: 1}})'
+    )
@@ -0,0 +1,86 @@
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+from rate_control import CapacitySchedule
+
+
+@pytest.fixture
+def schedule(capacity: float) -> CapacitySchedule:
+    return CapacitySchedule({time(18): capacity, time(0): 3 * capacity, time(9): capacity / 2}, tz=timezone.utc)
+
+
+def test_capacity_at(schedule: CapacitySchedule, capacity: float) -> None:
+    assert schedule.capacity_at(datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)) == 3 * capacity
+    assert schedule.capacity_at(datetime(2024, 1, 1, 8, 59, tzinfo=timezone.utc)) == 3 * capacity
+    assert schedule.capacity_at(datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)) == capacity / 2
+    assert schedule.capacity_at(datetime(2024, 1, 1, 23, 59, tzinfo=timezone.utc)) == capacity
+
+
+def test_next_change(schedule: CapacitySchedule) -> None:
+    assert schedule.next_change(datetime(2024, 1, 1, 8, 59, tzinfo=timezone.utc)) == datetime(
+        2024, 1, 1, 9, 0, tzinfo=timezone.utc
+    )
+    assert schedule.next_change(datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)) == datetime(
+        2024, 1, 1, 18, 0, tzinfo=timezone.utc
+    )
+    assert schedule.next_change(datetime(2024, 12, 31, 20, 0, tzinfo=timezone.utc)) == datetime(
+        2025, 1, 1, 0, 0, tzinfo=timezone.utc
+    )
+
+
+def test_single_capacity(capacity: float) -> None:
+    schedule = CapacitySchedule({time(9): capacity}, tz=timezone.utc)
+    assert schedule.capacity_at(datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc)) == capacity
+    assert schedule.next_change(datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)) == datetime(
+        2024, 1, 2, 9, 0, tzinfo=timezone.utc
+    )
+
+
+def test_time_zone(capacity: float) -> None:
+    paris = timezone(timedelta(hours=1))
+    schedule = CapacitySchedule({time(0): capacity, time(9): capacity / 2}, tz=paris)
+    assert schedule.capacity_at(datetime(2024, 1, 1, 7, 59, tzinfo=timezone.utc)) == capacity
+    assert schedule.capacity_at(datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc)) == capacity / 2
+    assert schedule.next_change(datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)) == datetime(
+        2024, 1, 1, 23, 0, tzinfo=timezone.utc
+    )
+
+
+def test_clocks_going_back(capacity: float) -> None:
+    new_york = pytest.importorskip('zoneinfo').ZoneInfo('America/New_York')
+    schedule = CapacitySchedule({time(1, 30): capacity, time(12): capacity / 2}, tz=new_york)
+    # 1:30 AM occurs twice on November 3rd, 2024, at 5:30 AM and 6:30 AM UTC
+    before_first = datetime(2024, 11, 3, 5, 15, tzinfo=timezone.utc)
+    before_second = datetime(2024, 11, 3, 6, 15, tzinfo=timezone.utc)
+    assert schedule.capacity_at(before_second) == capacity / 2
+    assert schedule.next_change(before_first) == datetime(2024, 11, 3, 5, 30, tzinfo=timezone.utc)
+    assert schedule.next_change(before_second) == datetime(2024, 11, 3, 6, 30, tzinfo=timezone.utc)
+    assert schedule.next_change(datetime(2024, 11, 3, 6, 30, tzinfo=timezone.utc)) == datetime(
+        2024, 11, 3, 17, 0, tzinfo=timezone.utc
+    )
+
+
+def test_clocks_going_forward(capacity: float) -> None:
+    paris = pytest.importorskip('zoneinfo').ZoneInfo('Europe/Paris')
+    schedule = CapacitySchedule({time(0): capacity / 2, time(2, 30): capacity}, tz=paris)
+    # 2:30 AM is skipped on March 31st, 2024, the clocks going from 2 AM to 3 AM at 1 AM UTC
+    transition = datetime(2024, 3, 31, 1, tzinfo=timezone.utc)
+    assert schedule.capacity_at(transition - timedelta(seconds=1)) == capacity / 2
+    assert schedule.capacity_at(transition) == capacity
+    assert schedule.next_change(datetime(2024, 3, 30, 23, 30, tzinfo=timezone.utc)) == transition
+    assert schedule.next_change(transition) == datetime(2024, 3, 31, 22, 0, tzinfo=timezone.utc)
+
+
+def test_validation(capacity: float, some_negative_value: float) -> None:
+    with pytest.raises(ValueError):
+        CapacitySchedule({})
+    with pytest.raises(ValueError):
+        CapacitySchedule({time(0): capacity, time(9): some_negative_value})
+    with pytest.raises(ValueError):
+        CapacitySchedule({time(0): 0})
+
+
+def test_repr(capacity: float) -> None:
+    schedule = CapacitySchedule({time(9): capacity}, tz=timezone.utc)
+    assert repr(schedule) == f'CapacitySchedule({{{time(9)!r}: {capacity!r}}}, tz={timezone.utc!r})'
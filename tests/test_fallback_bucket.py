@@ -0,0 +1,188 @@
+import sys
+from unittest.mock import Mock
+
+import pytest
+from aiofastforward import FastForward
+from anyio import Event, sleep_forever
+from anyio.abc import TaskGroup
+from anyio.lowlevel import checkpoint
+
+from rate_control import FallbackBucket, FixedWindowCounter, RateLimit, RateLimiter, SlidingWindowLog
+from tests import checkpoints
+
+if sys.version_info >= (3, 9):
+    from collections.abc import AsyncIterator, Collection, Sequence
+else:
+    from typing import AsyncIterator, Collection, Sequence
+
+
+@pytest.fixture
+def steady(capacity: float, duration: float) -> FixedWindowCounter:
+    return FixedWindowCounter(capacity, duration)
+
+
+@pytest.fixture
+def burst(capacity: float, duration: float) -> FixedWindowCounter:
+    return FixedWindowCounter(2 * capacity, 10 * duration)
+
+
+@pytest.fixture
+async def fallback_bucket(steady: FixedWindowCounter, burst: FixedWindowCounter) -> AsyncIterator[FallbackBucket]:
+    async with FallbackBucket(steady, burst) as bucket:
+        yield bucket
+
+
+@pytest.mark.anyio
+async def test_entering_buckets_context(mock_buckets: Collection[Mock], should_enter_context: bool) -> None:
+    async with FallbackBucket(*mock_buckets, should_enter_context=should_enter_context):
+        for bucket in mock_buckets:
+            assert bucket.__aenter__.await_count == should_enter_context
+    for bucket in mock_buckets:
+        assert bucket.__aexit__.await_count == should_enter_context
+
+
+@pytest.mark.anyio
+async def test_fallback(
+    fallback_bucket: FallbackBucket,
+    steady: FixedWindowCounter,
+    burst: FixedWindowCounter,
+    capacity: float,
+    any_token: float,
+) -> None:
+    assert fallback_bucket.capacity == 2 * capacity
+    fallback_bucket.acquire(capacity)
+    assert not steady.can_acquire(any_token)
+    assert burst.can_acquire(2 * capacity)
+
+    fallback_bucket.acquire(capacity)
+    assert burst.can_acquire(capacity)
+    assert not burst.can_acquire(capacity + any_token)
+    assert fallback_bucket.can_acquire(capacity)
+    assert not fallback_bucket.can_acquire(capacity + any_token)
+
+    fallback_bucket.acquire(capacity)
+    with pytest.raises(RateLimit):
+        fallback_bucket.acquire(any_token)
+
+
+@pytest.mark.anyio
+async def test_primary_first(
+    fallback_bucket: FallbackBucket, steady: FixedWindowCounter, burst: FixedWindowCounter, capacity: float
+) -> None:
+    fallback_bucket.acquire(capacity / 2)
+    fallback_bucket.acquire(capacity)
+    fallback_bucket.acquire(capacity / 2)
+    assert not steady.can_acquire(capacity / 2 + capacity / 4)
+    assert not burst.can_acquire(capacity + capacity / 4)
+
+
+@pytest.mark.anyio
+async def test_time_until_available(mock_buckets: Sequence[Mock], mock_bucket: Mock, some_tokens: float) -> None:
+    for delay, bucket in enumerate(mock_buckets):
+        bucket.time_until_available = Mock(return_value=delay + 1)
+    mock_bucket.time_until_available = Mock(return_value=0)
+    fallback_bucket = FallbackBucket(*mock_buckets)
+    assert fallback_bucket.time_until_available(some_tokens) == 0
+
+    for bucket in mock_buckets:
+        bucket.time_until_available = Mock(return_value=None)
+    assert fallback_bucket.time_until_available(some_tokens) is None
+
+
+@pytest.mark.anyio
+async def test_refill(
+    fallback_bucket: FallbackBucket, capacity: float, duration: float, fast_forward: FastForward
+) -> None:
+    fallback_bucket.acquire(capacity)
+    fallback_bucket.acquire(2 * capacity)
+    assert fallback_bucket.time_until_available(capacity) == pytest.approx(duration)
+    await fast_forward(duration)
+    assert fallback_bucket.can_acquire(capacity)
+
+
+@pytest.mark.anyio
+async def test_refund(
+    fallback_bucket: FallbackBucket,
+    steady: FixedWindowCounter,
+    burst: FixedWindowCounter,
+    capacity: float,
+    any_token: float,
+) -> None:
+    fallback_bucket.acquire(capacity)
+    fallback_bucket.refund(capacity)
+    assert steady.can_acquire(capacity)
+
+    fallback_bucket.acquire(capacity)
+    fallback_bucket.acquire(capacity)
+    fallback_bucket.refund(capacity)
+    assert burst.can_acquire(2 * capacity)
+    assert not steady.can_acquire(any_token)
+
+    fallback_bucket.refund(capacity)
+    assert not steady.can_acquire(any_token)
+    assert burst.can_acquire(2 * capacity)
+    assert not burst.can_acquire(2 * capacity + any_token)
+
+
+@pytest.mark.anyio
+async def test_refund_after_refill(
+    fallback_bucket: FallbackBucket,
+    steady: FixedWindowCounter,
+    capacity: float,
+    duration: float,
+    fast_forward: FastForward,
+) -> None:
+    fallback_bucket.acquire(capacity)
+    fallback_bucket.acquire(capacity)
+    await fast_forward(10 * duration)
+    await checkpoints(2)
+    fallback_bucket.acquire(capacity)
+    fallback_bucket.refund(capacity)
+    assert steady.can_acquire(capacity)
+
+
+@pytest.mark.anyio
+async def test_refund_after_partial_refill(duration: float, fast_forward: FastForward) -> None:
+    steady, burst = FixedWindowCounter(3, 10 * duration), SlidingWindowLog(10, duration)
+    async with RateLimiter(FallbackBucket(steady, burst)) as rate_limiter:
+        burst.acquire(2)
+        await fast_forward(duration / 2)
+        async with rate_limiter.request(3), rate_limiter.request(3) as handle:
+            await fast_forward(duration / 2)
+            await checkpoint()
+            assert burst.can_acquire(7)
+            assert not burst.can_acquire(8)
+            handle.refund(3)
+            assert not steady.can_acquire(1)
+            assert burst.can_acquire(10)
+
+
+@pytest.mark.anyio
+async def test_wait_for_refill(
+    mock_buckets: Collection[Mock], mock_bucket: Mock, fast_forward: FastForward, task_group: TaskGroup, aeons: float
+) -> None:
+    refill_event = Event()
+    for bucket in mock_buckets:
+        bucket.wait_for_refill = sleep_forever
+    mock_bucket.wait_for_refill = refill_event.wait
+
+    refilled = False
+
+    async def wait_for_refill() -> None:
+        await composite_bucket.wait_for_refill()
+        nonlocal refilled
+        refilled = True
+
+    async with FallbackBucket(*mock_buckets, should_enter_context=False) as composite_bucket:
+        task_group.start_soon(wait_for_refill)
+        await fast_forward(aeons)
+        assert not refilled
+        refill_event.set()
+        await checkpoints(3)
+        assert refilled
+
+
+@pytest.mark.anyio
+async def test_repr(steady: FixedWindowCounter, burst: FixedWindowCounter, should_enter_context: bool) -> None:
+    fallback_bucket = FallbackBucket(steady, burst, should_enter_context=should_enter_context)
+    assert repr(fallback_bucket) == f'FallbackBucket({steady!r}, {burst!r}, {should_enter_context=})'
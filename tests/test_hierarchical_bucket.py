@@ -0,0 +1,177 @@
+import sys
+from unittest.mock import Mock
+
+import pytest
+from aiofastforward import FastForward
+from anyio.abc import TaskGroup
+from anyio.lowlevel import checkpoint
+
+from rate_control import FixedWindowCounter, HierarchicalBucket, RateLimit, RateLimiter, SlidingWindowLog
+from tests import checkpoints
+
+if sys.version_info >= (3, 9):
+    from collections.abc import AsyncIterator, Sequence
+else:
+    from typing import AsyncIterator, Sequence
+
+
+@pytest.fixture
+async def parent(duration: float) -> AsyncIterator[FixedWindowCounter]:
+    async with FixedWindowCounter(10, duration) as bucket:
+        yield bucket
+
+
+@pytest.fixture
+async def borrowing(parent: FixedWindowCounter, duration: float) -> AsyncIterator[HierarchicalBucket]:
+    guaranteed, ceiling = FixedWindowCounter(4, duration), FixedWindowCounter(8, duration)
+    async with HierarchicalBucket(guaranteed, parent, ceiling) as bucket:
+        yield bucket
+
+
+@pytest.fixture
+async def sibling(parent: FixedWindowCounter, duration: float) -> AsyncIterator[HierarchicalBucket]:
+    async with HierarchicalBucket(FixedWindowCounter(4, duration), parent) as bucket:
+        yield bucket
+
+
+@pytest.mark.anyio
+async def test_borrowing(
+    borrowing: HierarchicalBucket, sibling: HierarchicalBucket, parent: FixedWindowCounter
+) -> None:
+    borrowing.acquire(4)
+    assert parent.can_acquire(6)
+    assert not parent.can_acquire(7)
+
+    borrowing.acquire(4)
+    assert parent.can_acquire(2)
+    assert not parent.can_acquire(3)
+    assert not borrowing.can_acquire(1)
+    with pytest.raises(RateLimit):
+        borrowing.acquire(1)
+
+    sibling.acquire(3)
+    assert not parent.can_acquire(0.5)
+    assert sibling.can_acquire(1)
+    assert not sibling.can_acquire(2)
+
+
+@pytest.mark.anyio
+async def test_refill(
+    borrowing: HierarchicalBucket,
+    sibling: HierarchicalBucket,
+    duration: float,
+    fast_forward: FastForward,
+    task_group: TaskGroup,
+) -> None:
+    refilled = False
+
+    async def wait_for_refill() -> None:
+        await sibling.wait_for_refill()
+        nonlocal refilled
+        refilled = True
+
+    borrowing.acquire(8)
+    sibling.acquire(4)
+    task_group.start_soon(wait_for_refill)
+    assert sibling.time_until_available(4) == pytest.approx(duration)
+
+    await fast_forward(duration)
+    await checkpoints(2)
+    assert refilled
+    assert borrowing.can_acquire(8)
+    assert sibling.can_acquire(10)
+
+
+@pytest.mark.anyio
+async def test_nested(parent: FixedWindowCounter, borrowing: HierarchicalBucket, duration: float) -> None:
+    async with HierarchicalBucket(FixedWindowCounter(1, duration), borrowing) as user:
+        assert user.capacity == 8
+        user.acquire(1)
+        assert borrowing.can_acquire(7)
+        assert not borrowing.can_acquire(8)
+        assert parent.can_acquire(9)
+
+        user.acquire(6)
+        assert not borrowing.can_acquire(2)
+        assert parent.can_acquire(3)
+        assert not user.can_acquire(2)
+
+
+@pytest.mark.anyio
+async def test_refund(borrowing: HierarchicalBucket, parent: FixedWindowCounter) -> None:
+    borrowing.acquire(8)
+    borrowing.refund(4)
+    assert borrowing.can_acquire(4)
+    assert parent.can_acquire(6)
+    assert not parent.can_acquire(7)
+
+
+@pytest.mark.anyio
+async def test_refund_borrowed(parent: FixedWindowCounter, duration: float) -> None:
+    guaranteed = FixedWindowCounter(4, duration)
+    async with HierarchicalBucket(guaranteed, parent) as bucket:
+        bucket.acquire(4)
+        bucket.refund(4)
+        assert guaranteed.can_acquire(4)
+        assert parent.can_acquire(10)
+
+        bucket.acquire(4)
+        bucket.acquire(4)
+        bucket.refund(4)
+        assert not guaranteed.can_acquire(1)
+        assert parent.can_acquire(6)
+        assert not parent.can_acquire(7)
+
+
+@pytest.mark.anyio
+async def test_refund_after_parent_refill(duration: float, fast_forward: FastForward) -> None:
+    guaranteed = FixedWindowCounter(5, duration)
+    async with SlidingWindowLog(10, duration) as parent:
+        parent.acquire(2)
+        await fast_forward(duration / 2)
+        async with RateLimiter(HierarchicalBucket(guaranteed, parent)) as rate_limiter:
+            async with rate_limiter.request(5), rate_limiter.request(3) as handle:
+                await fast_forward(duration / 2)
+                await checkpoint()
+                assert parent.can_acquire(2)
+                assert not parent.can_acquire(3)
+                handle.refund(3)
+                assert not guaranteed.can_acquire(1)
+                assert parent.can_acquire(5)
+                assert not parent.can_acquire(6)
+
+
+@pytest.mark.anyio
+async def test_without_parent(duration: float) -> None:
+    async with HierarchicalBucket(FixedWindowCounter(4, duration)) as bucket:
+        assert bucket.capacity == 4
+        bucket.acquire(4)
+        assert not bucket.can_acquire(1)
+
+
+@pytest.mark.anyio
+async def test_entering_context(mock_buckets: Sequence[Mock]) -> None:
+    guaranteed, parent, ceiling = mock_buckets[:3]
+    async with HierarchicalBucket(guaranteed, parent, ceiling):
+        guaranteed.__aenter__.assert_awaited_once()
+        ceiling.__aenter__.assert_awaited_once()
+        parent.__aenter__.assert_not_called()
+    guaranteed.__aexit__.assert_awaited_once()
+    ceiling.__aexit__.assert_awaited_once()
+    parent.__aexit__.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_not_entering_context(mock_buckets: Sequence[Mock]) -> None:
+    guaranteed, parent, ceiling = mock_buckets[:3]
+    async with HierarchicalBucket(guaranteed, parent, ceiling, should_enter_context=False):
+        for bucket in (guaranteed, parent, ceiling):
+            bucket.__aenter__.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_repr(parent: FixedWindowCounter, duration: float) -> None:
+    guaranteed, ceiling = FixedWindowCounter(4, duration), FixedWindowCounter(8, duration)
+    assert repr(HierarchicalBucket(guaranteed, parent, ceiling)) == (
+        f'HierarchicalBucket({guaranteed!r}, parent={parent!r}, ceiling={ceiling!r}, should_enter_context=True)'
+    )
@@ -0,0 +1,66 @@
+import math
+
+import pytest
+from anyio.abc import TaskGroup
+
+from rate_control import Priority
+from rate_control._helpers import Request
+from tests import checkpoints
+
+
+@pytest.mark.anyio
+async def test_fire() -> None:
+    request = Request(1)
+    assert not request.fired
+    request.fire()
+    assert request.fired
+    await request.wait_for_validation()
+
+
+@pytest.mark.anyio
+async def test_reject() -> None:
+    request = Request(1)
+    request.reject(ValueError())
+    assert not request.fired
+    with pytest.raises(ValueError):
+        await request.wait_for_validation()
+
+
+@pytest.mark.anyio
+async def test_wake_up_waiter(task_group: TaskGroup) -> None:
+    request = Request(1)
+    validated = False
+
+    async def wait() -> None:
+        nonlocal validated
+        await request.wait_for_validation()
+        validated = True
+
+    task_group.start_soon(wait)
+    await checkpoints(2)
+    assert not validated
+    request.fire()
+    await checkpoints(2)
+    assert validated
+
+
+@pytest.mark.anyio
+async def test_reuse() -> None:
+    request = Request(1, Priority.LOW, deadline=42, scheduled_at=12, tenant='foo')
+    request.bypasses = 3
+    request.reject(ValueError())
+    generation = request.generation
+
+    request.reuse(2, Priority.HIGH)
+    assert request.generation == generation + 1
+    assert (request.cost, request.priority, request.deadline, request.scheduled_at, request.tenant) == (
+        2,
+        Priority.HIGH,
+        math.inf,
+        0,
+        None,
+    )
+    assert request.bypasses == 0
+    assert not request.fired
+    request.fire()
+    await request.wait_for_validation()
@@ -1,16 +1,37 @@
+from datetime import time
+
 import pytest
 
-from rate_control._helpers._request import Request
-from rate_control.queues import FifoQueue, LifoQueue, PriorityQueue
+from rate_control import (
+    CapacitySchedule,
+    CoDel,
+    LeakyBucket,
+    NoopController,
+    Overflow,
+    RateLimiter,
+    Reservation,
+    Scheduler,
+)
+from rate_control._helpers import PendingRequests, Request
+from rate_control.queues import EdfQueue, FairQueue, FifoQueue, LifoQueue, PriorityQueue
 
 
 @pytest.mark.parametrize(
     'obj',
     [
+        CapacitySchedule({time(0): 1}),
+        CoDel(1, 1),
+        EdfQueue(),
+        FairQueue(),
         FifoQueue(),
         LifoQueue(),
+        NoopController().request(),
+        PendingRequests(Overflow.REJECT_NEW),
         PriorityQueue(),
+        RateLimiter().request(),
         Request(1),
+        Reservation(LeakyBucket(1), 1, 0, 0),
+        Scheduler().request(),
     ],
 )
 def test_slots(obj: object) -> None: